@@ -24,8 +24,12 @@ if config.config_file_name is not None:
 # add your model's MetaData object here
 # for 'autogenerate' support
 from models.assembly import ProjectAssembly
+from models.catalog import CatalogVersion
 from models.epd import EPD, ProjectEPD
+from models.impact import AssemblyImpact, ProjectAssemblyImpact
 from models.links import ProjectAssemblyEPDLink
+from models.persisted_query import PersistedQuery
+from models.seed import SeedDataset
 
 target_metadata = SQLModel.metadata
 
@@ -0,0 +1,29 @@
+"""empty message
+
+Revision ID: 07071e3aaf7e
+Revises: a2767e75d746
+Create Date: 2026-10-18 02:24:27.578308
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "07071e3aaf7e"
+down_revision = "a2767e75d746"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_epd_gwp_a1a3_sort",
+        "epd",
+        [sa.text("coalesce(gwp[1], 'Infinity'::double precision)"), sa.text("id")],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_epd_gwp_a1a3_sort", table_name="epd")
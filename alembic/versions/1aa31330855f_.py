@@ -0,0 +1,39 @@
+"""empty message
+
+Revision ID: 1aa31330855f
+Revises: 4d4dfb2134ac
+Create Date: 2026-10-18 01:18:24.746896
+
+"""
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "1aa31330855f"
+down_revision = "4d4dfb2134ac"
+branch_labels = None
+depends_on = None
+
+INDICATORS = ("gwp", "odp", "ap", "ep", "pocp", "penre", "pere")
+
+
+def upgrade():
+    # The totals are backfilled with src/rebuild_impacts.py. Until then they are calculated from the layers on read.
+    for table, assembly_table in (("assemblyimpact", "assembly"), ("projectassemblyimpact", "projectassembly")):
+        op.create_table(
+            table,
+            *[
+                sa.Column(indicator, postgresql.ARRAY(postgresql.DOUBLE_PRECISION(precision=53)), nullable=True)
+                for indicator in INDICATORS
+            ],
+            sa.Column("assembly_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.ForeignKeyConstraint(["assembly_id"], [f"{assembly_table}.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("assembly_id"),
+        )
+
+
+def downgrade():
+    op.drop_table("projectassemblyimpact")
+    op.drop_table("assemblyimpact")
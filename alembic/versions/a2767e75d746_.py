@@ -0,0 +1,30 @@
+"""empty message
+
+Revision ID: a2767e75d746
+Revises: d7fc66a35146
+Create Date: 2026-10-18 02:10:41.616843
+
+"""
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a2767e75d746"
+down_revision = "d7fc66a35146"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "persistedquery",
+        sa.Column("hash", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("query", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.PrimaryKeyConstraint("hash"),
+    )
+
+
+def downgrade():
+    op.drop_table("persistedquery")
@@ -0,0 +1,44 @@
+"""empty message
+
+Revision ID: c76ac1f93351
+Revises: 1aa31330855f
+Create Date: 2026-10-18 09:12:31.804117
+
+"""
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "c76ac1f93351"
+down_revision = "1aa31330855f"
+branch_labels = None
+depends_on = None
+
+EPD_SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('simple'::regconfig, coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, "
+    "coalesce(subtype, '') || ' ' || coalesce(location, '') || ' ' || coalesce(comment, '')), 'B')"
+)
+ASSEMBLY_SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('simple'::regconfig, coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(category, '') || ' ' || coalesce(description, '')), 'B')"
+)
+TABLES = {"epd": EPD_SEARCH_DOCUMENT, "assembly": ASSEMBLY_SEARCH_DOCUMENT, "projectassembly": ASSEMBLY_SEARCH_DOCUMENT}
+
+
+def upgrade():
+    for table, document in TABLES.items():
+        op.add_column(
+            table,
+            sa.Column("search_vector", postgresql.TSVECTOR(), sa.Computed(document, persisted=True), nullable=True),
+        )
+        op.create_index(f"ix_{table}_search", table, ["search_vector"], unique=False, postgresql_using="gin")
+
+
+def downgrade():
+    for table in TABLES:
+        op.drop_index(f"ix_{table}_search", table_name=table)
+        op.drop_column(table, "search_vector")
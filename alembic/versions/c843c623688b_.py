@@ -0,0 +1,30 @@
+"""empty message
+
+Revision ID: c843c623688b
+Revises: 07071e3aaf7e
+Create Date: 2026-10-18 02:46:28.897685
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c843c623688b"
+down_revision = "07071e3aaf7e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Queries registered before are kept, as if they were registered now
+    op.add_column(
+        "persistedquery", sa.Column("registered_at", sa.DateTime(), nullable=False, server_default=sa.func.now())
+    )
+    op.alter_column("persistedquery", "registered_at", server_default=None)
+    op.create_index(op.f("ix_persistedquery_registered_at"), "persistedquery", ["registered_at"], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f("ix_persistedquery_registered_at"), table_name="persistedquery")
+    op.drop_column("persistedquery", "registered_at")
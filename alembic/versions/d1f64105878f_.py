@@ -0,0 +1,64 @@
+"""empty message
+
+Revision ID: d1f64105878f
+Revises: 39ca0db4e14b
+Create Date: 2026-10-18 01:01:50.850560
+
+"""
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "d1f64105878f"
+down_revision = "39ca0db4e14b"
+branch_labels = None
+depends_on = None
+
+TABLES = ("epd", "projectepd")
+INDICATORS = ("gwp", "odp", "ap", "ep", "pocp", "penre", "pere")
+PHASES = ("a1a3", "a4", "a5", "b1", "b2", "b3", "b4", "b5", "b6", "b7", "c1", "c2", "c3", "c4", "d")
+
+
+def upgrade():
+    # Impact indicators are stored as float8[] in the order of PHASES, instead of JSON objects.
+    for table in TABLES:
+        for indicator in INDICATORS:
+            values = ", ".join(f"({indicator}->>'{phase}')::float8" for phase in PHASES)
+            op.alter_column(
+                table,
+                indicator,
+                existing_type=postgresql.JSON(astext_type=sa.Text()),
+                type_=postgresql.ARRAY(postgresql.DOUBLE_PRECISION(precision=53)),
+                existing_nullable=True,
+                postgresql_using=f"""
+                    CASE
+                        WHEN {indicator} IS NULL OR json_typeof({indicator}) <> 'object' THEN NULL
+                        WHEN {indicator}::jsonb = '{{}}'::jsonb THEN '{{}}'::float8[]
+                        ELSE ARRAY[{values}]
+                    END
+                """,
+            )
+    op.create_index("ix_epd_gwp_a1a3", "epd", [sa.text("(gwp[1])")], unique=False)
+
+
+def downgrade():
+    op.drop_index("ix_epd_gwp_a1a3", table_name="epd")
+    for table in TABLES:
+        for indicator in INDICATORS:
+            values = ", ".join(f"'{phase}', {indicator}[{i + 1}]" for i, phase in enumerate(PHASES))
+            op.alter_column(
+                table,
+                indicator,
+                existing_type=postgresql.ARRAY(postgresql.DOUBLE_PRECISION(precision=53)),
+                type_=postgresql.JSON(astext_type=sa.Text()),
+                existing_nullable=True,
+                postgresql_using=f"""
+                    CASE
+                        WHEN {indicator} IS NULL THEN NULL
+                        WHEN cardinality({indicator}) = 0 THEN '{{}}'::json
+                        ELSE json_build_object({values})
+                    END
+                """,
+            )
@@ -0,0 +1,30 @@
+"""empty message
+
+Revision ID: d7fc66a35146
+Revises: c76ac1f93351
+Create Date: 2026-10-18 02:06:16.285659
+
+"""
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d7fc66a35146"
+down_revision = "c76ac1f93351"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "catalogversion",
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade():
+    op.drop_table("catalogversion")
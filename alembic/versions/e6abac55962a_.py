@@ -0,0 +1,35 @@
+"""empty message
+
+Revision ID: e6abac55962a
+Revises: 0ba1967fa139
+Create Date: 2026-10-18 01:13:34.105094
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e6abac55962a"
+down_revision = "0ba1967fa139"
+branch_labels = None
+depends_on = None
+
+# name, table, referred table, column, ondelete
+FOREIGN_KEYS = (
+    ("assemblyepdlink_assembly_id_fkey1", "assemblyepdlink", "assembly", "assembly_id", "CASCADE"),
+    ("assemblyepdlink_assembly_id_fkey", "projectassemblyepdlink", "projectassembly", "assembly_id", "CASCADE"),
+    ("projectassembly_origin_id_fkey", "projectassembly", "assembly", "origin_id", "SET NULL"),
+)
+
+
+def upgrade():
+    # Let the database cascade deletes of assemblies, so they can be deleted in bulk without loading their layers.
+    # EPDs still can't be deleted while layers use them
+    for name, table, referred_table, column, ondelete in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_="foreignkey")
+        op.create_foreign_key(name, table, referred_table, [column], ["id"], ondelete=ondelete)
+
+
+def downgrade():
+    for name, table, referred_table, column, _ in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_="foreignkey")
+        op.create_foreign_key(name, table, referred_table, [column], ["id"])
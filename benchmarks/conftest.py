@@ -0,0 +1,218 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import pytest
+from lcacollect_config.connection import create_postgres_engine
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+RESULTS: dict[str, "BenchmarkResult"] = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption("--bench-rounds", type=int, default=5, help="Number of timed rounds of every benchmark")
+    group.addoption("--bench-scale", type=float, default=1.0, help="Scale factor of the generated data")
+    group.addoption("--bench-save", metavar="PATH", help="Save the results as a JSON baseline")
+    group.addoption("--bench-compare", metavar="PATH", help="Compare the results with a JSON baseline")
+    group.addoption(
+        "--bench-max-regression",
+        type=float,
+        default=None,
+        help="Fail if a median is slower than the baseline by more than this fraction, like 0.2",
+    )
+
+
+@dataclass
+class BenchmarkResult:
+    rounds: int
+    min: float
+    median: float
+    mean: float
+    statements: int
+
+
+@contextmanager
+def count_statements():
+    """Count the SQL statements sent to Postgres by any engine"""
+
+    statements = []
+
+    def on_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", on_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", on_execute)
+
+
+class Benchmark:
+    """Time an async function over a number of rounds, after an untimed warm-up round"""
+
+    def __init__(self, name: str, rounds: int):
+        self.name = name
+        self.rounds = rounds
+
+    async def __call__(
+        self,
+        function: Callable[[], Awaitable],
+        setup: Callable[[], Awaitable] | None = None,
+        rounds: int | None = None,
+    ) -> BenchmarkResult:
+        timings = []
+        statements = 0
+        for round_ in range((rounds or self.rounds) + 1):
+            if setup:
+                await setup()
+            with count_statements() as executed:
+                start = time.perf_counter()
+                await function()
+                elapsed = time.perf_counter() - start
+            if round_:
+                timings.append(elapsed)
+                statements = max(statements, len(executed))
+
+        result = BenchmarkResult(
+            rounds=len(timings),
+            min=min(timings),
+            median=statistics.median(timings),
+            mean=statistics.mean(timings),
+            statements=statements,
+        )
+        RESULTS[self.name] = result
+        return result
+
+
+@pytest.fixture
+def benchmark(request) -> Benchmark:
+    return Benchmark(request.node.name, request.config.getoption("--bench-rounds"))
+
+
+@pytest.fixture
+def scale(request) -> float:
+    return request.config.getoption("--bench-scale")
+
+
+@pytest.fixture
+async def db():
+    """The database configured by the POSTGRES_* settings. The tables are recreated for every benchmark."""
+
+    engine = create_postgres_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    yield engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+
+
+class BenchmarkUser:
+    claims = {"oid": "benchmark"}
+    access_token = "Bearer benchmark"
+    roles = ["lca_super_admin"]
+
+
+@pytest.fixture
+def execute(db, mocker):
+    """Execute a GraphQL operation against the schema, like a request from an authenticated user"""
+
+    from core.validate import clear_project_cache
+    from schema import schema
+
+    mocker.patch("lcacollect_config.validate.project_exists", return_value=True)
+    clear_project_cache()
+
+    async def _execute(query: str, variables: dict | None = None) -> dict:
+        async with AsyncSession(db) as session:
+            response = await schema.execute(
+                query, variable_values=variables, context_value={"session": session, "user": BenchmarkUser()}
+            )
+        assert response.errors is None, response.errors
+        return response.data
+
+    return _execute
+
+
+def pytest_sessionfinish(session):
+    if not RESULTS:
+        return
+
+    config = session.config
+    if path := config.getoption("--bench-save"):
+        Path(path).write_text(json.dumps(build_report(config), indent=2))
+
+    if path := config.getoption("--bench-compare"):
+        baseline = json.loads(Path(path).read_text())
+        config.stash[comparison_key] = compare(baseline["benchmarks"], config.getoption("--bench-max-regression"))
+        if any(regressed for *_, regressed in config.stash[comparison_key]):
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def build_report(config) -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+
+    return {
+        "commit": commit,
+        "created": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "scale": config.getoption("--bench-scale"),
+        "benchmarks": {name: asdict(result) for name, result in sorted(RESULTS.items())},
+    }
+
+
+comparison_key = pytest.StashKey[list]()
+
+
+def compare(baseline: dict, max_regression: float | None) -> list[tuple[str, float, int, bool]]:
+    """
+    Compare the results with a baseline. Returns the name, the relative change of the median,
+    the change in the number of statements and whether the benchmark regressed, for every benchmark in both.
+    """
+
+    comparison = []
+    for name, result in sorted(RESULTS.items()):
+        if name not in baseline:
+            continue
+        change = result.median / baseline[name]["median"] - 1
+        statements = result.statements - baseline[name]["statements"]
+        regressed = statements > 0 or (max_regression is not None and change > max_regression)
+        comparison.append((name, change, statements, regressed))
+    return comparison
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not RESULTS:
+        return
+
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(f"{'name':60} {'median ms':>10} {'min ms':>10} {'statements':>10}")
+    for name, result in sorted(RESULTS.items()):
+        terminalreporter.write_line(
+            f"{name:60} {result.median * 1000:10.1f} {result.min * 1000:10.1f} {result.statements:10}"
+        )
+
+    if comparison := config.stash.get(comparison_key, None):
+        terminalreporter.section("compared with baseline")
+        for name, change, statements, regressed in comparison:
+            terminalreporter.write_line(
+                f"{name:60} {change:+10.1%} {statements:+10} statements{'  REGRESSED' if regressed else ''}",
+                red=regressed,
+            )
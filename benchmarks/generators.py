@@ -0,0 +1,122 @@
+"""Synthetic data for the benchmarks. The data is generated from a fixed seed, so every run uses the same data."""
+
+import random
+from datetime import date
+
+from lcacollect_config.formatting import string_uuid
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.bulk import bulk_insert
+from core.impact_totals import refresh_assembly_impacts
+from core.impacts import INDICATORS, PHASES
+from models.assembly import Assembly, ProjectAssembly
+from models.epd import EPD, ProjectEPD
+from models.links import AssemblyEPDLink, ProjectAssemblyEPDLink
+
+NAMES = ["Concrete", "Timber", "Steel", "Glass", "Brick", "Mineral wool", "Gypsum board", "Aluminium"]
+CATEGORIES = ["Walls", "Roofs", "Floors", "Foundations", "Windows"]
+
+
+def epd_rows(count: int, seed: int = 0) -> list[dict]:
+    """EPDs with all indicators filled in for the declared phases, like datasets from ÖKOBAUDAT"""
+
+    _random = random.Random(seed)
+    rows = []
+    for i in range(count):
+        declared = _random.sample(PHASES, _random.randint(3, len(PHASES)))
+        epd = EPD(
+            origin_id=f"origin-{i}",
+            name=f"{_random.choice(NAMES)} {i}",
+            version="1.0",
+            declared_unit=_random.choice(["kg", "m2", "m3"]),
+            valid_until=date(2030, 1, 1),
+            published_date=date(2020, 1, 1),
+            source="Benchmark",
+            location=_random.choice(["DK", "DE", "SE"]),
+            subtype=_random.choice(["Generic", "Specific", "Industry"]),
+            comment=None,
+            reference_service_life=None,
+            conversions=[{"to": "KG", "value": _random.uniform(1, 2500)}],
+            meta_fields={"url": f"https://example.com/epds/{i}"},
+            **{
+                indicator: {phase: _random.uniform(-50, 500) if phase in declared else None for phase in PHASES}
+                for indicator in INDICATORS
+            },
+        )
+        rows.append(epd.dict())
+    return rows
+
+
+async def create_epds(db, count: int) -> list[dict]:
+    rows = epd_rows(count)
+    async with AsyncSession(db) as session:
+        await bulk_insert(session, EPD, rows)
+        await session.commit()
+    return rows
+
+
+def assembly_rows(count: int, **fields) -> list[dict]:
+    return [
+        {
+            "id": string_uuid(),
+            "name": f"Assembly {i}",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "life_time": 50.0,
+            "unit": "M2",
+            "conversion_factor": 1.0,
+            "description": None,
+            "meta_fields": {},
+            **fields,
+        }
+        for i in range(count)
+    ]
+
+
+def layer_rows(assemblies: list[dict], layers: int, epd_ids: list[str], seed: int = 0) -> list[dict]:
+    _random = random.Random(seed)
+    return [
+        {
+            "id": string_uuid(),
+            "assembly_id": assembly["id"],
+            "epd_id": _random.choice(epd_ids),
+            "transport_epd_id": None,
+            "conversion_factor": _random.uniform(0.1, 10),
+            "reference_service_life": None,
+            "description": "",
+            "name": f"Layer {i}",
+            "transport_distance": 0.0,
+            "transport_conversion_factor": 1.0,
+        }
+        for assembly in assemblies
+        for i in range(layers)
+    ]
+
+
+async def create_assemblies(db, count: int, layers: int, epds: list[dict]) -> list[str]:
+    """Global assemblies with `layers` layers each, using the given EPDs"""
+
+    assemblies = assembly_rows(count, source="Benchmark")
+    async with AsyncSession(db) as session:
+        await bulk_insert(session, Assembly, assemblies)
+        await bulk_insert(session, AssemblyEPDLink, layer_rows(assemblies, layers, [epd["id"] for epd in epds]))
+        await refresh_assembly_impacts(session, Assembly, [assembly["id"] for assembly in assemblies])
+        await session.commit()
+    return [assembly["id"] for assembly in assemblies]
+
+
+async def create_project(db, project_id: str, assemblies: int, layers: int, epds: list[dict]) -> list[str]:
+    """A project with the given EPDs as project EPDs, and assemblies with `layers` layers each"""
+
+    project_epds = [{**epd, "id": string_uuid(), "origin_id": epd["id"], "project_id": project_id} for epd in epds]
+    project_assemblies = assembly_rows(assemblies, project_id=project_id, origin_id=None)
+    async with AsyncSession(db) as session:
+        await bulk_insert(session, ProjectEPD, project_epds)
+        await bulk_insert(session, ProjectAssembly, project_assemblies)
+        await bulk_insert(
+            session,
+            ProjectAssemblyEPDLink,
+            layer_rows(project_assemblies, layers, [epd["id"] for epd in project_epds]),
+        )
+        await refresh_assembly_impacts(session, ProjectAssembly, [assembly["id"] for assembly in project_assemblies])
+        await session.commit()
+    return [assembly["id"] for assembly in project_assemblies]
@@ -0,0 +1,70 @@
+import pytest
+from generators import create_assemblies, create_epds, create_project
+from lcacollect_config.formatting import string_uuid
+
+EPDS = 1_000
+ASSEMBLIES = 200
+LAYERS = 8
+
+
+@pytest.fixture
+async def epds(db, scale):
+    yield await create_epds(db, int(EPDS * scale))
+
+
+@pytest.fixture
+async def project_id(db, epds, scale):
+    project_id = string_uuid()
+    await create_project(db, project_id, int(ASSEMBLIES * scale), LAYERS, epds)
+    yield project_id
+
+
+@pytest.fixture
+async def assembly_ids(db, epds, scale):
+    yield await create_assemblies(db, int(ASSEMBLIES * scale), LAYERS, epds)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "selection",
+    [
+        "name gwp",
+        'name impacts(phases: ["a1a3", "c3", "c4"]) { indicator value }',
+        "name gwp layers { name conversionFactor epd { name declaredUnit gwp { a1a3 } } }",
+    ],
+    ids=["gwp", "impacts", "layers"],
+)
+async def test_project_assemblies(benchmark, execute, project_id, selection):
+    query = f"""
+        query ($projectId: String!) {{
+            projectAssemblies(projectId: $projectId) {{
+                {selection}
+            }}
+        }}
+    """
+
+    result = await benchmark(lambda: execute(query, {"projectId": project_id}))
+
+    # The assemblies, the stored impacts, the layers and their EPDs, regardless of the number of assemblies
+    assert result.statements <= 4
+
+
+@pytest.mark.asyncio
+async def test_add_project_assemblies_from_assemblies(benchmark, execute, assembly_ids):
+    query = """
+        mutation ($projectId: ID!, $assemblies: [ID!]!) {
+            addProjectAssembliesFromAssemblies(projectId: $projectId, assemblies: $assemblies) {
+                id
+                name
+                gwp
+            }
+        }
+    """
+    count = 20
+
+    # Every round copies the assemblies into a new project, so the project EPDs are copied as well
+    result = await benchmark(
+        lambda: execute(query, {"projectId": string_uuid(), "assemblies": assembly_ids[:count]}),
+    )
+
+    assert result.statements <= 12
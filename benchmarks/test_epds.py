@@ -0,0 +1,78 @@
+import pytest
+from generators import create_epds
+
+EPDS = 10_000
+
+CATALOG_QUERY = """
+    query ($after: String, $sortBy: EPDSort) {
+        epds(count: 50, after: $after, sortBy: $sortBy) {
+            edges {
+                node {
+                    id
+                    name
+                    source
+                    declaredUnit
+                }
+            }
+            pageInfo {
+                hasNextPage
+                endCursor
+            }
+        }
+    }
+"""
+
+IMPACTS_QUERY = """
+    query ($after: String) {
+        epds(count: 50, after: $after) {
+            edges {
+                node {
+                    name
+                    gwp {
+                        a1a3
+                        c3
+                        c4
+                        d
+                    }
+                    conversions {
+                        to
+                        value
+                    }
+                }
+            }
+            pageInfo {
+                endCursor
+            }
+            numEdges
+        }
+    }
+"""
+
+
+@pytest.fixture
+async def epds(db, scale):
+    yield await create_epds(db, int(EPDS * scale))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("query", [CATALOG_QUERY, IMPACTS_QUERY], ids=["catalog", "impacts"])
+async def test_epds_first_page(benchmark, execute, epds, query):
+    result = await benchmark(lambda: execute(query))
+
+    # Counting the EPDs for numEdges takes up to two extra statements
+    assert result.statements <= 3
+
+
+@pytest.mark.asyncio
+async def test_epds_paging(benchmark, execute, epds):
+    pages = 10
+
+    async def page_through():
+        after = None
+        for _ in range(pages):
+            data = await execute(CATALOG_QUERY, {"after": after, "sortBy": {"name": "ASC"}})
+            after = data["epds"]["pageInfo"]["endCursor"]
+
+    result = await benchmark(page_through)
+
+    assert result.statements == pages
@@ -0,0 +1,63 @@
+import json
+
+import httpx
+import pytest
+from generators import create_epds, create_project
+from lcacollect_config.formatting import string_uuid
+
+ELEMENTS = 200
+LAYERS = 8
+
+ENTITIES_QUERY = """
+    query ($representations: [_Any!]!) {
+        _entities(representations: $representations) {
+            ... on GraphQLSchemaElement {
+                id
+                assembly {
+                    name
+                    gwp
+                    layers {
+                        epd {
+                            name
+                        }
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture
+async def elements(db, scale, httpx_mock):
+    epds = await create_epds(db, 500)
+    assembly_ids = await create_project(db, string_uuid(), int(ELEMENTS * scale), LAYERS, epds)
+    elements = {f"element{i}": assembly_id for i, assembly_id in enumerate(assembly_ids)}
+
+    def router_response(request: httpx.Request):
+        variables = json.loads(request.content)["variables"]
+        ids = [variables[f"id{i}"] for i in range(len(variables) - 1)]
+        return httpx.Response(
+            200,
+            json={
+                "data": {
+                    f"element{i}": [{"id": element_id, "assemblyId": elements[element_id]}]
+                    for i, element_id in enumerate(ids)
+                }
+            },
+        )
+
+    httpx_mock.add_callback(router_response)
+    yield elements
+
+
+@pytest.mark.asyncio
+async def test_resolve_schema_elements(benchmark, execute, elements):
+    def representations():
+        # The representations are consumed by the federation resolver, so every round gets its own
+        return [{"__typename": "GraphQLSchemaElement", "id": element_id} for element_id in elements]
+
+    result = await benchmark(lambda: execute(ENTITIES_QUERY, {"representations": representations()}))
+
+    # The assemblies with their layers and EPDs, and the stored impacts, are loaded in batches
+    assert result.statements <= 4
@@ -0,0 +1,30 @@
+import pytest
+from sqlmodel import delete
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from initial_data.load_tabel7 import TABLE7_CSV, load
+from models.epd import EPD
+from models.seed import SeedDataset
+
+
+@pytest.mark.asyncio
+async def test_load_table7(benchmark, db):
+    async def clear():
+        async with AsyncSession(db) as session:
+            await session.exec(delete(SeedDataset))
+            await session.exec(delete(EPD))
+            await session.commit()
+
+    result = await benchmark(lambda: load(TABLE7_CSV), setup=clear)
+
+    # The dataset lookup, the existing EPDs, the batched insert and the dataset record
+    assert result.statements <= 5
+
+
+@pytest.mark.asyncio
+async def test_load_table7_up_to_date(benchmark, db):
+    await load(TABLE7_CSV)
+
+    result = await benchmark(lambda: load(TABLE7_CSV))
+
+    assert result.statements == 1
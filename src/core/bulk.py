@@ -0,0 +1,57 @@
+import logging
+from typing import Type
+
+from sqlalchemy import any_, bindparam, delete, insert
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.sqltypes import AutoString
+
+logger = logging.getLogger(__name__)
+
+# Postgres allows 32767 bind parameters per statement, which leaves room for 1000 rows of up to 32 columns.
+BATCH_SIZE = 1000
+
+
+async def bulk_insert(session: AsyncSession, model: Type[SQLModel], rows: list[dict], returning: tuple = ()) -> list:
+    """
+    Insert rows as multi-row INSERT statements of `BATCH_SIZE` rows each, inside the session's transaction.
+    The rows bypass the ORM unit of work, so they are not added to the session's identity map.
+    Returns the `returning` columns of all inserted rows.
+    """
+
+    returned = []
+    for start in range(0, len(rows), BATCH_SIZE):
+        statement = insert(model).values(rows[start : start + BATCH_SIZE])
+        if returning:
+            returned.extend((await session.execute(statement.returning(*returning))).all())
+        else:
+            await session.execute(statement)
+    return returned
+
+
+def any_id(column, ids) -> ColumnElement:
+    """
+    column = ANY(:ids) clause. Unlike IN, the ids are bound as a single array parameter, so any number of ids fits into
+    one statement.
+    """
+
+    return column == any_(bindparam(None, list(ids), type_=ARRAY(AutoString)))
+
+
+async def bulk_delete(session: AsyncSession, model: Type[SQLModel], ids: list[str]) -> list[str]:
+    """
+    Delete rows by id with a single DELETE ... WHERE id = ANY(:ids) RETURNING id.
+    Related rows are removed by the ON DELETE rules of their foreign keys. Returns the ids that were deleted.
+    """
+
+    statement = (
+        delete(model).where(any_id(model.id, ids)).returning(model.id).execution_options(synchronize_session=False)
+    )
+    deleted = (await session.execute(statement)).scalars().all()
+
+    missing = set(ids) - set(deleted)
+    if missing:
+        logger.warning(f"Could not delete {model.__name__} with ids: {', '.join(sorted(missing))}. They do not exist")
+    return deleted
@@ -2,7 +2,53 @@ from lcacollect_config.config import Settings
 
 
 class AssemblySettings(Settings):
-    pass
+    # Connection pool for calls to the federation router
+    ROUTER_HTTP2: bool = True
+    ROUTER_TIMEOUT: float = 10.0
+    ROUTER_MAX_CONNECTIONS: int = 100
+    ROUTER_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    ROUTER_KEEPALIVE_EXPIRY: float = 30.0
+    # Schema elements fetched per request to the router, each as an aliased field of the query
+    ROUTER_BATCH_SIZE: int = 100
+
+    # Above this number of rows, the unfiltered EPD catalog is counted from the planner statistics
+    EPD_COUNT_ESTIMATE_THRESHOLD: int = 10_000
+
+    # Cache of the projects a user has access to
+    PROJECT_CACHE_SIZE: int = 1024
+    PROJECT_CACHE_TTL: float = 60.0
+
+    # Process wide cache of global EPDs. Entries are invalidated through Postgres notifications and expire as a fallback
+    EPD_CACHE_SIZE: int = 5000
+    EPD_CACHE_TTL: float = 3600.0
+
+    # Responses of GET queries over the EPD catalog, which are revalidated with ETags
+    RESPONSE_CACHE_SIZE: int = 512
+    RESPONSE_CACHE_TTL: float = 600.0
+
+    # Automatic persisted queries, looked up by their SHA-256 hash. With PERSISTED_QUERY_DATABASE the queries are also
+    # stored in Postgres, so that a query registered on one replica is known to the others. Only valid queries up to
+    # PERSISTED_QUERY_MAX_LENGTH characters are registered, and Postgres keeps the most recently registered ones
+    PERSISTED_QUERY_CACHE_SIZE: int = 1000
+    PERSISTED_QUERY_DATABASE: bool = False
+    PERSISTED_QUERY_DATABASE_SIZE: int = 10_000
+    PERSISTED_QUERY_MAX_LENGTH: int = 20_000
+
+    # Port of the Prometheus metrics, which are served apart from the app so they are not reachable through its service
+    METRICS_PORT: int = 9000
+
+    # Parsed and validated GraphQL documents, keyed by the query
+    DOCUMENT_CACHE_SIZE: int = 1000
+
+    # Number of rows fetched from the server side cursor and written at a time by the export endpoints
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Seed reference datasets when the app starts. Disable when seeding runs as a separate job with src/seed.py
+    SEED_ON_STARTUP: bool = True
+
+    # N+1 detection in development and tests. Statement shapes repeated more often in one operation are reported
+    QUERY_GUARD_MAX_REPEATS: int = 5
+    QUERY_GUARD_SLOW_SECONDS: float = 0.5
 
 
 settings = AssemblySettings()
@@ -0,0 +1,52 @@
+from functools import lru_cache
+
+from graphql import GraphQLError, specified_rules
+from strawberry.extensions import SchemaExtension
+from strawberry.schema.base import BaseSchema
+from strawberry.schema.execute import parse_document, validate_document
+
+from core.config import settings
+
+# Shared by all operations. Validated documents are keyed by the parsed document, so a query is validated once
+parse_cached = lru_cache(maxsize=settings.DOCUMENT_CACHE_SIZE)(parse_document)
+validate_cached = lru_cache(maxsize=settings.DOCUMENT_CACHE_SIZE)(validate_document)
+
+
+def is_valid_query(schema: BaseSchema, query: str) -> bool:
+    """Whether a query parses and passes the default validation rules. The results are cached for its execution"""
+
+    try:
+        document = parse_cached(query)
+    except GraphQLError:
+        return False
+    return not validate_cached(schema._schema, document, tuple(specified_rules))
+
+
+class DocumentCacheExtension(SchemaExtension):
+    """
+    Cache the parsing and validation of GraphQL documents by their query.
+    Clients send the same queries over and over, especially with persisted queries, so most operations skip both steps.
+    """
+
+    def on_parse(self):
+        execution_context = self.execution_context
+        try:
+            execution_context.graphql_document = parse_cached(
+                execution_context.query, **execution_context.parse_options
+            )
+        except GraphQLError:
+            # Syntax errors are left to Strawberry, which parses the query again and returns them in the response
+            pass
+        yield
+
+    def on_validate(self):
+        execution_context = self.execution_context
+        if execution_context.validation_rules and execution_context.errors is None:
+            execution_context.errors = list(
+                validate_cached(
+                    execution_context.schema._schema,
+                    execution_context.graphql_document,
+                    execution_context.validation_rules,
+                )
+            )
+        yield
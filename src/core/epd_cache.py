@@ -0,0 +1,198 @@
+import asyncio
+import logging
+from typing import Iterable
+
+import asyncpg
+from sqlalchemy import func, inspect
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.cache import TTLCache
+from core.config import settings
+from core.metrics import record_cache_lookups
+from models.catalog import CatalogVersion
+from models.epd import EPD
+
+logger = logging.getLogger(__name__)
+
+# Postgres channel changes of the EPD catalog are sent on, with the ids of the changed EPDs as payload.
+# An empty payload means that EPDs were only added, and * that any EPD may have changed
+CHANNEL = "epd_changed"
+# Payloads are limited to 8000 bytes by Postgres. Larger changes clear the caches instead
+MAX_PAYLOAD = 7500
+# Name of the EPD catalog in the CatalogVersion table
+CATALOG = "epd"
+
+
+class EPDCache:
+    """
+    Process wide cache of global EPDs, keyed by id.
+    Global EPDs are reference data, that only change through the admin mutations and imports. Those notify all
+    replicas through Postgres, see notify_epds_changed. Entries also expire after EPD_CACHE_TTL seconds, in case a
+    notification is missed.
+
+    The cached EPDs are transient objects shared between requests. They must not be modified or added to a session.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        # Bumped on every invalidation, so that rows loaded while EPDs changed are not cached
+        self._generation = 0
+        self._version: int | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def get_cached(self, ids: Iterable[str]) -> dict[str, EPD]:
+        """Get the cached EPDs by id, without loading the missing ones"""
+
+        epds = {}
+        misses = 0
+        for _id in ids:
+            if (epd := self._entries.get(_id)) is not None:
+                epds[_id] = epd
+            else:
+                misses += 1
+
+        self.hits += len(epds)
+        self.misses += misses
+        record_cache_lookups("epd", len(epds), misses)
+        return epds
+
+    async def get_many(self, session: AsyncSession, ids: Iterable[str]) -> dict[str, EPD]:
+        """Get EPDs by id. The EPDs missing from the cache are loaded with a single query. Unknown ids are left out."""
+
+        ids = set(ids)
+        epds = self.get_cached(ids)
+        missing = ids - epds.keys()
+        if not missing:
+            return epds
+
+        generation = self._generation
+        loaded = await load_epds(session, missing)
+        if generation == self._generation:
+            for epd in loaded:
+                self._entries.set(epd.id, epd)
+
+        epds.update({epd.id: epd for epd in loaded})
+        return epds
+
+    async def get(self, session: AsyncSession, _id: str) -> EPD | None:
+        return (await self.get_many(session, [_id])).get(_id)
+
+    async def version(self, session: AsyncSession) -> int:
+        """The version of the EPD catalog. It is read from the database once after every invalidation."""
+
+        if self._version is not None:
+            return self._version
+
+        generation = self._generation
+        query = select(CatalogVersion.version).where(CatalogVersion.name == CATALOG)
+        version = (await session.exec(query)).first() or 0
+        if generation == self._generation:
+            self._version = version
+        return version
+
+    def invalidate(self, ids: Iterable[str] | None = None) -> None:
+        """
+        Remove EPDs from the cache, or all of them, if no ids are given.
+        The catalog version is read again in any case, as EPDs may also have been added.
+        """
+
+        self._generation += 1
+        self._version = None
+        if ids is None:
+            self._entries.clear()
+        else:
+            ids = set(ids)
+            self._entries.invalidate(lambda key: key in ids)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+async def load_epds(session: AsyncSession, ids: set[str]) -> list[EPD]:
+    """
+    Load EPDs as transient objects. The columns are selected without the ORM entity, so the EPDs don't end up in the
+    identity map of the session, where the request could modify them.
+    """
+
+    attributes = inspect(EPD).column_attrs
+    query = select(*[attribute.expression.label(attribute.key) for attribute in attributes]).where(col(EPD.id).in_(ids))
+    rows = (await session.execute(query)).all()
+    return [to_epd(row._mapping) for row in rows]
+
+
+def to_epd(values) -> EPD:
+    # Values are assigned like the ORM loads them, without validation, which would drop values like null conversions
+    epd = EPD()
+    for key, value in values.items():
+        setattr(epd, key, value)
+    return epd
+
+
+epd_cache = EPDCache(maxsize=settings.EPD_CACHE_SIZE, ttl=settings.EPD_CACHE_TTL)
+
+
+async def notify_epds_changed(session: AsyncSession, ids: Iterable[str] = ()) -> None:
+    """
+    Record a change of the EPD catalog, with the ids of the updated or deleted EPDs.
+    Bumps the catalog version, invalidates the changed EPDs in the cache of this process and notifies the other
+    replicas. The version and the notification are committed with the session, and discarded if it rolls back.
+    """
+
+    ids = sorted(set(ids))
+    epd_cache.invalidate(ids)
+
+    statement = insert(CatalogVersion).values(name=CATALOG, version=1)
+    statement = statement.on_conflict_do_update(
+        index_elements=[CatalogVersion.name], set_={"version": CatalogVersion.version + 1}
+    )
+    await session.execute(statement)
+
+    payload = ",".join(ids)
+    if len(payload) > MAX_PAYLOAD:
+        payload = "*"
+    await session.execute(select(func.pg_notify(CHANNEL, payload)))
+
+
+def on_notification(connection, pid: int, channel: str, payload: str) -> None:
+    epd_cache.invalidate(None if payload == "*" else [_id for _id in payload.split(",") if _id])
+
+
+async def listen_for_epd_changes(retry_delay: float = 5.0, check_interval: float = 30.0) -> None:
+    """
+    Invalidate the cache on notifications from any replica, until cancelled.
+    The cache is cleared whenever the listening connection is (re)established, as changes may have been missed.
+    The connection is checked every check_interval seconds, as a half-open connection would otherwise wait forever.
+    """
+
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(
+                host=settings.POSTGRES_HOST,
+                port=settings.POSTGRES_PORT,
+                user=settings.POSTGRES_USER,
+                password=settings.POSTGRES_PASSWORD,
+                database=settings.POSTGRES_DB,
+                ssl=settings.POSTGRES_SSL,
+            )
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _connection: closed.set())
+            await connection.add_listener(CHANNEL, on_notification)
+            epd_cache.invalidate()
+
+            while not closed.is_set():
+                try:
+                    await asyncio.wait_for(closed.wait(), check_interval)
+                except asyncio.TimeoutError:
+                    await asyncio.wait_for(connection.execute("SELECT 1"), check_interval)
+            logger.warning("Lost the connection listening for EPD changes, reconnecting")
+        except Exception:
+            logger.warning(f"Could not listen for EPD changes, retrying in {retry_delay}s", exc_info=True)
+            await asyncio.sleep(retry_delay)
+        finally:
+            # Terminated rather than closed, which would wait for a reply on a broken connection
+            if connection and not connection.is_closed():
+                connection.terminate()
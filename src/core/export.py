@@ -0,0 +1,126 @@
+import csv
+import io
+import json
+from datetime import date
+from typing import AsyncIterator
+
+import pyarrow
+import pyarrow.parquet
+from sqlmodel import SQLModel
+
+from core.impacts import INDICATORS, PHASES
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+IMPACT_COLUMNS = {f"{indicator}_{phase}" for indicator in INDICATORS for phase in PHASES}
+
+
+def flatten_row(row: dict) -> dict:
+    """
+    Flatten a row for tabular formats.
+    Impact categories become a column per indicator and phase, while other nested values are written as JSON.
+    """
+
+    flat = {}
+    for key, value in row.items():
+        if key in INDICATORS:
+            for phase in PHASES:
+                flat[f"{key}_{phase}"] = (value or {}).get(phase)
+        elif isinstance(value, (dict, list)):
+            flat[key] = json.dumps(value)
+        else:
+            flat[key] = value
+    return flat
+
+
+async def write_ndjson(batches: AsyncIterator[list[SQLModel]]) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield "".join(json.dumps(item.dict(), default=str) + "\n" for item in batch).encode()
+
+
+async def write_csv(batches: AsyncIterator[list[SQLModel]]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = None
+    async for batch in batches:
+        rows = [flatten_row(item.dict()) for item in batch]
+        if not rows:
+            continue
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+        writer.writerows(rows)
+
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+class _ParquetSink(io.RawIOBase):
+    """Write only file, which hands over the written bytes every time it is drained"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def parquet_schema(rows: list[dict]):
+    """Arrow schema of the flattened rows. Impact columns are always floats, and columns without values strings."""
+
+    fields = []
+    for key in rows[0].keys():
+        if key in IMPACT_COLUMNS:
+            fields.append(pyarrow.field(key, pyarrow.float64()))
+            continue
+        _type = pyarrow.array([row[key] for row in rows]).type
+        fields.append(pyarrow.field(key, pyarrow.string() if pyarrow.types.is_null(_type) else _type))
+    return pyarrow.schema(fields)
+
+
+async def write_parquet(batches: AsyncIterator[list[SQLModel]]) -> AsyncIterator[bytes]:
+    """Write each batch as a Parquet row group, so only a single batch is held in memory"""
+
+    sink = _ParquetSink()
+    writer = None
+    async for batch in batches:
+        rows = [flatten_row(item.dict()) for item in batch]
+        if not rows:
+            continue
+        if writer is None:
+            writer = pyarrow.parquet.ParquetWriter(sink, parquet_schema(rows))
+        writer.write_table(pyarrow.Table.from_pylist(rows, schema=writer.schema))
+        yield sink.drain()
+
+    if writer is not None:
+        writer.close()
+        yield sink.drain()
+
+
+WRITERS = {
+    "ndjson": write_ndjson,
+    "csv": write_csv,
+    "parquet": write_parquet,
+}
+
+
+def export_filename(name: str, export_format: str) -> str:
+    return f"{name}-{date.today().isoformat()}.{export_format}"
@@ -1,16 +1,14 @@
+from functools import partial
 from typing import Annotated, Optional
 
-import httpx
 import strawberry
-from lcacollect_config.context import get_session, get_token
-from sqlalchemy.orm import selectinload
-from sqlmodel import select
+from lcacollect_config.context import get_token
 from strawberry.types import Info
 
-import models.assembly as models_assembly
-import models.links as models_links
 from core.config import settings
 from core.exceptions import MicroServiceConnectionError, MicroServiceResponseError
+from core.http import get_router_client
+from core.loaders import get_loader, load_project_assembly
 from graphql_types.assembly import GraphQLProjectAssembly
 
 
@@ -19,28 +17,8 @@ async def get_assembly(info: Info, root: "GraphQLSchemaElement") -> GraphQLProje
     Fetches assembly of a schemaElement
     """
     if root.assembly_id:
-        session = get_session(info)
-
-        query = select(models_assembly.ProjectAssembly).where(models_assembly.ProjectAssembly.id == root.assembly_id)
-        query = query.options(
-            selectinload(models_assembly.ProjectAssembly.layers).options(
-                selectinload(models_links.ProjectAssemblyEPDLink.epd)
-            )
-        )
-        element = (await session.exec(query)).first()
-        if element:
-            return GraphQLProjectAssembly(
-                id=element.id,
-                name=element.name,
-                project_id=element.project_id,
-                unit=element.unit,
-                category=element.category,
-                life_time=element.life_time,
-                description=element.description,
-                conversion_factor=element.conversion_factor,
-                meta_fields=element.meta_fields,
-                layers=element.layers,
-            )
+        # The assembly is resolved from the database object, like in the other resolvers, so that its impacts resolve
+        return await load_project_assembly(info, root.assembly_id)
     else:
         return None
 
@@ -55,36 +33,57 @@ class GraphQLSchemaElement:
 
     @classmethod
     async def resolve_reference(cls, info: Info, id: strawberry.ID):
-        return await get_elements([""], id, get_token(info))
+        # Batches are bounded, as the router limits the size of the query
+        loader = get_loader(
+            info,
+            "schema_elements",
+            partial(get_elements, [""], token=get_token(info)),
+            max_batch_size=settings.ROUTER_BATCH_SIZE,
+        )
+        return await loader.load(id)
 
 
-async def get_elements(schemaCategories: list[str], id: str, token: str) -> GraphQLSchemaElement:
-    query = """
-        query getElements($schemaCategoryIds: [String!]!, $id: String){
-            schemaElements(schemaCategoryIds: $schemaCategoryIds, elementId: $id) {
+def build_elements_query(count: int) -> str:
+    """Build a query fetching `count` schema elements in one request, by aliasing a schemaElements field per id"""
+
+    variables = "".join(f", $id{i}: String" for i in range(count))
+    fields = "".join(
+        f"""
+            element{i}: schemaElements(schemaCategoryIds: $schemaCategoryIds, elementId: $id{i}) {{
                 id
                 assemblyId
-            }
-        }
+            }}"""
+        for i in range(count)
+    )
+    return f"""
+        query getElements($schemaCategoryIds: [String!]!{variables}){{{fields}
+        }}
     """
 
-    data = {}
-    async with httpx.AsyncClient(
-        headers={"authorization": f"Bearer {token}"},
-    ) as client:
-        response = await client.post(
-            f"{settings.ROUTER_URL}/graphql",
-            json={
-                "query": query,
-                "variables": {"schemaCategoryIds": schemaCategories, "id": id},
-            },
-        )
-        if response.is_error:
-            raise MicroServiceConnectionError(f"Could not receive data from {settings.ROUTER_URL}. Got {response.text}")
-        data = response.json()
-        if errors := data.get("errors"):
-            raise MicroServiceResponseError(f"Got error from {settings.ROUTER_URL}: {errors}")
 
-    element = data["data"]["schemaElements"][0]
+async def get_elements(schemaCategories: list[str], ids: list[str], token: str) -> list[GraphQLSchemaElement | None]:
+    """Fetch schema elements from the router. All ids are fetched with a single request, see ROUTER_BATCH_SIZE."""
+
+    variables = {"schemaCategoryIds": schemaCategories, **{f"id{i}": _id for i, _id in enumerate(ids)}}
+
+    response = await get_router_client().post(
+        f"{settings.ROUTER_URL}/graphql",
+        headers={"authorization": f"Bearer {token}"},
+        json={
+            "query": build_elements_query(len(ids)),
+            "variables": variables,
+        },
+    )
+    if response.is_error:
+        raise MicroServiceConnectionError(f"Could not receive data from {settings.ROUTER_URL}. Got {response.text}")
+    data = response.json()
+    if errors := data.get("errors"):
+        raise MicroServiceResponseError(f"Got error from {settings.ROUTER_URL}: {errors}")
 
-    return GraphQLSchemaElement(id=element.get("id"), assembly_id=element.get("assemblyId"))
+    elements = []
+    for i in range(len(ids)):
+        if element := next(iter(data["data"][f"element{i}"] or []), None):
+            elements.append(GraphQLSchemaElement(id=element.get("id"), assembly_id=element.get("assemblyId")))
+        else:
+            elements.append(None)
+    return elements
@@ -0,0 +1,36 @@
+import httpx
+
+from core.config import settings
+from core.metrics import on_http_request
+
+_router_client: httpx.AsyncClient | None = None
+
+
+def get_router_client() -> httpx.AsyncClient:
+    """
+    Get the app-lifetime HTTP client for calls to the federation router.
+    Connections are pooled and kept alive, so requests don't pay for a new TCP/TLS handshake.
+    """
+
+    global _router_client
+    if _router_client is None or _router_client.is_closed:
+        _router_client = httpx.AsyncClient(
+            http2=settings.ROUTER_HTTP2,
+            timeout=settings.ROUTER_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.ROUTER_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.ROUTER_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.ROUTER_KEEPALIVE_EXPIRY,
+            ),
+            event_hooks={"request": [on_http_request]},
+        )
+    return _router_client
+
+
+async def close_router_client():
+    """Close the router client and its pooled connections"""
+
+    global _router_client
+    if _router_client is not None:
+        await _router_client.aclose()
+        _router_client = None
@@ -0,0 +1,123 @@
+import logging
+from typing import Type
+
+import numpy as np
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.bulk import BATCH_SIZE, any_id
+from core.impacts import INDICATORS, PHASES, calculate_impacts, pack_epd
+from models.assembly import Assembly, ProjectAssembly
+from models.impact import AssemblyImpact, ProjectAssemblyImpact
+from models.links import AssemblyEPDLink, ProjectAssemblyEPDLink
+
+logger = logging.getLogger(__name__)
+
+IMPACT_MODELS = {
+    Assembly: (AssemblyImpact, AssemblyEPDLink),
+    ProjectAssembly: (ProjectAssemblyImpact, ProjectAssemblyEPDLink),
+}
+
+
+async def calculate_assembly_impacts(
+    session: AsyncSession, assembly_model: Type[Assembly | ProjectAssembly], assembly_ids: list[str]
+) -> dict[str, np.ndarray]:
+    """Calculate the (indicator x phase) impacts of assemblies from their layers, with a single query"""
+
+    _, link_model = IMPACT_MODELS[assembly_model]
+    query = (
+        select(link_model)
+        .where(any_id(link_model.assembly_id, assembly_ids))
+        .options(selectinload(link_model.epd))
+        .execution_options(populate_existing=True)
+    )
+
+    layers = {assembly_id: [] for assembly_id in assembly_ids}
+    for layer in (await session.exec(query)).all():
+        layers[layer.assembly_id].append(layer)
+
+    return dict(zip(layers.keys(), calculate_impacts(list(layers.values()))))
+
+
+async def load_stored_impacts(
+    session: AsyncSession, assembly_model: Type[Assembly | ProjectAssembly], assembly_ids: list[str]
+) -> list[np.ndarray]:
+    """
+    Read the stored impact totals of assemblies.
+    Totals that have not been stored yet are calculated from the layers.
+    """
+
+    impact_model, _ = IMPACT_MODELS[assembly_model]
+    query = select(impact_model).where(any_id(impact_model.assembly_id, assembly_ids))
+    impacts = {impact.assembly_id: pack_epd(impact) for impact in (await session.exec(query)).all()}
+
+    if missing := [assembly_id for assembly_id in assembly_ids if assembly_id not in impacts]:
+        impacts.update(await calculate_assembly_impacts(session, assembly_model, missing))
+
+    return [impacts[assembly_id] for assembly_id in assembly_ids]
+
+
+async def refresh_assembly_impacts(
+    session: AsyncSession, assembly_model: Type[Assembly | ProjectAssembly], assembly_ids
+) -> None:
+    """
+    Recalculate and store the impact totals of the given assemblies, in batches of `BATCH_SIZE` assemblies.
+    Call after changing their layers or the EPDs of their layers, before committing.
+    """
+
+    assembly_ids = list(dict.fromkeys(assembly_ids))
+    if not assembly_ids:
+        return
+
+    # The sessions do not autoflush, so pending layer changes have to be written before reading the layers back
+    await session.flush()
+
+    for start in range(0, len(assembly_ids), BATCH_SIZE):
+        await store_assembly_impacts(session, assembly_model, assembly_ids[start : start + BATCH_SIZE])
+
+
+async def store_assembly_impacts(
+    session: AsyncSession, assembly_model: Type[Assembly | ProjectAssembly], assembly_ids: list[str]
+) -> None:
+    impact_model, _ = IMPACT_MODELS[assembly_model]
+    impacts = await calculate_assembly_impacts(session, assembly_model, assembly_ids)
+    rows = [
+        {
+            "assembly_id": assembly_id,
+            **{indicator: dict(zip(PHASES, matrix[i].tolist())) for i, indicator in enumerate(INDICATORS)},
+        }
+        for assembly_id, matrix in impacts.items()
+    ]
+
+    statement = insert(impact_model).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=[impact_model.assembly_id],
+        set_={indicator: statement.excluded[indicator] for indicator in INDICATORS},
+    )
+    await session.execute(statement)
+
+
+async def get_affected_assemblies(
+    session: AsyncSession, assembly_model: Type[Assembly | ProjectAssembly], epd_ids: list[str]
+) -> list[str]:
+    """Get the ids of the assemblies with layers of the given EPDs"""
+
+    _, link_model = IMPACT_MODELS[assembly_model]
+    query = select(link_model.assembly_id).where(any_id(link_model.epd_id, epd_ids)).distinct()
+    return (await session.exec(query)).all()
+
+
+async def rebuild_assembly_impacts(
+    session: AsyncSession, assembly_model: Type[Assembly | ProjectAssembly], batch_size: int = 500
+) -> int:
+    """Recalculate the stored impact totals of all assemblies, committing after each batch"""
+
+    assembly_ids = (await session.exec(select(assembly_model.id).order_by(assembly_model.id))).all()
+    for start in range(0, len(assembly_ids), batch_size):
+        await refresh_assembly_impacts(session, assembly_model, assembly_ids[start : start + batch_size])
+        await session.commit()
+        logger.info(f"Rebuilt impacts of {min(start + batch_size, len(assembly_ids))}/{len(assembly_ids)} assemblies")
+
+    return len(assembly_ids)
@@ -0,0 +1,64 @@
+import numpy as np
+
+INDICATORS = ("gwp", "odp", "ap", "ep", "pocp", "penre", "pere")
+PHASES = ("a1a3", "a4", "a5", "b1", "b2", "b3", "b4", "b5", "b6", "b7", "c1", "c2", "c3", "c4", "d")
+DEFAULT_PHASES = ("a1a3",)
+
+
+def pack_epd(epd) -> np.ndarray:
+    """
+    Pack the indicator values of an EPD, or stored impact totals, into an (indicator x phase) matrix.
+    Missing values are packed as 0.
+    """
+
+    matrix = np.zeros((len(INDICATORS), len(PHASES)))
+    if epd is None:
+        return matrix
+
+    for i, indicator in enumerate(INDICATORS):
+        data_by_phases = getattr(epd, indicator, None)
+        if not data_by_phases:
+            continue
+        for j, phase in enumerate(PHASES):
+            matrix[i, j] = data_by_phases.get(phase) or 0
+    return matrix
+
+
+def calculate_impacts(assemblies_layers: list[list]) -> np.ndarray:
+    """
+    Calculate every indicator and phase for a list of assemblies in one batch.
+
+    All layers of all assemblies are packed into a single (layer x indicator x phase) matrix, weighted with the layer
+    conversion factors and summed per assembly. Returns an (assembly x indicator x phase) array.
+    """
+
+    impacts = np.zeros((len(assemblies_layers), len(INDICATORS), len(PHASES)))
+    layers = [layer for assembly_layers in assemblies_layers for layer in (assembly_layers or [])]
+    if not layers:
+        return impacts
+
+    # Layers are stored contiguously per assembly, so the per-assembly sum is a segmented sum over the layer axis.
+    counts = np.array([len(assembly_layers or []) for assembly_layers in assemblies_layers])
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    non_empty = counts > 0
+
+    packed = np.stack([pack_epd(layer.epd) for layer in layers])
+    conversion_factors = np.array([layer.conversion_factor or 0 for layer in layers], dtype=float)
+    weighted = packed * conversion_factors[:, None, None]
+
+    impacts[non_empty] = np.add.reduceat(weighted, offsets[non_empty], axis=0)
+    return impacts
+
+
+def phase_mask(phases: list[str] | None) -> np.ndarray:
+    """Vector selecting the phases to sum. Defaults to A1-A3, in line with `calculate_indicator`."""
+
+    selected = phases or DEFAULT_PHASES
+    return np.array([1.0 if phase in selected else 0.0 for phase in PHASES])
+
+
+def sum_phases(impacts: np.ndarray, indicators: list[str] | None, phases: list[str] | None) -> dict[str, float]:
+    """Reduce an (indicator x phase) matrix to a value per indicator for the given phases."""
+
+    totals = impacts @ phase_mask(phases)
+    return {indicator: float(totals[INDICATORS.index(indicator)]) for indicator in (indicators or INDICATORS)}
@@ -0,0 +1,90 @@
+from functools import partial
+from typing import Any, Awaitable, Callable
+
+import numpy as np
+from lcacollect_config.context import get_session
+from sqlalchemy import inspect
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from strawberry.dataloader import DataLoader
+from strawberry.types import Info
+
+import models.assembly as models_assembly
+import models.links as models_links
+from core.impact_totals import load_stored_impacts
+
+
+def get_loader(info: Info, name: str, load_fn: Callable[[list], Awaitable[list]], **kwargs: Any) -> DataLoader:
+    """
+    Get a request scoped DataLoader from the GraphQL context.
+    The loader is created on first use, so every request gets its own batches and cache.
+    """
+
+    loaders = info.context.setdefault("loaders", {})
+    if name not in loaders:
+        loaders[name] = DataLoader(load_fn=load_fn, **kwargs)
+    return loaders[name]
+
+
+async def load_assembly_impacts(
+    info: Info, assembly: models_assembly.Assembly | models_assembly.ProjectAssembly
+) -> np.ndarray:
+    """
+    Load the stored (indicator x phase) impact totals of an assembly.
+    The totals of all assemblies resolved in the same request are read with a single query.
+    """
+
+    assembly_model = type(assembly)
+    loader = get_loader(
+        info, f"{assembly_model.__name__}_impacts", partial(load_stored_impacts, get_session(info), assembly_model)
+    )
+    return await loader.load(assembly.id)
+
+
+async def _load_columns(session: AsyncSession, model, key: str, ids: list[str]) -> list:
+    query = select(model.id, getattr(model, key)).where(col(model.id).in_(ids))
+    values = dict((await session.execute(query)).all())
+    return [values.get(_id) for _id in ids]
+
+
+async def load_deferred_column(info: Info, instance, key: str) -> Any:
+    """
+    Get a column of a database object, loading it if the query of the object left it out.
+    Left out columns are loaded for all objects resolved in the same request with a single query.
+    """
+
+    state = inspect(instance, raiseerr=False)
+    if state is None or key not in state.unloaded:
+        return getattr(instance, key)
+
+    model = type(instance)
+    loader = get_loader(info, f"{model.__name__}_{key}", partial(_load_columns, get_session(info), model, key))
+    value = await loader.load(instance.id)
+    # Store the value like a loaded column, so the object isn't marked as changed
+    set_committed_value(instance, key, value)
+    return value
+
+
+async def _load_project_assemblies(
+    session: AsyncSession, ids: list[str]
+) -> list[models_assembly.ProjectAssembly | None]:
+    query = select(models_assembly.ProjectAssembly).where(col(models_assembly.ProjectAssembly.id).in_(ids))
+    query = query.options(
+        selectinload(models_assembly.ProjectAssembly.layers).options(
+            selectinload(models_links.ProjectAssemblyEPDLink.epd)
+        )
+    )
+    assemblies = {assembly.id: assembly for assembly in (await session.exec(query)).all()}
+    return [assemblies.get(_id) for _id in ids]
+
+
+async def load_project_assembly(info: Info, assembly_id: str) -> models_assembly.ProjectAssembly | None:
+    """
+    Load a project assembly with its layers and EPDs.
+    All ids requested in the same resolution tick are fetched with a single query.
+    """
+
+    loader = get_loader(info, "project_assemblies", partial(_load_project_assemblies, get_session(info)))
+    return await loader.load(assembly_id)
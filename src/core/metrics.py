@@ -0,0 +1,235 @@
+import logging
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from inspect import isawaitable
+from typing import Any, Callable
+
+import prometheus_client
+from graphql import (
+    FieldNode,
+    FragmentSpreadNode,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+)
+from graphql.utilities import get_operation_ast
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from strawberry.extensions import SchemaExtension
+from strawberry.extensions.tracing.utils import should_skip_tracing
+
+logger = logging.getLogger(__name__)
+
+OPERATION_SECONDS = prometheus_client.Histogram(
+    "graphql_operation_duration_seconds", "Wall time of GraphQL operations", ["operation"]
+)
+OPERATION_STATEMENTS = prometheus_client.Histogram(
+    "graphql_operation_sql_statements",
+    "SQL statements per GraphQL operation",
+    ["operation"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+RESOLVER_SECONDS = prometheus_client.Histogram(
+    "graphql_resolver_duration_seconds",
+    "Wall time of a resolver, summed over its calls in a GraphQL operation",
+    ["operation", "resolver"],
+)
+RESOLVER_STATEMENTS = prometheus_client.Histogram(
+    "graphql_resolver_sql_statements",
+    "SQL statements of a resolver in a GraphQL operation",
+    ["operation", "resolver"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+RESOLVER_ROWS = prometheus_client.Histogram(
+    "graphql_resolver_sql_rows",
+    "Rows fetched or written by the SQL statements of a resolver in a GraphQL operation",
+    ["operation", "resolver"],
+    buckets=(1, 10, 100, 1000, 10_000, 100_000),
+)
+RESOLVER_HTTP_CALLS = prometheus_client.Histogram(
+    "graphql_resolver_http_calls",
+    "Outbound HTTP calls of a resolver in a GraphQL operation",
+    ["operation", "resolver"],
+    buckets=(1, 2, 5, 10, 20, 50),
+)
+CACHE_LOOKUPS = prometheus_client.Counter(
+    "cache_lookups",
+    "Lookups of process wide caches, by cache and whether they were hits or misses",
+    ["cache", "result"],
+)
+
+
+@dataclass
+class ResolverMetrics:
+    calls: int = 0
+    seconds: float = 0.0
+    statements: int = 0
+    rows: int = 0
+    http_calls: int = 0
+
+
+@dataclass
+class OperationMetrics:
+    """
+    Metrics of a GraphQL operation, per resolver.
+    Work done outside of resolvers, like loading data for a batch of resolvers, counts towards the resolver
+    that started it. Work done outside of any resolver is recorded under the operation itself.
+    """
+
+    operation: str = ""
+    seconds: float = 0.0
+    resolvers: dict[str, ResolverMetrics] = field(default_factory=lambda: defaultdict(ResolverMetrics))
+
+    @property
+    def statements(self) -> int:
+        return sum(resolver.statements for resolver in self.resolvers.values())
+
+
+_operation: ContextVar[OperationMetrics | None] = ContextVar("operation_metrics", default=None)
+_resolver: ContextVar[str] = ContextVar("resolver", default="")
+
+
+def current_resolver() -> ResolverMetrics | None:
+    """Get the metrics of the resolver that is currently running, if a GraphQL operation is being executed"""
+
+    if operation := _operation.get():
+        return operation.resolvers[_resolver.get()]
+    return None
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def record_statement(conn, cursor, statement, parameters, context, executemany):
+    if resolver := current_resolver():
+        resolver.statements += 1
+        resolver.rows += fetched_rows(cursor)
+
+
+def fetched_rows(cursor) -> int:
+    # The asyncpg adapter fetches the rows of a query up front, and only sets the row count of other statements
+    rows = getattr(cursor, "_rows", None)
+    if rows is not None:
+        return len(rows)
+    return max(cursor.rowcount, 0)
+
+
+def record_http_call():
+    """Count an outbound HTTP call towards the running resolver"""
+
+    if resolver := current_resolver():
+        resolver.http_calls += 1
+
+
+async def on_http_request(request):
+    """httpx event hook counting the requests of a client"""
+
+    record_http_call()
+
+
+def record_cache_lookups(cache: str, hits: int, misses: int):
+    if hits:
+        CACHE_LOOKUPS.labels(cache, "hit").inc(hits)
+    if misses:
+        CACHE_LOOKUPS.labels(cache, "miss").inc(misses)
+
+
+def start_metrics_server(port: int):
+    """
+    Serve the metrics on a port of their own, from a background thread.
+    The port is scraped by Prometheus from within the cluster, and is not exposed by the service of the app.
+    """
+
+    server, _ = prometheus_client.start_http_server(port)
+    return server
+
+
+def get_operation_label(execution_context) -> str:
+    """
+    Label an operation by its root fields, like "epds" or "addProjectAssemblies,epds".
+    Operation names and aliases are chosen by the clients, so they would make the number of label values unbounded.
+    Fields that don't exist in the schema are left out, and operations without any known field are labelled "invalid".
+    """
+
+    document = execution_context.graphql_document
+    operation = get_operation_ast(document, execution_context.operation_name) if document else None
+    if operation is None:
+        return "invalid"
+
+    root_type = execution_context.schema._schema.get_root_type(operation.operation)
+    fragments = {
+        definition.name.value: definition
+        for definition in document.definitions
+        if not isinstance(definition, OperationDefinitionNode)
+    }
+    names = collect_root_fields(operation.selection_set, fragments, set())
+    known = sorted(name for name in names if root_type and (name in root_type.fields or name == "__typename"))
+    return ",".join(known) or "invalid"
+
+
+def collect_root_fields(selection_set, fragments: dict, visited: set[str]) -> set[str]:
+    names = set()
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            names.add(selection.name.value)
+        elif isinstance(selection, InlineFragmentNode):
+            names |= collect_root_fields(selection.selection_set, fragments, visited)
+        elif isinstance(selection, FragmentSpreadNode) and selection.name.value not in visited:
+            # Fragments are only followed once, as invalid documents can contain cycles
+            visited.add(selection.name.value)
+            if fragment := fragments.get(selection.name.value):
+                names |= collect_root_fields(fragment.selection_set, fragments, visited)
+    return names
+
+
+def observe(metrics: OperationMetrics):
+    """Export the metrics of an operation as Prometheus histograms"""
+
+    logger.debug(f"GraphQL operation {metrics.operation} took {metrics.seconds:.3f}s and {metrics.statements} queries")
+    OPERATION_SECONDS.labels(metrics.operation).observe(metrics.seconds)
+    OPERATION_STATEMENTS.labels(metrics.operation).observe(metrics.statements)
+    for name, resolver in metrics.resolvers.items():
+        if not name:
+            continue
+        RESOLVER_SECONDS.labels(metrics.operation, name).observe(resolver.seconds)
+        RESOLVER_STATEMENTS.labels(metrics.operation, name).observe(resolver.statements)
+        RESOLVER_ROWS.labels(metrics.operation, name).observe(resolver.rows)
+        RESOLVER_HTTP_CALLS.labels(metrics.operation, name).observe(resolver.http_calls)
+
+
+class MetricsExtension(SchemaExtension):
+    """
+    Record the wall time, SQL statements, rows and outbound HTTP calls of every GraphQL operation and resolver.
+    Operations are identified by their root fields and resolvers by their type and field, like
+    GraphQLProjectAssembly.layers, so that the number of label values is bounded by the schema, not by the queries of
+    the clients.
+    """
+
+    def on_operation(self):
+        metrics = OperationMetrics()
+        token = _operation.set(metrics)
+        start = time.perf_counter()
+        yield
+        metrics.seconds = time.perf_counter() - start
+        metrics.operation = get_operation_label(self.execution_context)
+        _operation.reset(token)
+        observe(metrics)
+
+    def resolve(self, _next: Callable, root: Any, info, *args, **kwargs) -> Any:
+        # Fields without a resolver of their own are passed through, so they stay synchronous
+        if should_skip_tracing(_next, info) or not _operation.get():
+            return _next(root, info, *args, **kwargs)
+        return self.measure(f"{info.parent_type.name}.{info.field_name}", _next, root, info, *args, **kwargs)
+
+    async def measure(self, name: str, _next: Callable, root: Any, info, *args, **kwargs) -> Any:
+        token = _resolver.set(name)
+        start = time.perf_counter()
+        try:
+            result = _next(root, info, *args, **kwargs)
+            if isawaitable(result):
+                result = await result
+            return result
+        finally:
+            resolver = _operation.get().resolvers[name]
+            resolver.calls += 1
+            resolver.seconds += time.perf_counter() - start
+            _resolver.reset(token)
@@ -0,0 +1,104 @@
+import hashlib
+import math
+from datetime import datetime
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from strawberry.schema.base import BaseSchema
+
+from core.cache import TTLCache
+from core.config import settings
+from core.document_cache import is_valid_query
+from core.metrics import record_cache_lookups
+from models.persisted_query import PersistedQuery
+
+# Version of the automatic persisted queries protocol, as sent by Apollo clients and routers
+VERSION = 1
+NOT_FOUND = "PersistedQueryNotFound"
+
+
+class PersistedQueryError(Exception):
+    """A request for a persisted query, that can't be served, like one with a hash that doesn't match its query"""
+
+
+class PersistedQueryNotFound(PersistedQueryError):
+    """The hash isn't registered. Clients send the request again with the query, which registers it"""
+
+    def __init__(self):
+        super().__init__(NOT_FOUND)
+
+
+# Queries never change for a hash, so they only leave the cache when it is full
+persisted_queries = TTLCache(maxsize=settings.PERSISTED_QUERY_CACHE_SIZE, ttl=math.inf)
+
+
+def get_query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+async def resolve_persisted_query(
+    session: AsyncSession, schema: BaseSchema, query: str | None, extensions: dict | None
+) -> str | None:
+    """
+    Get the query of a request, following the automatic persisted queries protocol.
+    Requests with a persistedQuery extension and without a query are looked up by the hash. Requests with both register
+    the query under the hash. Requests without the extension are returned as they are.
+    """
+
+    persisted = (extensions or {}).get("persistedQuery")
+    if not persisted:
+        return query
+    if not isinstance(persisted, dict) or persisted.get("version") != VERSION:
+        raise PersistedQueryError("Unsupported persisted query version")
+
+    query_hash = persisted.get("sha256Hash")
+    if not isinstance(query_hash, str):
+        raise PersistedQueryError("Persisted query is missing the sha256Hash")
+
+    if query is not None:
+        if get_query_hash(query) != query_hash:
+            raise PersistedQueryError("Provided sha256Hash does not match the query")
+        await register_persisted_query(session, schema, query_hash, query)
+        return query
+
+    query = persisted_queries.get(query_hash)
+    if query is None and settings.PERSISTED_QUERY_DATABASE:
+        query = (await session.exec(select(PersistedQuery.query).where(PersistedQuery.hash == query_hash))).first()
+        if query is not None:
+            persisted_queries.set(query_hash, query)
+
+    record_cache_lookups("persisted_query", int(query is not None), int(query is None))
+    if query is None:
+        raise PersistedQueryNotFound()
+    return query
+
+
+async def register_persisted_query(session: AsyncSession, schema: BaseSchema, query_hash: str, query: str) -> None:
+    """
+    Store a query under its hash, if it is a valid query of the schema and no longer than PERSISTED_QUERY_MAX_LENGTH.
+    Other queries are executed as usual, but not registered, so clients keep sending them in full.
+    Queries are only written to the database the first time this process sees them, in a transaction of their own.
+    Beyond PERSISTED_QUERY_DATABASE_SIZE queries, the least recently registered are removed.
+    """
+
+    if persisted_queries.get(query_hash) is not None:
+        return
+    if len(query) > settings.PERSISTED_QUERY_MAX_LENGTH or not is_valid_query(schema, query):
+        return
+
+    if settings.PERSISTED_QUERY_DATABASE:
+        statement = insert(PersistedQuery).values(hash=query_hash, query=query, registered_at=datetime.utcnow())
+        statement = statement.on_conflict_do_update(
+            index_elements=[PersistedQuery.hash], set_={"registered_at": statement.excluded.registered_at}
+        )
+        oldest = (
+            select(PersistedQuery.hash)
+            .order_by(col(PersistedQuery.registered_at).desc())
+            .offset(settings.PERSISTED_QUERY_DATABASE_SIZE)
+        )
+        async with session.bind.begin() as connection:
+            await connection.execute(statement)
+            await connection.execute(delete(PersistedQuery).where(col(PersistedQuery.hash).in_(oldest)))
+    persisted_queries.set(query_hash, query)
@@ -0,0 +1,89 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from strawberry.extensions import SchemaExtension
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_statements: ContextVar[Counter | None] = ContextVar("query_guard_statements", default=None)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAMETER = re.compile(r"\$\d+(?:::\w+(?:\[\])?)?|%\(\w+\)s|%s|\?")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class RepeatedStatementsError(Exception):
+    """The same statement shape was sent to the database too many times in one GraphQL operation"""
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    The shape of a SQL statement, with literals and bind parameters replaced by ? and IN lists collapsed,
+    so that the statements of a loop over ids are counted as the same statement
+    """
+
+    statement = _STRING.sub("?", statement)
+    statement = _PARAMETER.sub("?", statement)
+    statement = _NUMBER.sub("?", statement)
+    statement = _LIST.sub("(?)", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def start_statement(conn, cursor, statement, parameters, context, executemany):
+    if _statements.get() is not None:
+        conn.info.setdefault("query_guard_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def record_statement(conn, cursor, statement, parameters, context, executemany):
+    statements = _statements.get()
+    if statements is None or not conn.info.get("query_guard_start"):
+        return
+
+    seconds = time.perf_counter() - conn.info["query_guard_start"].pop()
+    shape = normalize_statement(statement)
+    statements[shape] += 1
+    if seconds > settings.QUERY_GUARD_SLOW_SECONDS:
+        logger.warning(f"Slow SQL statement took {seconds:.3f}s: {shape}")
+
+
+def find_repeated(statements: Counter, max_repeats: int) -> list[tuple[str, int]]:
+    """The statement shapes that were executed more than max_repeats times, most repeated first"""
+
+    return [(shape, count) for shape, count in statements.most_common() if count > max_repeats]
+
+
+class QueryGuardExtension(SchemaExtension):
+    """
+    Detect N+1 queries in development and tests.
+    Counts the SQL statements of every GraphQL operation by their normalized shape, and reports the shapes that run
+    more than QUERY_GUARD_MAX_REPEATS times. In tests the operation fails, in development a warning is logged.
+    """
+
+    def on_operation(self):
+        statements = Counter()
+        token = _statements.set(statements)
+        yield
+        _statements.reset(token)
+
+        repeated = find_repeated(statements, settings.QUERY_GUARD_MAX_REPEATS)
+        if not repeated:
+            return
+
+        operation = self.execution_context.operation_name or "anonymous"
+        message = f"GraphQL operation {operation} repeated SQL statements: " + "; ".join(
+            f"{count} x {shape}" for shape, count in repeated
+        )
+        if settings.SERVER_NAME == "LCA Test":
+            raise RepeatedStatementsError(message)
+        logger.warning(message)
@@ -0,0 +1,73 @@
+import re
+from typing import Iterable
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only, selectinload
+from strawberry.types import Info
+from strawberry.types.nodes import FragmentSpread, InlineFragment, Selection
+
+
+def get_selections(info: Info, *path: str) -> list[Selection]:
+    """
+    Get the selections of the resolved field, or of a nested field given by its path of GraphQL field names,
+    like ("edges", "node") for the nodes of a connection.
+    """
+
+    selections = [selection for field in info.selected_fields for selection in field.selections]
+    for name in path:
+        selections = collect_fields(selections).get(name, [])
+    return selections
+
+
+def collect_fields(selections: Iterable[Selection]) -> dict[str, list[Selection]]:
+    """
+    Group the selected fields by name, with fragments expanded and aliased fields merged.
+    Maps the name of every selected field to the combined selections of the field.
+    """
+
+    fields: dict[str, list[Selection]] = {}
+    for selection in selections:
+        if isinstance(selection, (FragmentSpread, InlineFragment)):
+            for name, children in collect_fields(selection.selections).items():
+                fields.setdefault(name, []).extend(children)
+        else:
+            fields.setdefault(selection.name, []).extend(selection.selections)
+    return fields
+
+
+def query_options(model, selections: Iterable[Selection], columns: Iterable[str] = ()) -> list:
+    """
+    Plan the loader options of a query for the selected GraphQL fields.
+    Fields matching a column are loaded with load_only, so unselected columns like the impacts of EPDs are not fetched.
+    Fields matching a relationship are loaded with selectinload, planned from their own selections.
+    Other fields are calculated by resolvers, which look up their data by the primary key, so it is always loaded.
+    `columns` are attributes needed by the resolver itself, like the sort keys of a cursor.
+    """
+
+    mapper = inspect(model)
+    attributes = {mapper.get_property_by_column(column).key for column in mapper.primary_key} | set(columns)
+    relationships = []
+
+    for name, children in collect_fields(selections).items():
+        key = to_snake(name)
+        if key in mapper.relationships:
+            relationship = mapper.relationships[key]
+            # Many-to-one relationships are loaded by the foreign key on this side
+            attributes.update(mapper.get_property_by_column(column).key for column in relationship.local_columns)
+            relationships.append(
+                selectinload(getattr(model, key)).options(*query_options(relationship.mapper.class_, children))
+            )
+        elif key in mapper.column_attrs:
+            attributes.add(key)
+
+    return [load_only(*[getattr(model, key) for key in sorted(attributes)]), *relationships]
+
+
+def is_selected(info: Info, name: str) -> bool:
+    """Check if the client selected a field of the resolved field, like numEdges of a connection"""
+
+    return name in collect_fields(get_selections(info))
+
+
+def to_snake(name: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
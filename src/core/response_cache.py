@@ -0,0 +1,67 @@
+import hashlib
+import json
+
+from graphql import (
+    FieldNode,
+    GraphQLSyntaxError,
+    OperationDefinitionNode,
+    OperationType,
+    print_ast,
+)
+
+from core.cache import TTLCache
+from core.config import settings
+from core.document_cache import parse_cached
+
+# Root fields, whose responses only depend on the EPD catalog and not on the user
+CACHEABLE_FIELDS = {"epds", "__typename"}
+
+# Response bodies of catalog queries, keyed on the catalog version and the cache key of the query
+response_cache = TTLCache(maxsize=settings.RESPONSE_CACHE_SIZE, ttl=settings.RESPONSE_CACHE_TTL)
+
+
+def get_cache_key(query: str | None, variables: dict | None, operation_name: str | None) -> str | None:
+    """
+    Key of a query over the EPD catalog, from the normalized query, the variables and the operation name.
+    Returns None if the query is not cacheable: if it is not a query, or selects other root fields.
+    """
+
+    if not query:
+        return None
+    try:
+        document = parse_cached(query)
+    except GraphQLSyntaxError:
+        return None
+
+    operations = [
+        definition
+        for definition in document.definitions
+        if isinstance(definition, OperationDefinitionNode)
+        and (operation_name is None or definition.name and definition.name.value == operation_name)
+    ]
+    if len(operations) != 1 or operations[0].operation != OperationType.QUERY:
+        return None
+    if not all(
+        isinstance(selection, FieldNode) and selection.name.value in CACHEABLE_FIELDS
+        for selection in operations[0].selection_set.selections
+    ):
+        return None
+
+    # Printing the parsed query drops whitespace, comments and commas
+    key = json.dumps([print_ast(document), variables or {}, operation_name], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def build_etag(version: int, key: str) -> str:
+    """Strong ETag of a cached response. It changes with every change of the catalog."""
+
+    return f'"{version}-{key[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag, with the weak comparison used for If-None-Match"""
+
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
@@ -0,0 +1,57 @@
+import re
+
+from sqlalchemy import Column, Computed, Index, func, literal_column
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+# Product names mix languages, so words are indexed without stemming
+SEARCH_CONFIG = "'simple'::regconfig"
+
+
+def search_document(primary: list[str], secondary: list[str]) -> str:
+    """SQL expression of the text search vector over the given columns. Matches in the primary columns rank higher."""
+
+    def vector(columns: list[str], weight: str) -> str:
+        document = " || ' ' || ".join(f"coalesce({column}, '')" for column in columns)
+        return f"setweight(to_tsvector({SEARCH_CONFIG}, {document}), '{weight}')"
+
+    return f"{vector(primary, 'A')} || {vector(secondary, 'B')}"
+
+
+EPD_SEARCH_DOCUMENT = search_document(["name"], ["subtype", "location", "comment"])
+ASSEMBLY_SEARCH_DOCUMENT = search_document(["name"], ["category", "description"])
+
+
+def add_search_vector(model, document: str) -> None:
+    """
+    Add a generated search_vector column with a GIN index to the table of a model.
+    The column is added after the model is mapped, so the ORM never loads or writes it. Postgres keeps it up to date.
+    """
+
+    column = Column("search_vector", TSVECTOR, Computed(document, persisted=True))
+    model.__table__.append_column(column)
+    Index(f"ix_{model.__tablename__}_search", column, postgresql_using="gin")
+
+
+def build_search_query(query: str):
+    """
+    Build a text search query matching all words of the search string. The last word matches as a prefix,
+    so that results show up while the user is typing. Returns None if the search string has no words.
+    """
+
+    words = re.findall(r"\w+", query.lower())
+    if not words:
+        return None
+
+    terms = words[:-1] + [f"{words[-1]}:*"]
+    return func.to_tsquery(literal_column(SEARCH_CONFIG), " & ".join(terms))
+
+
+def search_clauses(model, query: str):
+    """Get the WHERE clause and the rank expression of a search in the search vector of a model"""
+
+    ts_query = build_search_query(query)
+    if ts_query is None:
+        return None, None
+
+    vector = model.__table__.c.search_vector
+    return vector.op("@@")(ts_query), func.ts_rank(vector, ts_query)
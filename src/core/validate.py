@@ -1,13 +1,59 @@
-from lcacollect_config.context import get_token
+import asyncio
+
+from lcacollect_config.context import get_token, get_user
 from lcacollect_config.exceptions import DatabaseItemNotFound
 from strawberry.types import Info
 
+from core.cache import TTLCache
+from core.config import settings
+from core.metrics import record_http_call
+
+# Projects the user has access to, keyed on (user subject, project id). Only successful checks are cached.
+project_cache = TTLCache(maxsize=settings.PROJECT_CACHE_SIZE, ttl=settings.PROJECT_CACHE_TTL)
+
 
 async def authenticate_project(info: Info, project_id: str):
-    """Checks that project exists and user has access to it"""
+    """
+    Checks that project exists and user has access to it.
+    Each project is checked once per request, and successful checks are cached for a short while across requests.
+    """
+
+    key = (get_subject(info), project_id)
+    checks = info.context.setdefault("project_checks", {})
+    if key not in checks:
+        checks[key] = asyncio.ensure_future(_authenticate_project(key, get_token(info)))
+    return await checks[key]
+
+
+async def _authenticate_project(key: tuple[str, str], token: str):
     from lcacollect_config.validate import project_exists
 
-    project = await project_exists(project_id=project_id, token=get_token(info))
+    project = project_cache.get(key)
+    if project:
+        return project
+
+    project_id = key[1]
+    record_http_call()
+    project = await project_exists(project_id=project_id, token=token)
     if not project:
         raise DatabaseItemNotFound(f"Project with id: {project_id} does not exist")
+
+    project_cache.set(key, project)
     return project
+
+
+def get_subject(info: Info) -> str:
+    """Identify the user of the request. Falls back to the token, if it has no object id"""
+
+    user = get_user(info)
+    return (getattr(user, "claims", None) or {}).get("oid") or get_token(info)
+
+
+def invalidate_project(project_id: str, subject: str | None = None):
+    """Forget cached access to a project, for all users or a single user. Call when project membership changes."""
+
+    project_cache.invalidate(lambda key: key[1] == project_id and (subject is None or key[0] == subject))
+
+
+def clear_project_cache():
+    project_cache.clear()
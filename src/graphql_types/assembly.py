@@ -3,6 +3,10 @@ from enum import Enum
 import strawberry
 from pydantic import BaseModel
 from strawberry.scalars import JSON
+from strawberry.types import Info
+
+from core.impacts import sum_phases
+from core.loaders import load_assembly_impacts
 
 from .assembly_layer import GraphQLAssemblyLayer
 
@@ -16,6 +20,44 @@ class GraphQLAssemblyUnit(Enum):
     pcs = "Pcs"
 
 
+@strawberry.enum
+class GraphQLImpactIndicator(Enum):
+    gwp = "gwp"
+    odp = "odp"
+    ap = "ap"
+    ep = "ep"
+    pocp = "pocp"
+    penre = "penre"
+    pere = "pere"
+
+
+@strawberry.type
+class GraphQLAssemblyImpact:
+    indicator: GraphQLImpactIndicator
+    value: float
+
+
+@strawberry.enum
+class GraphQLImpactGroupBy(Enum):
+    CATEGORY = "CATEGORY"
+    ASSEMBLY = "ASSEMBLY"
+    EPD = "EPD"
+
+
+@strawberry.type
+class GraphQLImpactSummaryGroup:
+    id: str
+    name: str
+    impacts: list[GraphQLAssemblyImpact]
+
+
+@strawberry.type
+class GraphQLProjectImpactSummary:
+    group_by: GraphQLImpactGroupBy
+    total: list[GraphQLAssemblyImpact]
+    groups: list[GraphQLImpactSummaryGroup]
+
+
 class BaseAssembly(BaseModel):
     id: str
     name: str
@@ -33,6 +75,19 @@ def calculate_impact_category(impact_category: str, layers, phases: list[str] |
     )
 
 
+async def calculate_impacts(
+    info: Info, assembly, indicators: list[GraphQLImpactIndicator] | None, phases: list[str] | None
+) -> list[GraphQLAssemblyImpact]:
+    """Calculate the impacts of the assembly, batched with the other assemblies resolved in the same request."""
+
+    impacts = await load_assembly_impacts(info, assembly)
+    totals = sum_phases(impacts, [indicator.value for indicator in indicators] if indicators else None, phases)
+    return [
+        GraphQLAssemblyImpact(indicator=GraphQLImpactIndicator(indicator), value=value)
+        for indicator, value in totals.items()
+    ]
+
+
 @strawberry.type
 class GraphQLAssembly:
     id: str
@@ -48,12 +103,21 @@ class GraphQLAssembly:
     layers: list[GraphQLAssemblyLayer | None]
 
     @strawberry.field
-    def gwp(self, phases: list[str] | None = None) -> float:
+    async def gwp(self, info: Info, phases: list[str] | None = None) -> float:
         """Calculate the gwp of the assembly based on the underlying layers."""
 
-        if self.layers:
-            return calculate_impact_category("gwp", self.layers, phases)
-        return 0
+        return sum_phases(await load_assembly_impacts(info, self), ["gwp"], phases)["gwp"]
+
+    @strawberry.field
+    async def impacts(
+        self,
+        info: Info,
+        indicators: list[GraphQLImpactIndicator] | None = None,
+        phases: list[str] | None = None,
+    ) -> list[GraphQLAssemblyImpact]:
+        """Calculate the impacts of the assembly based on the underlying layers. Defaults to all indicators."""
+
+        return await calculate_impacts(info, self, indicators, phases)
 
 
 @strawberry.type
@@ -71,12 +135,21 @@ class GraphQLProjectAssembly:
     layers: list[GraphQLAssemblyLayer]
 
     @strawberry.field
-    def gwp(self, phases: list[str] | None = None) -> float:
+    async def gwp(self, info: Info, phases: list[str] | None = None) -> float:
         """Calculate the gwp of the assembly based on the underlying layers."""
 
-        if self.layers:
-            return calculate_impact_category("gwp", self.layers, phases)
-        return 0
+        return sum_phases(await load_assembly_impacts(info, self), ["gwp"], phases)["gwp"]
+
+    @strawberry.field
+    async def impacts(
+        self,
+        info: Info,
+        indicators: list[GraphQLImpactIndicator] | None = None,
+        phases: list[str] | None = None,
+    ) -> list[GraphQLAssemblyImpact]:
+        """Calculate the impacts of the assembly based on the underlying layers. Defaults to all indicators."""
+
+        return await calculate_impacts(info, self, indicators, phases)
 
 
 class BaseAssemblyUpdateInput(BaseModel):
@@ -125,6 +198,6 @@ class AssemblyAddInput:
 
 def calculate_indicator(data_by_phases: dict, phases: list[str] | None) -> float:
     if phases:
-        return sum([data_by_phases.get(phase, 0) for phase in phases])
+        return sum([data_by_phases.get(phase) or 0 for phase in phases])
     else:
         return data_by_phases.get("a1a3", 0) or 0
@@ -0,0 +1,19 @@
+from pathlib import PurePath
+
+from import_data.epd_csv import read_epd_csv
+from import_data.ilcd import read_ilcd_archive
+
+# Readers of EPD files by file extension
+READERS = {
+    ".zip": read_ilcd_archive,
+    ".csv": read_epd_csv,
+}
+
+
+def get_reader(filename: str):
+    """Get the reader of an EPD file from its extension"""
+
+    suffix = PurePath(filename).suffix.lower()
+    if suffix not in READERS:
+        raise ValueError(f"Unsupported file type: {suffix or filename}. Supported types are {', '.join(READERS)}")
+    return READERS[suffix]
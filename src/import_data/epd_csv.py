@@ -0,0 +1,70 @@
+import csv
+import io
+import json
+import uuid
+from datetime import date
+from typing import IO, Iterator
+
+from core.impacts import INDICATORS, PHASES
+from import_data.importer import RecordError
+from models.epd import EPD
+
+REQUIRED_COLUMNS = ("name", "version", "valid_until", "published_date", "location", "subtype")
+
+
+def read_epd_csv(file: IO[bytes], source: str) -> Iterator[dict | RecordError]:
+    """
+    Read EPDs from a CSV file, one line at a time.
+    The columns are the ones written by the CSV export: the EPD fields, with a column per indicator and phase,
+    like gwp_a1a3. The origin_id column is used to match the EPDs on later imports. Rows without one get an origin id
+    derived from their source, name and version, so importing the same file again updates the EPDs.
+    """
+
+    reader = csv.DictReader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+    if missing:
+        yield RecordError(record="header", message=f"Missing columns: {', '.join(missing)}")
+        return
+
+    for row in reader:
+        try:
+            yield create_epd(row, source).dict()
+        except (ValueError, TypeError) as error:
+            yield RecordError(record=f"line {reader.line_num}", message=str(error))
+
+
+def create_epd(row: dict, source: str) -> EPD:
+    for column in REQUIRED_COLUMNS:
+        if not row.get(column):
+            raise ValueError(f"Missing {column}")
+
+    source = row.get("source") or source
+    return EPD(
+        origin_id=row.get("origin_id") or get_origin_id(source, row["name"], row["version"]),
+        name=row["name"],
+        version=row["version"],
+        declared_unit=row.get("declared_unit") or None,
+        valid_until=date.fromisoformat(row["valid_until"]),
+        published_date=date.fromisoformat(row["published_date"]),
+        source=source,
+        location=row["location"],
+        subtype=row["subtype"],
+        comment=row.get("comment") or None,
+        reference_service_life=int(row["reference_service_life"]) if row.get("reference_service_life") else None,
+        is_transport=(row.get("is_transport") or "").lower() in ("true", "1", "yes"),
+        conversions=json.loads(row["conversions"]) if row.get("conversions") else [],
+        meta_fields=json.loads(row["meta_fields"]) if row.get("meta_fields") else {},
+        **{
+            indicator: {
+                phase: float(row[f"{indicator}_{phase}"]) if row.get(f"{indicator}_{phase}") else None
+                for phase in PHASES
+            }
+            for indicator in INDICATORS
+        },
+    )
+
+
+def get_origin_id(source: str, name: str, version: str) -> str:
+    """Stable origin id of an EPD without one in the file"""
+
+    return str(uuid.uuid5(uuid.NAMESPACE_OID, json.dumps([source, name, version])))
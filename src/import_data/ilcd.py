@@ -0,0 +1,218 @@
+import zipfile
+from datetime import date
+from typing import IO, Iterator
+from xml.etree import ElementTree
+
+from core.impacts import INDICATORS, PHASES
+from import_data.importer import RecordError
+from models.epd import EPD
+
+# LCIA methods and flows of the EN 15804 indicators, as referenced by ÖKOBAUDAT and ECO Platform datasets
+INDICATOR_REFERENCES = {
+    "77e416eb-a363-4258-a04e-171d843a6460": "gwp",
+    "6a37f984-a4b3-458a-a20a-64418c145fa2": "gwp",
+    "06dcd26f-025f-401a-a7c1-5e457eb54637": "odp",
+    "b5c629d6-def3-11e6-bf01-fe55135034f3": "odp",
+    "b4274add-93b7-4905-a5e4-2e878c4e4216": "ap",
+    "b5c611c6-def3-11e6-bf01-fe55135034f3": "ap",
+    "f58827d0-b407-4ec6-be75-8b69efb98a0f": "ep",
+    "1e84a202-dae6-42aa-9e9d-71ea48b8be00": "pocp",
+    "b5c610fe-def3-11e6-bf01-fe55135034f3": "pocp",
+    "20f32be5-0398-4288-9b6d-accddd195317": "pere",
+    "ac857178-2b45-46ec-892a-a9a4332f0372": "penre",
+}
+
+# Indicator abbreviations in the short description of the reference, for datasets using other method versions
+INDICATOR_ABBREVIATIONS = {
+    "GWP": "gwp",
+    "GWP-total": "gwp",
+    "ODP": "odp",
+    "AP": "ap",
+    "EP": "ep",
+    "EP-freshwater": "ep",
+    "POCP": "pocp",
+    "PERE": "pere",
+    "PENRE": "penre",
+}
+
+SUBTYPES = {
+    "generic dataset": "Generic",
+    "average dataset": "Industry",
+    "representative dataset": "Industry",
+    "specific dataset": "Specific",
+    "template dataset": "Generic",
+}
+
+UNITS = {
+    "mass": "kg",
+    "volume": "m3",
+    "area": "m2",
+    "length": "m",
+    "number of pieces": "pcs",
+    "number of items": "pcs",
+}
+
+
+def read_ilcd_archive(file: IO[bytes], source: str) -> Iterator[dict | RecordError]:
+    """
+    Read EPDs from an ILCD+EPD zip archive, one process dataset at a time.
+    The archive is read through its directory, and every dataset is parsed incrementally,
+    so memory use is independent of the archive size.
+    """
+
+    with zipfile.ZipFile(file) as archive:
+        processes = []
+        flows = {}
+        for name in archive.namelist():
+            folder, _, filename = f"/{name}".lower().rpartition("/")
+            if not filename.endswith(".xml"):
+                continue
+            if folder.endswith("/processes"):
+                processes.append(name)
+            elif folder.endswith("/flows"):
+                flows[filename.removesuffix(".xml")] = name
+
+        for name in processes:
+            try:
+                with archive.open(name) as stream:
+                    process = parse_process(stream)
+                flow = flows.get(process.pop("reference_flow_id").lower())
+                process["declared_unit"] = read_declared_unit(archive, flow) if flow else None
+                yield create_epd(process, source).dict()
+            except KeyError as error:
+                yield RecordError(record=name, message=f"Missing {error.args[0]}")
+            except (ElementTree.ParseError, ValueError, AttributeError, TypeError) as error:
+                yield RecordError(record=name, message=str(error))
+
+
+def parse_process(stream: IO[bytes]) -> dict:
+    """Parse the fields of an EPD from an ILCD process dataset"""
+
+    process = {"names": {}, "impacts": {indicator: {} for indicator in INDICATORS}}
+    reference_exchange = None
+    exchanges = {}
+
+    for _, element in ElementTree.iterparse(stream, events=("end",)):
+        tag = local_name(element.tag)
+        if tag == "UUID" and "origin_id" not in process:
+            process["origin_id"] = element.text.strip()
+        elif tag == "baseName":
+            process["names"][element.get("{http://www.w3.org/XML/1998/namespace}lang", "")] = element.text.strip()
+        elif tag == "referenceYear":
+            process["published_date"] = date(int(element.text), 1, 1)
+        elif tag == "dataSetValidUntil":
+            process["valid_until"] = date(int(element.text), 12, 31)
+        elif tag == "locationOfOperationSupplyOrProduction":
+            process["location"] = element.get("location")
+        elif tag == "subType":
+            process["subtype"] = SUBTYPES.get(element.text.strip(), element.text.strip())
+        elif tag == "dataSetVersion":
+            process["version"] = element.text.strip()
+        elif tag == "referenceToReferenceFlow":
+            reference_exchange = element.text.strip()
+        elif tag == "exchange":
+            flow = element.find("{*}referenceToFlowDataSet")
+            exchanges[element.get("dataSetInternalID")] = (flow.get("refObjectId"), element.findtext("{*}meanAmount"))
+            add_impacts(process["impacts"], flow, element)
+            element.clear()
+        elif tag == "LCIAResult":
+            add_impacts(process["impacts"], element.find("{*}referenceToLCIAMethodDataSet"), element)
+            element.clear()
+
+    names = process.pop("names")
+    process["name"] = names.get("en") or next(iter(names.values()), None)
+    if reference_exchange not in exchanges:
+        raise ValueError("The dataset has no reference flow")
+
+    process["reference_flow_id"], declared_amount = exchanges[reference_exchange]
+    if declared_amount and float(declared_amount) not in (0, 1):
+        process["impacts"] = {
+            indicator: {phase: value / float(declared_amount) for phase, value in values.items()}
+            for indicator, values in process["impacts"].items()
+        }
+    return process
+
+
+def add_impacts(impacts: dict, reference: ElementTree.Element | None, element: ElementTree.Element) -> None:
+    """Add the amounts per module of an exchange or LCIA result, if it references one of the indicators"""
+
+    if reference is None or not (indicator := get_indicator(reference)):
+        return
+
+    amounts = [
+        (amount.get("{http://www.iai.kit.edu/EPD/2013}module"), amount.text)
+        for amount in element.iterfind(".//{*}amount")
+        if amount.text and amount.text.strip() not in ("", "ND")
+    ]
+    # Skip A1, A2 and A3 if the dataset declares their sum, and only keep the first scenario of each module
+    modules = {module for module, _ in amounts}
+    seen = set()
+    for module, value in amounts:
+        if not module or module in seen or module in ("A1", "A2", "A3") and "A1-A3" in modules:
+            continue
+        seen.add(module)
+        phase = convert_module(module)
+        if phase in PHASES:
+            impacts[indicator][phase] = impacts[indicator].get(phase, 0) + float(value)
+
+
+def get_indicator(reference: ElementTree.Element) -> str | None:
+    if indicator := INDICATOR_REFERENCES.get(reference.get("refObjectId", "")):
+        return indicator
+
+    for description in reference.iterfind(".//{*}shortDescription"):
+        text = description.text or ""
+        if "(" in text and ")" in text:
+            if indicator := INDICATOR_ABBREVIATIONS.get(text[text.rindex("(") + 1 : text.rindex(")")].strip()):
+                return indicator
+    return None
+
+
+def convert_module(module: str) -> str:
+    """Convert an EN 15804 module like A1-A3 or C4 to a phase. A1, A2 and A3 are summed in A1-A3."""
+
+    phase = module.replace("-", "").lower()
+    return "a1a3" if phase in ("a1", "a2", "a3") else phase
+
+
+def read_declared_unit(archive: zipfile.ZipFile, name: str) -> str | None:
+    """Read the unit of the reference flow from the flow dataset in the archive"""
+
+    reference_property = None
+    properties = {}
+    with archive.open(name) as stream:
+        for _, element in ElementTree.iterparse(stream, events=("end",)):
+            tag = local_name(element.tag)
+            if tag == "referenceToReferenceFlowProperty":
+                reference_property = element.text.strip()
+            elif tag == "flowProperty":
+                properties[element.get("dataSetInternalID")] = " ".join(
+                    (description.text or "").lower() for description in element.iterfind(".//{*}shortDescription")
+                )
+
+    description = properties.get(reference_property, "")
+    return next((unit for quantity, unit in UNITS.items() if quantity in description), None)
+
+
+def create_epd(process: dict, source: str) -> EPD:
+    return EPD(
+        origin_id=process["origin_id"],
+        name=process["name"],
+        version=process.get("version", "00.00.000"),
+        declared_unit=process.get("declared_unit"),
+        valid_until=process["valid_until"],
+        published_date=process["published_date"],
+        source=source,
+        location=process.get("location", ""),
+        subtype=process.get("subtype", ""),
+        comment=None,
+        reference_service_life=None,
+        is_transport=False,
+        conversions=[],
+        meta_fields={},
+        **process["impacts"],
+    )
+
+
+def local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
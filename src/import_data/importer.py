@@ -0,0 +1,74 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Callable, Iterator
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from schema.epd import upsert_epd_rows
+
+logger = logging.getLogger(__name__)
+
+# Number of records parsed and written per transaction
+CHUNK_SIZE = 1000
+
+
+@dataclass
+class RecordError:
+    """A record that could not be imported. The record is identified by its file name or line number."""
+
+    record: str
+    message: str
+
+
+@dataclass
+class ImportReport:
+    read: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    errors: list[RecordError] = field(default_factory=list)
+
+
+async def import_epds(
+    session: AsyncSession,
+    records: Iterator[dict | RecordError],
+    chunk_size: int = CHUNK_SIZE,
+    progress: Callable[[ImportReport], None] | None = None,
+) -> ImportReport:
+    """
+    Write EPD rows from a record iterator as chunked upserts, committing after each chunk.
+    Only a single chunk of records is held in memory. Records are parsed in a worker thread, so that large files
+    don't block the event loop. Records that fail to parse are collected in the report and skipped.
+    """
+
+    report = ImportReport()
+    while chunk := await asyncio.to_thread(lambda: list(islice(records, chunk_size))):
+        rows = []
+        for record in chunk:
+            if isinstance(record, RecordError):
+                report.errors.append(record)
+            else:
+                rows.append(record)
+        report.read += len(chunk)
+
+        if rows:
+            upserted = await upsert_epd_rows(session, rows)
+            await session.commit()
+
+            report.inserted += upserted.inserted
+            report.updated += upserted.updated
+            report.unchanged += upserted.unchanged
+
+        if progress:
+            progress(report)
+
+    return report
+
+
+def log_progress(report: ImportReport) -> None:
+    logger.info(
+        f"Read {report.read} records: {report.inserted} inserted, {report.updated} updated, "
+        f"{report.unchanged} unchanged and {len(report.errors)} failed"
+    )
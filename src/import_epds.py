@@ -0,0 +1,35 @@
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+
+from lcacollect_config.connection import create_postgres_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from import_data import get_reader
+from import_data.importer import CHUNK_SIZE, import_epds, log_progress
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main(path: Path, source: str, chunk_size: int) -> None:
+    logger.info(f"Importing EPDs from {path}")
+    reader = get_reader(path.name)
+    with path.open("rb") as file:
+        async with AsyncSession(create_postgres_engine()) as session:
+            report = await import_epds(session, reader(file, source), chunk_size=chunk_size, progress=log_progress)
+
+    for error in report.errors:
+        logger.warning(f"Could not import {error.record}: {error.message}")
+    log_progress(report)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import EPDs from an ILCD+EPD zip archive or a CSV file")
+    parser.add_argument("path", type=Path, help="ILCD+EPD zip archive or CSV file")
+    parser.add_argument("--source", help="Source of the EPDs. Defaults to the file name")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Number of EPDs written per transaction")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.path, args.source or args.path.stem, args.chunk_size))
@@ -0,0 +1,2 @@
+# Import the dataset loaders, so that they are registered for seeding
+from initial_data import load_tabel7  # noqa: F401
@@ -1,73 +1,108 @@
 import asyncio
 import csv
+import hashlib
 import io
-from datetime import date
+import logging
+from datetime import date, datetime
 from pathlib import Path
 
 from lcacollect_config.connection import create_postgres_engine
-from sqlmodel import select
+from sqlmodel import col, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from core.bulk import bulk_insert
+from core.epd_cache import notify_epds_changed
+from initial_data.seeding import register_dataset
 from models.epd import EPD
+from models.seed import SeedDataset
+
+DATASET_NAME = "BR18 - Tabel 7"
+EPD_VERSION = "version 2 - 201222"
+TABLE7_CSV = Path(__file__).parent / "BR18_bilag_2_tabel_7_version_2_201222.csv"
+
+logger = logging.getLogger(__name__)
 
 
 async def load(path: Path):
-    reader = csv.DictReader(io.StringIO(path.read_text()))
+    """
+    Seed the Table 7 EPDs from the CSV file.
+    Skips when the file has already been loaded, otherwise inserts the missing EPDs in a single transaction.
+    """
+
+    content = path.read_bytes()
+    fingerprint = hashlib.sha256(content).hexdigest()
 
     async with AsyncSession(create_postgres_engine()) as session:
-        for row in reader:
-            row: dict
-            if row.get("Sorterings ID").startswith("#S"):
-                continue
-            _test = (await session.exec(select(EPD))).first()
-            _epd = (await session.exec(select(EPD).where(EPD.comment == row.get("Sorterings ID")))).first()
-            if _epd:
-                continue
-
-            epd = EPD(
-                name=row.get("Navn DK"),
-                version="version 2 - 201222",
-                declared_unit=convert_unit(row.get("Deklareret enhed (FU)")),
-                valid_until=date(year=2025, month=12, day=22),
-                published_date=date(year=2020, month=12, day=22),
-                source="BR18 - Tabel 7",
-                subtype=convert_subtype(row.get("Data type")),
-                comment=row.get("Sorterings ID"),
-                reference_service_life=None,
-                location="DK",
-                is_transport=False,
-                conversions=[
-                    {"to": "KG", "value": float(row.get("Masse faktor")) * float(row.get("Deklareret faktor (FU)"))}
-                ],
-                gwp={
-                    "a1a3": convert_gwp(
-                        row.get("Global Opvarmning, modul A1-A3"), float(row.get("Deklareret faktor (FU)"))
-                    ),
-                    "a4": None,
-                    "a5": None,
-                    "b1": None,
-                    "b2": None,
-                    "b3": None,
-                    "b4": None,
-                    "b5": None,
-                    "b6": None,
-                    "b7": None,
-                    "c1": None,
-                    "c2": None,
-                    "c3": convert_gwp(row.get("Global Opvarmning, modul C3"), float(row.get("Deklareret faktor (FU)"))),
-                    "c4": convert_gwp(row.get("Global Opvarmning, modul C4"), float(row.get("Deklareret faktor (FU)"))),
-                    "d": convert_gwp(row.get("Global Opvarmning, modul D"), float(row.get("Deklareret faktor (FU)"))),
-                },
-                odp={},
-                ap={},
-                ep={},
-                pocp={},
-                penre={},
-                pere={},
-                meta_fields={"data_source": row.get("Url (link)")},
-            )
-            session.add(epd)
-            await session.commit()
+        dataset = await session.get(SeedDataset, DATASET_NAME)
+        if dataset and dataset.fingerprint == fingerprint:
+            logger.info(f"{DATASET_NAME} is up to date")
+            return
+
+        rows = [
+            row
+            for row in csv.DictReader(io.StringIO(content.decode()))
+            if not row.get("Sorterings ID").startswith("#S")
+        ]
+        query = select(EPD.comment).where(
+            EPD.source == DATASET_NAME, col(EPD.comment).in_([row.get("Sorterings ID") for row in rows])
+        )
+        existing = set((await session.exec(query)).all())
+
+        epds = [create_epd(row).dict() for row in rows if row.get("Sorterings ID") not in existing]
+        await bulk_insert(session, EPD, epds)
+        if epds:
+            await notify_epds_changed(session)
+
+        if dataset:
+            dataset.fingerprint = fingerprint
+            dataset.loaded_at = datetime.utcnow()
+        else:
+            dataset = SeedDataset(name=DATASET_NAME, fingerprint=fingerprint)
+        session.add(dataset)
+        await session.commit()
+
+        logger.info(f"Loaded {len(epds)} EPDs from {DATASET_NAME}")
+
+
+def create_epd(row: dict) -> EPD:
+    return EPD(
+        name=row.get("Navn DK"),
+        version=EPD_VERSION,
+        declared_unit=convert_unit(row.get("Deklareret enhed (FU)")),
+        valid_until=date(year=2025, month=12, day=22),
+        published_date=date(year=2020, month=12, day=22),
+        source=DATASET_NAME,
+        subtype=convert_subtype(row.get("Data type")),
+        comment=row.get("Sorterings ID"),
+        reference_service_life=None,
+        location="DK",
+        is_transport=False,
+        conversions=[{"to": "KG", "value": float(row.get("Masse faktor")) * float(row.get("Deklareret faktor (FU)"))}],
+        gwp={
+            "a1a3": convert_gwp(row.get("Global Opvarmning, modul A1-A3"), float(row.get("Deklareret faktor (FU)"))),
+            "a4": None,
+            "a5": None,
+            "b1": None,
+            "b2": None,
+            "b3": None,
+            "b4": None,
+            "b5": None,
+            "b6": None,
+            "b7": None,
+            "c1": None,
+            "c2": None,
+            "c3": convert_gwp(row.get("Global Opvarmning, modul C3"), float(row.get("Deklareret faktor (FU)"))),
+            "c4": convert_gwp(row.get("Global Opvarmning, modul C4"), float(row.get("Deklareret faktor (FU)"))),
+            "d": convert_gwp(row.get("Global Opvarmning, modul D"), float(row.get("Deklareret faktor (FU)"))),
+        },
+        odp={},
+        ap={},
+        ep={},
+        pocp={},
+        penre={},
+        pere={},
+        meta_fields={"data_source": row.get("Url (link)")},
+    )
 
 
 def convert_unit(unit: str) -> str:
@@ -92,6 +127,10 @@ def convert_gwp(gwp: str, declared_factor: float) -> float | None:
         return float(gwp) / declared_factor
 
 
+@register_dataset(DATASET_NAME)
+async def load_table7():
+    await load(TABLE7_CSV)
+
+
 if __name__ == "__main__":
-    p = Path(__file__).parent / "BR18_bilag_2_tabel_7_version_2_201222.csv"
-    asyncio.run(load(p))
+    asyncio.run(load(TABLE7_CSV))
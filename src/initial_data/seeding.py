@@ -0,0 +1,55 @@
+import logging
+from typing import Awaitable, Callable
+
+from lcacollect_config.connection import create_postgres_engine
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Postgres advisory lock key held while reference datasets are seeded
+SEED_LOCK_ID = 7_431_802
+
+DATASETS: dict[str, Callable[[], Awaitable[None]]] = {}
+
+
+def register_dataset(name: str):
+    """Register a loader for a reference dataset. Loaders must be idempotent, as they run on every seeding."""
+
+    def decorator(loader: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+        DATASETS[name] = loader
+        return loader
+
+    return decorator
+
+
+async def run_seeding(datasets: list[str] | None = None, engine: AsyncEngine | None = None) -> bool:
+    """
+    Load the registered reference datasets, or the given subset of them.
+    Only the process holding the seeding advisory lock loads data. Other processes return False right away.
+    """
+
+    unknown = set(datasets or []) - DATASETS.keys()
+    if unknown:
+        raise ValueError(f"Unknown datasets: {', '.join(sorted(unknown))}")
+
+    engine = engine or create_postgres_engine()
+    async with engine.connect() as connection:
+        locked = (await connection.execute(text("SELECT pg_try_advisory_lock(:id)"), {"id": SEED_LOCK_ID})).scalar()
+        await connection.commit()
+        if not locked:
+            logger.info("Seeding is running in another process")
+            return False
+
+        try:
+            for name, loader in DATASETS.items():
+                if datasets and name not in datasets:
+                    continue
+                logger.info(f"Seeding {name}")
+                await loader()
+        finally:
+            # The lock belongs to the database session, so it has to be released before the connection is pooled
+            await connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": SEED_LOCK_ID})
+            await connection.commit()
+
+    return True
@@ -1,13 +1,18 @@
+import asyncio
 import logging.config
-from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from lcacollect_config.security import azure_scheme
 
 from core.config import settings
-from initial_data.load_tabel7 import load as load_table_7_epds
+from core.epd_cache import listen_for_epd_changes
+from core.http import close_router_client
+from core.metrics import start_metrics_server
+from initial_data.seeding import run_seeding
 from routes import graphql_app
+from routes.export import export_router
+from routes.imports import import_router
 
 if settings.SERVER_NAME != "LCA Test":
     logging.config.fileConfig("logging.conf", disable_existing_loggers=False)
@@ -35,6 +40,8 @@ if settings.BACKEND_CORS_ORIGINS:
     )
 
 app.include_router(graphql_app, prefix=settings.API_STR)
+app.include_router(export_router, prefix=settings.API_STR)
+app.include_router(import_router, prefix=settings.API_STR)
 
 
 @app.on_event("startup")
@@ -45,7 +52,32 @@ async def app_init():
     # Setup Azure AD
     await azure_scheme.openid_config.load_config()
 
-    # Load Table 7 EPDs
+    # Seed reference data in the background, so the app serves requests right away.
+    # Only the replica holding the seeding lock loads data, the others skip it.
+    if settings.SERVER_NAME != "LCA Test" and settings.SEED_ON_STARTUP:
+        app.state.seeding = asyncio.create_task(seed_reference_data())
+
     if settings.SERVER_NAME != "LCA Test":
-        table7_csv = Path(__file__).parent / "initial_data" / "BR18_bilag_2_tabel_7_version_2_201222.csv"
-        await load_table_7_epds(table7_csv)
+        app.state.metrics_server = start_metrics_server(settings.METRICS_PORT)
+
+    # Keep the EPD cache in sync with the changes made by other replicas
+    app.state.epd_listener = asyncio.create_task(listen_for_epd_changes())
+
+
+async def seed_reference_data():
+    try:
+        await run_seeding()
+    except Exception:
+        logger.exception("Failed to seed reference data")
+
+
+@app.on_event("shutdown")
+async def app_shutdown():
+    """Close application services"""
+
+    for task in [getattr(app.state, "seeding", None), getattr(app.state, "epd_listener", None)]:
+        if task and not task.done():
+            task.cancel()
+    if metrics_server := getattr(app.state, "metrics_server", None):
+        metrics_server.shutdown()
+    await close_router_client()
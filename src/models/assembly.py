@@ -2,9 +2,12 @@ from enum import Enum
 from typing import TYPE_CHECKING, Optional
 
 from lcacollect_config.formatting import string_uuid
-from sqlalchemy import Column
+from sqlalchemy import Column, ForeignKey
 from sqlalchemy.dialects.postgresql import JSON
 from sqlmodel import Field, Relationship, SQLModel
+from sqlmodel.sql.sqltypes import AutoString
+
+from core.search import ASSEMBLY_SEARCH_DOCUMENT, add_search_vector
 
 if TYPE_CHECKING:
     from models.links import AssemblyEPDLink, ProjectAssemblyEPDLink
@@ -34,12 +37,17 @@ class Assembly(AssemblyBase, table=True):
     source: str
 
     # Relationships
-    project_assemblies: list["ProjectAssembly"] = Relationship(back_populates="origin")
+    project_assemblies: list["ProjectAssembly"] = Relationship(
+        back_populates="origin", sa_relationship_kwargs={"passive_deletes": True}
+    )
     layers: list["AssemblyEPDLink"] = Relationship(
-        back_populates="assembly", sa_relationship_kwargs={"cascade": "all,delete"}
+        back_populates="assembly", sa_relationship_kwargs={"cascade": "all,delete", "passive_deletes": True}
     )
 
 
+add_search_vector(Assembly, ASSEMBLY_SEARCH_DOCUMENT)
+
+
 class ProjectAssembly(AssemblyBase, table=True):
     """Assembly database class"""
 
@@ -49,12 +57,15 @@ class ProjectAssembly(AssemblyBase, table=True):
         nullable=False,
         sa_column_kwargs={"unique": True},
     )
-    project_id: str
+    project_id: str = Field(index=True)
 
-    origin_id: str | None = Field(foreign_key="assembly.id", nullable=True)
+    origin_id: str | None = Field(
+        default=None,
+        sa_column=Column(AutoString, ForeignKey("assembly.id", ondelete="SET NULL"), nullable=True, index=True),
+    )
     origin: Assembly | None = Relationship(back_populates="project_assemblies")
     layers: list["ProjectAssemblyEPDLink"] = Relationship(
-        back_populates="assembly", sa_relationship_kwargs={"cascade": "all,delete"}
+        back_populates="assembly", sa_relationship_kwargs={"cascade": "all,delete", "passive_deletes": True}
     )
 
     @classmethod
@@ -63,3 +74,6 @@ class ProjectAssembly(AssemblyBase, table=True):
         project_assembly = cls(**org_data, project_id=project_id, origin=assembly, origin_id=assembly.id)
 
         return project_assembly
+
+
+add_search_vector(ProjectAssembly, ASSEMBLY_SEARCH_DOCUMENT)
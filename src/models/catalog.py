@@ -0,0 +1,8 @@
+from sqlmodel import Field, SQLModel
+
+
+class CatalogVersion(SQLModel, table=True):
+    """Version of a reference data catalog, like the global EPDs. It is bumped in the transaction changing the data."""
+
+    name: str = Field(primary_key=True)
+    version: int = 0
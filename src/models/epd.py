@@ -2,15 +2,56 @@ from datetime import date
 from typing import TYPE_CHECKING, Optional
 
 from lcacollect_config.formatting import string_uuid
-from sqlalchemy import Column, UniqueConstraint
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy import (
+    Column,
+    Index,
+    UniqueConstraint,
+    literal_column,
+    text,
+    type_coerce,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, DOUBLE_PRECISION, JSON
 from sqlalchemy.orm import RelationshipProperty
+from sqlalchemy.types import TypeDecorator
 from sqlmodel import Field, Relationship, SQLModel
 
+from core.impacts import PHASES
+from core.search import EPD_SEARCH_DOCUMENT, add_search_vector
+
 if TYPE_CHECKING:
     from models.links import AssemblyEPDLink, ProjectAssemblyEPDLink
 
 
+class ImpactCategories(TypeDecorator):
+    """
+    Indicator values by phase, stored as a float8[] in the order of `core.impacts.PHASES`.
+    The values are exposed as {phase: value} dicts, while single phases can be filtered, sorted and indexed in SQL.
+    """
+
+    impl = ARRAY(DOUBLE_PRECISION)
+    cache_ok = True
+
+    def process_bind_param(self, value: dict | None, dialect) -> list[float | None] | None:
+        if value is None:
+            return None
+        if not value:
+            return []
+        if unknown := set(value) - set(PHASES):
+            raise ValueError(f"Unknown phases: {', '.join(sorted(unknown))}")
+        return [float(value[phase]) if value.get(phase) is not None else None for phase in PHASES]
+
+    def process_result_value(self, value: list[float | None] | None, dialect) -> dict | None:
+        if value is None:
+            return None
+        return dict(zip(PHASES, value))
+
+
+def impact_value(column, phase: str):
+    """SQL expression for the value of a single phase of an impact column"""
+
+    return type_coerce(column, ARRAY(DOUBLE_PRECISION))[literal_column(str(PHASES.index(phase) + 1))]
+
+
 class EPDBase(SQLModel):
     name: str = Field(index=True)
     version: str
@@ -25,13 +66,13 @@ class EPDBase(SQLModel):
     reference_service_life: int | None
     conversions: list = Field(default=list, sa_column=Column(JSON), nullable=False)
 
-    gwp: dict = Field(default=dict, sa_column=Column(JSON), nullable=False)
-    odp: dict = Field(default=dict, sa_column=Column(JSON), nullable=False)
-    ap: dict = Field(default=dict, sa_column=Column(JSON), nullable=False)
-    ep: dict = Field(default=dict, sa_column=Column(JSON), nullable=False)
-    pocp: dict = Field(default=dict, sa_column=Column(JSON), nullable=False)
-    penre: dict = Field(default=dict, sa_column=Column(JSON), nullable=False)
-    pere: dict = Field(default=dict, sa_column=Column(JSON), nullable=False)
+    gwp: dict = Field(default=dict, sa_column=Column(ImpactCategories), nullable=False)
+    odp: dict = Field(default=dict, sa_column=Column(ImpactCategories), nullable=False)
+    ap: dict = Field(default=dict, sa_column=Column(ImpactCategories), nullable=False)
+    ep: dict = Field(default=dict, sa_column=Column(ImpactCategories), nullable=False)
+    pocp: dict = Field(default=dict, sa_column=Column(ImpactCategories), nullable=False)
+    penre: dict = Field(default=dict, sa_column=Column(ImpactCategories), nullable=False)
+    pere: dict = Field(default=dict, sa_column=Column(ImpactCategories), nullable=False)
 
     meta_fields: dict = Field(default=dict, sa_column=Column(JSON), nullable=False)
 
@@ -48,7 +89,12 @@ class EPD(EPDBase, table=True):
     The origin_id is the id from the data source fx. Ökobau or ECOplatform
     """
 
-    __table_args__ = (UniqueConstraint("origin_id", "version", name="origin_version"),)
+    __table_args__ = (
+        UniqueConstraint("origin_id", "version", name="origin_version"),
+        Index("ix_epd_gwp_a1a3", text("(gwp[1])")),
+        # Expression and tiebreaker of the default sortByImpact, A1-A3 GWP ascending, see get_impact_sort_column
+        Index("ix_epd_gwp_a1a3_sort", text("coalesce(gwp[1], 'Infinity'::double precision)"), text("id")),
+    )
 
     id: Optional[str] = Field(default_factory=string_uuid, primary_key=True)
     origin_id: Optional[str] = None
@@ -73,14 +119,20 @@ class EPD(EPDBase, table=True):
     )
 
 
+add_search_vector(EPD, EPD_SEARCH_DOCUMENT)
+
+
 class ProjectEPD(EPDBase, table=True):
     """Project related EPD class"""
 
+    # Project EPDs are looked up by project, and by project and origin when EPDs are copied into a project
+    __table_args__ = (Index("ix_projectepd_project_id_origin_id", "project_id", "origin_id"),)
+
     id: Optional[str] = Field(default_factory=string_uuid, primary_key=True)
     project_id: str
 
     # Relationships
-    origin_id: str = Field(foreign_key="epd.id")
+    origin_id: str = Field(foreign_key="epd.id", index=True)
     origin: EPD = Relationship(back_populates="project_epds")
     assembly_links: list["ProjectAssemblyEPDLink"] = Relationship(
         back_populates="epd",
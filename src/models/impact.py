@@ -0,0 +1,29 @@
+from sqlalchemy import Column, ForeignKey
+from sqlmodel import Field, SQLModel
+from sqlmodel.sql.sqltypes import AutoString
+
+from models.epd import ImpactCategories
+
+
+class AssemblyImpactBase(SQLModel):
+    """Impact totals of an assembly, summed over its layers. Kept up to date by the layer and EPD mutations."""
+
+    gwp: dict | None = Field(default=None, sa_column=Column(ImpactCategories))
+    odp: dict | None = Field(default=None, sa_column=Column(ImpactCategories))
+    ap: dict | None = Field(default=None, sa_column=Column(ImpactCategories))
+    ep: dict | None = Field(default=None, sa_column=Column(ImpactCategories))
+    pocp: dict | None = Field(default=None, sa_column=Column(ImpactCategories))
+    penre: dict | None = Field(default=None, sa_column=Column(ImpactCategories))
+    pere: dict | None = Field(default=None, sa_column=Column(ImpactCategories))
+
+
+class AssemblyImpact(AssemblyImpactBase, table=True):
+    assembly_id: str = Field(
+        sa_column=Column(AutoString, ForeignKey("assembly.id", ondelete="CASCADE"), primary_key=True)
+    )
+
+
+class ProjectAssemblyImpact(AssemblyImpactBase, table=True):
+    assembly_id: str = Field(
+        sa_column=Column(AutoString, ForeignKey("projectassembly.id", ondelete="CASCADE"), primary_key=True)
+    )
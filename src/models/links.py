@@ -1,8 +1,10 @@
 from typing import TYPE_CHECKING, Optional
 
 from lcacollect_config.formatting import string_uuid
+from sqlalchemy import Column, ForeignKey
 from sqlalchemy.orm import RelationshipProperty
 from sqlmodel import Field, Relationship, SQLModel
+from sqlmodel.sql.sqltypes import AutoString
 
 if TYPE_CHECKING:
     from models.assembly import Assembly, ProjectAssembly
@@ -25,9 +27,17 @@ class AssemblyEPDLink(AssemblyEPDLinkBase, table=True):
     """Assembly EPD Database class"""
 
     id: Optional[str] = Field(default_factory=string_uuid, primary_key=True)
-    assembly_id: Optional[str] = Field(default=None, foreign_key="assembly.id", primary_key=True)
-    epd_id: Optional[str] = Field(default=None, foreign_key="epd.id", primary_key=True)
-    transport_epd_id: Optional[str] = Field(default=None, foreign_key="epd.id")
+    assembly_id: Optional[str] = Field(
+        default=None,
+        sa_column=Column(AutoString, ForeignKey("assembly.id", ondelete="CASCADE"), primary_key=True, index=True),
+    )
+    epd_id: Optional[str] = Field(
+        default=None,
+        sa_column=Column(AutoString, ForeignKey("epd.id"), primary_key=True, index=True),
+    )
+    transport_epd_id: Optional[str] = Field(
+        default=None, sa_column=Column(AutoString, ForeignKey("epd.id"), index=True)
+    )
 
     assembly: "Assembly" = Relationship(back_populates="layers")
     epd: "EPD" = Relationship(
@@ -52,9 +62,19 @@ class ProjectAssemblyEPDLink(AssemblyEPDLinkBase, table=True):
     """Project Assembly EPD Database class"""
 
     id: Optional[str] = Field(default_factory=string_uuid, primary_key=True)
-    assembly_id: Optional[str] = Field(default=None, foreign_key="projectassembly.id", primary_key=True)
-    epd_id: Optional[str] = Field(default=None, foreign_key="projectepd.id", primary_key=True)
-    transport_epd_id: Optional[str] = Field(default=None, foreign_key="projectepd.id")
+    assembly_id: Optional[str] = Field(
+        default=None,
+        sa_column=Column(
+            AutoString, ForeignKey("projectassembly.id", ondelete="CASCADE"), primary_key=True, index=True
+        ),
+    )
+    epd_id: Optional[str] = Field(
+        default=None,
+        sa_column=Column(AutoString, ForeignKey("projectepd.id"), primary_key=True, index=True),
+    )
+    transport_epd_id: Optional[str] = Field(
+        default=None, sa_column=Column(AutoString, ForeignKey("projectepd.id"), index=True)
+    )
 
     assembly: "ProjectAssembly" = Relationship(back_populates="layers")
     epd: "ProjectEPD" = Relationship(
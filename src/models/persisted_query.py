@@ -0,0 +1,11 @@
+from datetime import datetime
+
+from sqlmodel import Field, SQLModel
+
+
+class PersistedQuery(SQLModel, table=True):
+    """GraphQL query registered by a client through automatic persisted queries, keyed by its SHA-256 hash"""
+
+    hash: str = Field(primary_key=True)
+    query: str
+    registered_at: datetime = Field(default_factory=datetime.utcnow, index=True)
@@ -0,0 +1,11 @@
+from datetime import datetime
+
+from sqlmodel import Field, SQLModel
+
+
+class SeedDataset(SQLModel, table=True):
+    """Fingerprint of a dataset that has been seeded into the database"""
+
+    name: str = Field(primary_key=True)
+    fingerprint: str
+    loaded_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,23 @@
+import asyncio
+import logging
+
+from lcacollect_config.connection import create_postgres_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.impact_totals import rebuild_assembly_impacts
+from models.assembly import Assembly, ProjectAssembly
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    logger.info("Rebuilding assembly impacts")
+    async with AsyncSession(create_postgres_engine()) as session:
+        for assembly_model in (Assembly, ProjectAssembly):
+            count = await rebuild_assembly_impacts(session, assembly_model)
+            logger.info(f"Rebuilt impacts of {count} {assembly_model.__name__} rows")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
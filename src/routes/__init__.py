@@ -1,11 +1,121 @@
+import json
 import os
 
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
 from lcacollect_config.fastapi import get_context
 from lcacollect_config.router import LCAGraphQLRouter
+from strawberry import UNSET
+from strawberry.fastapi import GraphQLRouter
+from strawberry.http import GraphQLHTTPResponse, GraphQLRequestData
+from strawberry.http.async_base_view import AsyncHTTPRequestAdapter
+from strawberry.http.exceptions import HTTPException
+from strawberry.types import ExecutionResult
 
+from core.epd_cache import epd_cache
+from core.metrics import record_cache_lookups
+from core.persisted_queries import (
+    NOT_FOUND,
+    PersistedQueryError,
+    PersistedQueryNotFound,
+    resolve_persisted_query,
+)
+from core.response_cache import build_etag, etag_matches, get_cache_key, response_cache
 from schema import schema
 
-graphql_app = LCAGraphQLRouter(
+
+class CachingGraphQLRouter(LCAGraphQLRouter):
+    """
+    GraphQL router, which supports automatic persisted queries and serves GET queries over the EPD catalog from a
+    response cache.
+    The responses carry an ETag derived from the catalog version, so clients can revalidate them with If-None-Match.
+    """
+
+    async def run(self, request: Request, context=UNSET, root_value=UNSET) -> Response:
+        request_adapter = self.request_adapter_class(request)
+        if not self.is_request_allowed(request_adapter) or self.should_render_graphiql(request_adapter):
+            return await super().run(request, context=context, root_value=root_value)
+
+        try:
+            request.state.graphql_request = await self.parse_graphql_request(request_adapter, context["session"])
+        except PersistedQueryNotFound:
+            # Answered as a GraphQL error, which makes clients send the request again with the query
+            error = {"message": NOT_FOUND, "extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"}}
+            return JSONResponse({"errors": [error]}, headers={"Cache-Control": "private, no-cache"})
+        except PersistedQueryError as e:
+            raise HTTPException(400, str(e)) from e
+
+        key = get_request_cache_key(request.method, request.state.graphql_request)
+        if key is None:
+            return await super().run(request, context=context, root_value=root_value)
+
+        version = await epd_cache.version(context["session"])
+        headers = {"ETag": build_etag(version, key), "Cache-Control": "private, no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            record_cache_lookups("response", 1, 0)
+            return Response(status_code=304, headers=headers)
+
+        body = response_cache.get((version, key))
+        record_cache_lookups("response", int(body is not None), int(body is None))
+        if body is None:
+            response = await super().run(request, context=context, root_value=root_value)
+            if response.status_code != 200 or "errors" in json.loads(response.body):
+                return response
+            body = response.body
+            response_cache.set((version, key), body)
+
+        return Response(body, media_type="application/json", headers=headers)
+
+    def should_render_graphiql(self, request: AsyncHTTPRequestAdapter) -> bool:
+        # GET requests of persisted queries don't have a query either
+        return super().should_render_graphiql(request) and request.query_params.get("extensions") is None
+
+    async def parse_graphql_request(self, request: AsyncHTTPRequestAdapter, session) -> GraphQLRequestData:
+        """Parse the request like Strawberry does, and resolve the query of persisted queries"""
+
+        content_type = request.content_type or ""
+        if "application/json" in content_type:
+            data = self.parse_json(await request.get_body())
+        elif content_type.startswith("multipart/form-data"):
+            data = await self.parse_multipart(request)
+        elif request.method == "GET":
+            try:
+                data = self.parse_query_params(request.query_params)
+                data["extensions"] = json.loads(data.get("extensions") or "null")
+            except json.JSONDecodeError as e:
+                raise HTTPException(400, "Unable to parse request parameters as JSON") from e
+        else:
+            raise HTTPException(400, "Unsupported content type")
+
+        if not isinstance(data, dict):
+            raise HTTPException(400, "Batched requests are not supported")
+
+        return GraphQLRequestData(
+            query=await resolve_persisted_query(session, self.schema, data.get("query"), data.get("extensions")),
+            variables=data.get("variables"),
+            operation_name=data.get("operationName"),
+        )
+
+    async def parse_http_body(self, request: AsyncHTTPRequestAdapter) -> GraphQLRequestData:
+        # Parsed in run, where persisted queries are resolved with the session of the request
+        return request.request.state.graphql_request
+
+    async def process_result(self, request: Request, result: ExecutionResult) -> GraphQLHTTPResponse:
+        # The path is logged from the query in the request body, which GET requests and persisted queries don't have
+        if request.method == "GET" or "query" not in await request.json():
+            return await GraphQLRouter.process_result(self, request, result)
+        return await super().process_result(request, result)
+
+
+def get_request_cache_key(method: str, request_data: GraphQLRequestData) -> str | None:
+    """Cache key of a GET request, if it queries the EPD catalog only"""
+
+    if method != "GET":
+        return None
+    return get_cache_key(request_data.query, request_data.variables, request_data.operation_name)
+
+
+graphql_app = CachingGraphQLRouter(
     schema,
     context_getter=get_context,
     path="/graphql",
@@ -0,0 +1,132 @@
+import json
+from enum import Enum
+from typing import AsyncIterator, Type
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Security
+from fastapi.responses import StreamingResponse
+from lcacollect_config.connection import get_db
+from lcacollect_config.graphql.input_filters import (
+    BaseFilter,
+    FilterOptions,
+    filter_model_query,
+)
+from lcacollect_config.security import azure_scheme
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core import export
+from core.config import settings
+from core.query_planner import to_snake
+from models.assembly import ProjectAssembly
+from models.epd import EPD, ProjectEPD
+from schema.inputs import AssemblyFilters, EPDFilters, ProjectEPDFilters
+
+export_router = APIRouter(prefix="/export", tags=["export"], dependencies=[Security(azure_scheme)])
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+    parquet = "parquet"
+
+
+FormatQuery = Query(ExportFormat.ndjson, alias="format")
+FiltersQuery = Query(
+    None,
+    description='Filters as JSON, with the same fields and options as in GraphQL. E.g. {"name": {"contains": "Wood"}}',
+)
+
+
+@export_router.get("/epds")
+async def export_epds(
+    export_format: ExportFormat = FormatQuery,
+    filters: str | None = FiltersQuery,
+    session: AsyncSession = Depends(get_db),
+):
+    """Export the EPD catalog"""
+
+    return stream_export(session, EPD, parse_filters(filters, EPDFilters), export_format, "epds")
+
+
+@export_router.get("/projects/{project_id}/epds")
+async def export_project_epds(
+    project_id: str,
+    export_format: ExportFormat = FormatQuery,
+    filters: str | None = FiltersQuery,
+    session: AsyncSession = Depends(get_db),
+):
+    """Export the EPDs of a project"""
+
+    query = select(ProjectEPD).where(ProjectEPD.project_id == project_id)
+    return stream_export(
+        session, ProjectEPD, parse_filters(filters, ProjectEPDFilters), export_format, "project-epds", query=query
+    )
+
+
+@export_router.get("/projects/{project_id}/assemblies")
+async def export_project_assemblies(
+    project_id: str,
+    export_format: ExportFormat = FormatQuery,
+    filters: str | None = FiltersQuery,
+    session: AsyncSession = Depends(get_db),
+):
+    """Export the assemblies of a project"""
+
+    query = select(ProjectAssembly).where(ProjectAssembly.project_id == project_id)
+    return stream_export(
+        session,
+        ProjectAssembly,
+        parse_filters(filters, AssemblyFilters),
+        export_format,
+        "project-assemblies",
+        query=query,
+    )
+
+
+def stream_export(
+    session: AsyncSession,
+    model: Type[SQLModel],
+    filters: BaseFilter | None,
+    export_format: ExportFormat,
+    name: str,
+    query=None,
+) -> StreamingResponse:
+    """
+    Stream the rows of the query in the requested format.
+    Rows are read from a server side cursor and written a batch at a time, so memory use does not grow with the rows.
+    """
+
+    if query is None:
+        query = select(model)
+    if filters:
+        query = filter_model_query(model, filters, query=query)
+    query = query.order_by(model.id)
+
+    return StreamingResponse(
+        export.WRITERS[export_format.value](stream_batches(session, query)),
+        media_type=export.MEDIA_TYPES[export_format.value],
+        headers={"Content-Disposition": f'attachment; filename="{export.export_filename(name, export_format.value)}"'},
+    )
+
+
+async def stream_batches(session: AsyncSession, query) -> AsyncIterator[list[SQLModel]]:
+    result = await session.stream_scalars(query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+    async for batch in result.partitions():
+        yield batch
+
+
+def parse_filters(filters: str | None, filter_type: Type[BaseFilter]) -> BaseFilter | None:
+    """Parse filters given as JSON into the GraphQL filter input, so that they are applied in the same way"""
+
+    if not filters:
+        return None
+
+    try:
+        return filter_type(
+            **{
+                to_snake(field): FilterOptions(**{to_snake(option): value for option, value in options.items()})
+                for field, options in json.loads(filters).items()
+            }
+        )
+    except (ValueError, TypeError, AttributeError) as error:
+        raise HTTPException(status_code=400, detail=f"Invalid filters: {error}")
@@ -0,0 +1,38 @@
+from dataclasses import asdict
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Security, UploadFile
+from lcacollect_config.connection import get_db
+from lcacollect_config.security import azure_scheme
+from lcacollect_config.validate import is_super_admin
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from import_data import get_reader
+from import_data.importer import import_epds, log_progress
+
+import_router = APIRouter(prefix="/import", tags=["import"])
+
+
+@import_router.post("/epds")
+async def import_epds_file(
+    file: UploadFile = File(..., description="ILCD+EPD zip archive or CSV file"),
+    source: str | None = Query(None, description="Source of the EPDs. Defaults to the file name"),
+    session: AsyncSession = Depends(get_db),
+    user=Security(azure_scheme),
+):
+    """
+    Import global EPDs from an uploaded file.
+    EPDs are matched on their origin id and version, so importing a new release of a dataset updates the EPDs.
+    """
+
+    if not is_super_admin(user):
+        raise HTTPException(status_code=403, detail="User is not an admin")
+
+    try:
+        reader = get_reader(file.filename or "")
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+    # The upload is spooled to disk, so the file is read incrementally, like on the command line
+    source = source or file.filename.rsplit(".", 1)[0]
+    report = await import_epds(session, reader(file.file, source), progress=log_progress)
+    return asdict(report)
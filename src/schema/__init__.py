@@ -9,8 +9,16 @@ import schema.assembly as schema_assembly
 import schema.assembly_layer as schema_assembly_layer
 import schema.epd as schema_epd
 from core import federation
+from core.config import settings
+from core.document_cache import DocumentCacheExtension
+from core.metrics import MetricsExtension
 from core.permissions import IsAdmin
-from graphql_types.assembly import GraphQLAssembly, GraphQLProjectAssembly
+from core.query_guard import QueryGuardExtension
+from graphql_types.assembly import (
+    GraphQLAssembly,
+    GraphQLProjectAssembly,
+    GraphQLProjectImpactSummary,
+)
 
 
 @strawberry.type
@@ -26,7 +34,26 @@ class Query:
         description=getdoc(schema_assembly.project_assemblies_query),
     )
 
+    search_assemblies: Connection[GraphQLAssembly] = strawberry.field(
+        permission_classes=[IsAuthenticated],
+        resolver=schema_assembly.search_assemblies_query,
+        description=getdoc(schema_assembly.search_assemblies_query),
+    )
+    search_project_assemblies: Connection[GraphQLProjectAssembly] = strawberry.field(
+        permission_classes=[IsAuthenticated],
+        resolver=schema_assembly.search_project_assemblies_query,
+        description=getdoc(schema_assembly.search_project_assemblies_query),
+    )
+    project_impact_summary: GraphQLProjectImpactSummary = strawberry.field(
+        permission_classes=[IsAuthenticated],
+        resolver=schema_assembly.project_impact_summary_query,
+        description=getdoc(schema_assembly.project_impact_summary_query),
+    )
+
     epds: Connection[schema_epd.GraphQLEPD] = strawberry.field(resolver=schema_epd.epds_query)
+    search_epds: Connection[schema_epd.GraphQLEPD] = strawberry.field(
+        resolver=schema_epd.search_epds_query, description=getdoc(schema_epd.search_epds_query)
+    )
 
     project_epds: list[schema_epd.GraphQLProjectEPD] = strawberry.field(
         permission_classes=[IsAuthenticated], resolver=schema_epd.project_epds_query
@@ -52,6 +79,11 @@ class Mutation:
         resolver=schema_epd.add_epds_mutation,
         description=getdoc(schema_epd.add_epds_mutation),
     )
+    upsert_epds: schema_epd.GraphQLUpsertEpdsReport = strawberry.mutation(
+        permission_classes=[IsAdmin],
+        resolver=schema_epd.upsert_epds_mutation,
+        description=getdoc(schema_epd.upsert_epds_mutation),
+    )
     delete_epds: list[str] = strawberry.mutation(
         permission_classes=[IsAdmin],
         resolver=schema_epd.delete_epds_mutation,
@@ -131,9 +163,14 @@ class Mutation:
     )
 
 
+extensions = [MetricsExtension, DocumentCacheExtension]
+if settings.SERVER_NAME in ["LCA Dev", "LCA Test"]:
+    extensions.append(QueryGuardExtension)
+
 schema = strawberry.federation.Schema(
     query=Query,
     mutation=Mutation,
     enable_federation_2=True,
     types=[schema_epd.GraphQLEPDBase, federation.GraphQLSchemaElement],
+    extensions=extensions,
 )
@@ -1,19 +1,34 @@
 import logging
-from typing import TYPE_CHECKING, Annotated, Type
+from typing import TYPE_CHECKING, Annotated, Optional, Type
 
 import strawberry
 from lcacollect_config.context import get_session
 from lcacollect_config.exceptions import DatabaseItemNotFound
 from lcacollect_config.graphql.input_filters import filter_model_query
+from lcacollect_config.graphql.pagination import Connection, Cursor
+from sqlalchemy import func, literal, tuple_
 from sqlalchemy.orm import selectinload
 from sqlmodel import col, select
-from strawberry import ID
+from strawberry import ID, UNSET
 from strawberry.types import Info
 
+from core.bulk import bulk_delete, bulk_insert
+from core.impact_totals import refresh_assembly_impacts
+from core.impacts import DEFAULT_PHASES, INDICATORS, PHASES
+from core.query_planner import get_selections, query_options
+from core.search import search_clauses
 from core.validate import authenticate_project
+from graphql_types.assembly import (
+    GraphQLAssemblyImpact,
+    GraphQLImpactGroupBy,
+    GraphQLImpactIndicator,
+    GraphQLImpactSummaryGroup,
+    GraphQLProjectImpactSummary,
+)
 from models.assembly import Assembly, ProjectAssembly
-from models.links import AssemblyEPDLink, ProjectAssemblyEPDLink
-from schema.assembly_layer import add_layers_to_project_assembly
+from models.epd import ProjectEPD, impact_value
+from models.links import ProjectAssemblyEPDLink
+from schema.epd import empty_connection, get_or_add_project_epds, paginate_search
 from schema.inputs import AssemblyFilters
 
 if TYPE_CHECKING:
@@ -55,25 +70,153 @@ async def _query_assemblies(
     session = get_session(info)
 
     query = select(ProjectAssembly).where(ProjectAssembly.project_id == project_id).distinct(ProjectAssembly.id)
-    link_model = ProjectAssemblyEPDLink
     if _field == "assemblies":
         query = select(Assembly).distinct(Assembly.id)
-        link_model = AssemblyEPDLink
 
-    category_field = [field for field in info.selected_fields if field.name == _field]
-    query = await assembly_query_options(query, category_field, assembly_model, link_model)
+    query = query.options(*query_options(assembly_model, get_selections(info)))
     if filters:
         query = filter_model_query(assembly_model, filters, query=query)
 
     return (await session.exec(query)).all()
 
 
+async def search_assemblies_query(
+    info: Info,
+    query: str,
+    filters: AssemblyFilters | None = None,
+    count: int | None = 50,
+    after: Optional[Cursor] = UNSET,
+) -> Connection["GraphQLAssembly"]:
+    """
+    Search assemblies by name, category and description, ranked by relevance. The last word matches as a prefix.
+    This query is paginated with keyset cursors.
+    """
+
+    return await _search_assemblies(info, None, query, filters, count, after, Assembly)
+
+
+async def search_project_assemblies_query(
+    info: Info,
+    project_id: str,
+    query: str,
+    filters: AssemblyFilters | None = None,
+    count: int | None = 50,
+    after: Optional[Cursor] = UNSET,
+) -> Connection["GraphQLProjectAssembly"]:
+    """
+    Search project assemblies by name, category and description, ranked by relevance.
+    The last word matches as a prefix. This query is paginated with keyset cursors.
+    """
+
+    return await _search_assemblies(info, project_id, query, filters, count, after, ProjectAssembly)
+
+
+async def _search_assemblies(
+    info: Info,
+    project_id: str | None,
+    query: str,
+    filters: AssemblyFilters | None,
+    count: int | None,
+    after: Cursor | None,
+    assembly_model: Type[Assembly | ProjectAssembly],
+) -> Connection["GraphQLProjectAssembly"] | Connection["GraphQLAssembly"]:
+    match, rank = search_clauses(assembly_model, query)
+    if match is None:
+        return empty_connection()
+
+    assembly_query = select(assembly_model, rank.label("rank")).where(match)
+    if project_id:
+        assembly_query = assembly_query.where(ProjectAssembly.project_id == project_id)
+    if filters:
+        assembly_query = filter_model_query(assembly_model, filters, query=assembly_query)
+
+    return await paginate_search(info, assembly_model, assembly_query, rank, count, after)
+
+
+async def project_impact_summary_query(
+    info: Info,
+    project_id: str,
+    indicators: list[GraphQLImpactIndicator] | None = None,
+    phases: list[str] | None = None,
+    group_by: GraphQLImpactGroupBy = GraphQLImpactGroupBy.CATEGORY,
+) -> GraphQLProjectImpactSummary:
+    """
+    Sum the impacts of all assemblies in a project, grouped by assembly category, assembly or EPD.
+    The sums are calculated in the database and match the impacts of the individual assemblies.
+    """
+
+    session = get_session(info)
+    indicators = [indicator.value for indicator in indicators] if indicators else list(INDICATORS)
+
+    rows = (await session.execute(project_impact_rollup_query(project_id, indicators, phases, group_by))).all()
+
+    total = {indicator: 0.0 for indicator in indicators}
+    groups = []
+    for row in rows:
+        impacts = {indicator: getattr(row, indicator) for indicator in indicators}
+        if row.is_total:
+            total = impacts
+        else:
+            groups.append(GraphQLImpactSummaryGroup(id=row.id, name=row.name, impacts=to_impacts(impacts)))
+
+    return GraphQLProjectImpactSummary(group_by=group_by, total=to_impacts(total), groups=groups)
+
+
+def project_impact_rollup_query(
+    project_id: str, indicators: list[str], phases: list[str] | None, group_by: GraphQLImpactGroupBy
+):
+    """
+    Build a query summing the layer impacts of a project per group, with a ROLLUP row holding the project total.
+    Each layer contributes its conversion factor times the sum of the selected phases of its EPD,
+    like `calculate_impact_category`.
+    """
+
+    if group_by == GraphQLImpactGroupBy.EPD:
+        id_column, name_column = ProjectEPD.id, ProjectEPD.name
+    elif group_by == GraphQLImpactGroupBy.ASSEMBLY:
+        id_column, name_column = ProjectAssembly.id, ProjectAssembly.name
+    else:
+        id_column, name_column = ProjectAssembly.category, ProjectAssembly.category
+
+    # Unknown phases count as 0, and repeated phases are counted repeatedly, in line with `calculate_indicator`
+    phases = [phase for phase in (phases or DEFAULT_PHASES) if phase in PHASES]
+
+    def indicator_sum(indicator: str):
+        column = getattr(ProjectEPD, indicator)
+        phase_sum = sum((func.coalesce(impact_value(column, phase), 0.0) for phase in phases), literal(0.0))
+        return func.coalesce(func.sum(ProjectAssemblyEPDLink.conversion_factor * phase_sum), 0.0).label(indicator)
+
+    # Assemblies without layers are still listed when grouping by assembly or category
+    outer = group_by != GraphQLImpactGroupBy.EPD
+    return (
+        select(
+            id_column.label("id"),
+            name_column.label("name"),
+            func.grouping(id_column).label("is_total"),
+            *[indicator_sum(indicator) for indicator in indicators],
+        )
+        .select_from(ProjectAssembly)
+        .join(ProjectAssemblyEPDLink, ProjectAssemblyEPDLink.assembly_id == ProjectAssembly.id, isouter=outer)
+        .join(ProjectEPD, ProjectEPD.id == ProjectAssemblyEPDLink.epd_id, isouter=outer)
+        .where(ProjectAssembly.project_id == project_id)
+        .group_by(func.rollup(tuple_(id_column, name_column)))
+        .order_by(name_column, id_column)
+    )
+
+
+def to_impacts(values: dict[str, float]) -> list[GraphQLAssemblyImpact]:
+    return [
+        GraphQLAssemblyImpact(indicator=GraphQLImpactIndicator(indicator), value=value)
+        for indicator, value in values.items()
+    ]
+
+
 async def add_assemblies_mutation(
     info: Info, assemblies: list[Annotated["AssemblyAddInput", strawberry.lazy("graphql_types.assembly")]]
 ) -> list["GraphQLAssembly"]:
     """Add Assemblies"""
 
-    return await _mutation_add_assemblies(info, assemblies, Assembly, "addAssemblies")
+    return await _mutation_add_assemblies(info, assemblies, Assembly)
 
 
 async def add_project_assemblies_mutation(
@@ -81,20 +224,23 @@ async def add_project_assemblies_mutation(
 ) -> list["GraphQLProjectAssembly"]:
     """Add Project Assemblies"""
 
-    return await _mutation_add_assemblies(info, assemblies, ProjectAssembly, "addProjectAssemblies")
+    return await _mutation_add_assemblies(info, assemblies, ProjectAssembly)
 
 
 async def _mutation_add_assemblies(
     info: Info,
     assemblies: list["ProjectAssemblyAddInput"] | list["AssemblyAddInput"],
     assembly_model: Type[Assembly | ProjectAssembly],
-    _field: str,
 ) -> list["GraphQLAssembly"] | list["GraphQLProjectAssembly"]:
     """Abstracted function for adding assemblies and project assemblies"""
 
     session = get_session(info)
     _assemblies = []
 
+    if assembly_model == ProjectAssembly:
+        for project_id in {assembly_input.project_id for assembly_input in assemblies}:
+            await authenticate_project(info, project_id)
+
     for assembly_input in assemblies:
         data = {
             "name": assembly_input.name,
@@ -106,7 +252,6 @@ async def _mutation_add_assemblies(
             "unit": assembly_input.unit.value if assembly_input.unit else None,
         }
         if assembly_model == ProjectAssembly:
-            await authenticate_project(info, assembly_input.project_id)
             data["project_id"] = assembly_input.project_id
         elif assembly_model == Assembly:
             data["source"] = assembly_input.source or ""
@@ -117,18 +262,11 @@ async def _mutation_add_assemblies(
         _assemblies.append(assembly)
         logger.info(f"Adding {'project' if data.get('project_id') else ''} assembly with id: {assembly.id}")
 
+    ids = [assembly.id for assembly in _assemblies]
     await session.commit()
-    [await session.refresh(assembly) for assembly in _assemblies]
-
-    category_field = [field for field in info.selected_fields if field.name == _field]
-    query = select(assembly_model).where(col(assembly_model.id).in_([assembly.id for assembly in _assemblies]))
 
-    query = await assembly_query_options(
-        query,
-        category_field,
-        assembly_model,
-        ProjectAssemblyEPDLink if assembly_model == ProjectAssembly else AssemblyEPDLink,
-    )
+    query = select(assembly_model).where(col(assembly_model.id).in_(ids))
+    query = query.options(*query_options(assembly_model, get_selections(info)))
     return (await session.exec(query)).all()
 
 
@@ -138,33 +276,48 @@ async def add_project_assemblies_from_assemblies_mutation(
     """Add Project Assemblies from Assemblies"""
 
     session = get_session(info)
-    _assemblies = []
     await authenticate_project(info, project_id)
 
+    query = select(Assembly).where(col(Assembly.id).in_(assemblies)).options(selectinload(Assembly.layers))
+    origin_assemblies = {assembly.id: assembly for assembly in (await session.exec(query)).all()}
     for assembly_id in assemblies:
-        query = select(Assembly).where(Assembly.id == assembly_id)
-        query = query.options(selectinload(Assembly.layers).options(selectinload(AssemblyEPDLink.epd)))
-        assembly = (await session.exec(query)).first()
-        if not assembly:
+        if assembly_id not in origin_assemblies:
             raise DatabaseItemNotFound(f"Could not find Assembly with id: {assembly_id}")
 
-        project_assembly = ProjectAssembly.create_from_assembly(assembly, project_id)
-        session.add(project_assembly)
-        await add_layers_to_project_assembly(project_assembly, assembly.layers, session)
+    # Resolve the project EPDs of all layers at once, copying the global EPDs that are not in the project yet
+    layers = [layer for assembly in origin_assemblies.values() for layer in assembly.layers]
+    epd_ids = {layer.epd_id for layer in layers} | {
+        layer.transport_epd_id for layer in layers if layer.transport_epd_id
+    }
+    project_epd_ids = await get_or_add_project_epds(session, epd_ids, project_id)
+
+    project_assemblies = []
+    project_layers = []
+    for assembly_id in assemblies:
+        assembly = origin_assemblies[assembly_id]
+        project_assembly = ProjectAssembly(
+            **assembly.dict(exclude={"id", "source"}), project_id=project_id, origin_id=assembly.id
+        )
+        project_assemblies.append(project_assembly.dict())
+
+        for layer in assembly.layers:
+            project_layer = ProjectAssemblyEPDLink.create_from_link(layer)
+            project_layer.assembly_id = project_assembly.id
+            project_layer.epd_id = project_epd_ids[layer.epd_id]
+            project_layer.transport_epd_id = project_epd_ids.get(layer.transport_epd_id)
+            project_layers.append(project_layer.dict())
 
-        _assemblies.append(project_assembly)
         logger.info(f"Adding project assembly with id: {project_assembly.id} from assembly with id: {assembly.id}")
 
-        await session.commit()
+    await bulk_insert(session, ProjectAssembly, project_assemblies)
+    await bulk_insert(session, ProjectAssemblyEPDLink, project_layers)
+    await refresh_assembly_impacts(session, ProjectAssembly, [assembly["id"] for assembly in project_assemblies])
+    await session.commit()
 
-    category_field = [field for field in info.selected_fields if field.name == "addProjectAssembliesFromAssemblies"]
-    query = select(ProjectAssembly).where(col(ProjectAssembly.id).in_([assembly.id for assembly in _assemblies]))
-    query = await assembly_query_options(
-        query,
-        category_field,
-        ProjectAssembly,
-        ProjectAssemblyEPDLink,
+    query = select(ProjectAssembly).where(
+        col(ProjectAssembly.id).in_([assembly["id"] for assembly in project_assemblies])
     )
+    query = query.options(*query_options(ProjectAssembly, get_selections(info)))
 
     return (await session.exec(query)).all()
 
@@ -174,7 +327,7 @@ async def update_assemblies_mutation(
 ) -> list["GraphQLAssembly"]:
     """Update Assemblies"""
 
-    return await _mutation_update_assemblies(info, assemblies, Assembly, "updateAssemblies")
+    return await _mutation_update_assemblies(info, assemblies, Assembly)
 
 
 async def update_project_assemblies_mutation(
@@ -182,22 +335,23 @@ async def update_project_assemblies_mutation(
 ) -> list["GraphQLProjectAssembly"]:
     """Update Project Assemblies"""
 
-    return await _mutation_update_assemblies(info, assemblies, ProjectAssembly, "updateProjectAssemblies")
+    return await _mutation_update_assemblies(info, assemblies, ProjectAssembly)
 
 
 async def _mutation_update_assemblies(
     info: Info,
     assemblies: list["AssemblyUpdateInput"] | list["ProjectAssemblyUpdateInput"],
     assembly_model: Type[Assembly | ProjectAssembly],
-    _field: str,
 ) -> list["GraphQLAssembly"] | list["GraphQLProjectAssembly"]:
     """Abstracted function for updating assemblies and project assemblies"""
 
     session = get_session(info)
-    _assemblies = []
+
+    query = select(assembly_model).where(col(assembly_model.id).in_([assembly.id for assembly in assemblies]))
+    existing = {assembly.id: assembly for assembly in (await session.exec(query)).all()}
 
     for assembly_input in assemblies:
-        assembly = await session.get(assembly_model, assembly_input.id)
+        assembly = existing.get(assembly_input.id)
         if not assembly:
             raise DatabaseItemNotFound(f"Could not find Assembly with id: {assembly_input.id}")
 
@@ -221,14 +375,8 @@ async def _mutation_update_assemblies(
 
     await session.commit()
 
-    category_field = [field for field in info.selected_fields if field.name == _field]
     query = select(assembly_model).where(col(assembly_model.id).in_([assembly.id for assembly in assemblies]))
-    query = await assembly_query_options(
-        query,
-        category_field,
-        assembly_model,
-        ProjectAssemblyEPDLink if assembly_model == ProjectAssembly else AssemblyEPDLink,
-    )
+    query = query.options(*query_options(assembly_model, get_selections(info)))
 
     return (await session.exec(query)).all()
 
@@ -252,32 +400,8 @@ async def _mutation_delete_assemblies(
 
     session = get_session(info)
 
-    for _id in ids:
-        logger.info(f"Deleting assembly with id: {_id}")
-        assembly = await session.get(assembly_model, _id)
-        await session.delete(assembly)
+    logger.info(f"Deleting assemblies with ids: {', '.join(ids)}")
+    deleted = await bulk_delete(session, assembly_model, ids)
 
     await session.commit()
-    return ids
-
-
-async def assembly_query_options(
-    query,
-    category_field,
-    assembly_model: Type[Assembly | ProjectAssembly],
-    link_model: Type[AssemblyEPDLink | ProjectAssemblyEPDLink],
-):
-    if category_field:
-        selections = [field for field in category_field[0].selections]
-        if any(field.name == "gwp" for field in selections):
-            query = query.options(selectinload(assembly_model.layers).options(selectinload(link_model.epd)))
-        if layer_fields := [field for field in selections if field.name == "layers"]:
-            layer_selections = [field for field in layer_fields[0].selections]
-            if any(field.name == "epd" for field in layer_selections):
-                query = query.options(selectinload(assembly_model.layers).options(selectinload(link_model.epd)))
-            if any(field.name == "transportEpd" for field in layer_selections):
-                query = query.options(
-                    selectinload(assembly_model.layers).options(selectinload(link_model.transport_epd))
-                )
-
-    return query
+    return deleted
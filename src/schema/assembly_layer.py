@@ -1,14 +1,15 @@
-from typing import TYPE_CHECKING, Type
+from typing import TYPE_CHECKING
 
 from lcacollect_config.context import get_session
 from lcacollect_config.exceptions import DatabaseItemNotFound
-from sqlalchemy.orm import selectinload
 from sqlmodel import col, select
-from sqlmodel.ext.asyncio.session import AsyncSession
 from strawberry import ID
 from strawberry.types import Info
 
 import models.epd as models_epd
+from core.epd_cache import epd_cache
+from core.impact_totals import refresh_assembly_impacts
+from core.query_planner import get_selections, query_options
 from graphql_types.assembly_layer import (
     AssemblyLayerInput,
     AssemblyLayerUpdateInput,
@@ -16,7 +17,6 @@ from graphql_types.assembly_layer import (
 )
 from models.assembly import Assembly, ProjectAssembly
 from models.links import AssemblyEPDLink, ProjectAssemblyEPDLink
-from schema.epd import _mutation_add_project_epds_from_epds
 
 if TYPE_CHECKING:  # pragma: no cover
     pass
@@ -42,14 +42,25 @@ async def add_assembly_layers_mutation(
     if not assembly:
         raise DatabaseItemNotFound(f"Could not find Assembly with id: {id}")
 
+    # Load the EPDs of all layers at once, so adding the layers doesn't query per layer.
+    # Global EPDs are served from the process wide cache
+    epd_ids = {layer.epd_id for layer in layers} | {
+        layer.transport_epd_id for layer in layers if layer.transport_epd_id
+    }
+    if isinstance(assembly, Assembly):
+        epds = await epd_cache.get_many(session, epd_ids)
+    else:
+        query = select(models_epd.ProjectEPD).where(col(models_epd.ProjectEPD.id).in_(epd_ids))
+        epds = {epd.id: epd for epd in (await session.exec(query)).all()}
+
     links = []
     for layer in layers:
-        links.append(await add_layer_to_assembly(layer, assembly, session))
+        links.append(await add_layer_to_assembly(layer, assembly, session, epds))
+    await refresh_assembly_impacts(session, type(assembly), [assembly.id])
     await session.commit()
 
-    category_field = [field for field in info.selected_fields if field.name == info.field_name]
     query = select(link_model).where(col(link_model.id).in_([layer.id for layer in links]))
-    query = await assembly_layer_query_options(query, category_field, link_model)
+    query = query.options(*query_options(link_model, get_selections(info)))
 
     return (await session.exec(query)).all()
 
@@ -70,17 +81,15 @@ async def delete_assembly_layers_mutation(info: Info, id: ID, layers: list[ID])
     if not assembly:
         raise DatabaseItemNotFound(f"Could not find Assembly with id: {id}")
 
+    links = await get_assembly_links(session, link_model, assembly.id, layers)
     deleted_epds = []
 
     for layer_id in layers:
-        query = select(link_model).where(
-            link_model.id == layer_id,
-            link_model.assembly_id == assembly.id,
-        )
-        link = (await session.exec(query)).one()
+        link = links[layer_id]
         await session.delete(link)
         deleted_epds.append(link.epd_id)
 
+    await refresh_assembly_impacts(session, type(assembly), [assembly.id])
     await session.commit()
     return deleted_epds
 
@@ -103,13 +112,10 @@ async def update_assembly_layers_mutation(
     if not assembly:
         raise DatabaseItemNotFound(f"Could not find Assembly with id: {id}")
 
+    links = await get_assembly_links(session, link_model, assembly.id, [layer.id for layer in layers])
     epd_links = []
     for layer in layers:
-        query = select(link_model).where(
-            link_model.id == layer.id,
-            link_model.assembly_id == assembly.id,
-        )
-        link = (await session.exec(query)).one()
+        link = links[layer.id]
         kwargs = {
             "name": layer.name,
             "conversion_factor": layer.conversion_factor,
@@ -127,15 +133,27 @@ async def update_assembly_layers_mutation(
         session.add(link)
         epd_links.append(link)
 
+    await refresh_assembly_impacts(session, type(assembly), [assembly.id])
     await session.commit()
 
-    category_field = [field for field in info.selected_fields if field.name == info.field_name]
     query = select(link_model).where(col(link_model.id).in_([layer.id for layer in layers]))
-    query = await assembly_layer_query_options(query, category_field, link_model)
+    query = query.options(*query_options(link_model, get_selections(info)))
 
     return (await session.exec(query)).all()
 
 
+async def get_assembly_links(
+    session, link_model: type[ProjectAssemblyEPDLink | AssemblyEPDLink], assembly_id: str, ids: list[str]
+) -> dict[str, ProjectAssemblyEPDLink | AssemblyEPDLink]:
+    """Get the layers of an Assembly by their ids, with a single query"""
+
+    query = select(link_model).where(col(link_model.id).in_(ids), link_model.assembly_id == assembly_id)
+    links = {link.id: link for link in (await session.exec(query)).all()}
+    if missing := set(ids) - links.keys():
+        raise DatabaseItemNotFound(f"Could not find layers with ids: {', '.join(sorted(missing))}")
+    return links
+
+
 async def get_assembly_layers(layers: list[AssemblyLayerInput], session) -> list[models_epd.ProjectEPD]:
     """Get a list of ProjectEPD model objects, to be used as layers"""
 
@@ -146,9 +164,12 @@ async def get_assembly_layers(layers: list[AssemblyLayerInput], session) -> list
 
 
 async def add_layer_to_assembly(
-    layer: AssemblyLayerInput, assembly: ProjectAssembly | Assembly, session
+    layer: AssemblyLayerInput,
+    assembly: ProjectAssembly | Assembly,
+    session,
+    epds: dict[str, models_epd.EPD | models_epd.ProjectEPD] | None = None,
 ) -> ProjectAssemblyEPDLink | AssemblyEPDLink:
-    """Add an EPD layer to an Assembly"""
+    """Add an EPD layer to an Assembly. The EPDs of the layer are taken from epds, if given, instead of being queried"""
 
     epd_model = models_epd.ProjectEPD
     link_model = ProjectAssemblyEPDLink
@@ -157,13 +178,9 @@ async def add_layer_to_assembly(
         epd_model = models_epd.EPD
         link_model = AssemblyEPDLink
 
-    epd = await session.get(epd_model, layer.epd_id)
-    if not epd:
-        raise DatabaseItemNotFound(f"Could not find EPD with id: {layer.epd_id}")
+    epd = await get_layer_epd(session, epd_model, layer.epd_id, epds)
     if layer.transport_epd_id:
-        transport_epd = await session.get(epd_model, layer.transport_epd_id)
-        if not transport_epd:
-            raise DatabaseItemNotFound(f"Could not find EPD with id: {layer.transport_epd_id}")
+        await get_layer_epd(session, epd_model, layer.transport_epd_id, epds)
 
     if isinstance(epd_model, models_epd.ProjectEPD) and assembly.project_id != epd.project_id:
         raise AttributeError(
@@ -173,7 +190,6 @@ async def add_layer_to_assembly(
     link = link_model(
         assembly=assembly,
         assembly_id=assembly.id,
-        epd=epd,
         epd_id=epd.id,
         conversion_factor=layer.conversion_factor,
         name=layer.name,
@@ -188,61 +204,23 @@ async def add_layer_to_assembly(
     return link
 
 
-async def add_layers_to_project_assembly(assembly: ProjectAssembly, layers: AssemblyEPDLink, session: AsyncSession):
-    """Add layers to a ProjectAssembly"""
-
-    for layer in layers:
-        epd = (
-            await session.exec(
-                select(models_epd.ProjectEPD).where(
-                    models_epd.ProjectEPD.origin_id == layer.epd_id,
-                    models_epd.ProjectEPD.project_id == assembly.project_id,
-                )
-            )
-        ).first()
-        if not epd:
-            _epd = await _mutation_add_project_epds_from_epds(session, [layer.epd_id], assembly.project_id)
-            epd = _epd[0]
-
-        layer_input = AssemblyLayerInput(
-            **layer.dict(
-                exclude={"assembly_id", "assembly", "epd", "epd_id", "id", "transport_epd_id", "transport_epd"}
-            ),
-            epd_id=epd.id,
-        )
-
-        if layer.transport_epd_id:
-            transport_epd = (
-                await session.exec(
-                    select(models_epd.ProjectEPD).where(
-                        models_epd.ProjectEPD.origin_id == layer.transport_epd_id,
-                        models_epd.ProjectEPD.project_id == assembly.project_id,
-                    )
-                )
-            ).first()
-            if not transport_epd:
-                _epd = await _mutation_add_project_epds_from_epds(
-                    session, [layer.transport_epd_id], assembly.project_id
-                )
-                layer_input.transport_epd_id = _epd[0].id
-            else:
-                layer_input.transport_epd_id = transport_epd.id
-
-        await add_layer_to_assembly(layer_input, assembly, session)
-
-    return assembly
-
-
-async def assembly_layer_query_options(
-    query,
-    category_field,
-    link_model: Type[AssemblyEPDLink | ProjectAssemblyEPDLink],
-):
-    if category_field:
-        selections = [field for field in category_field[0].selections]
-        if any(field.name == "epd" for field in selections):
-            query = query.options(selectinload(link_model.epd))
-        if any(field.name == "transportEpd" for field in selections):
-            query = query.options(selectinload(link_model.transport_epd))
-
-    return query
+async def get_layer_epd(
+    session,
+    epd_model: type[models_epd.EPD | models_epd.ProjectEPD],
+    epd_id: str,
+    epds: dict[str, models_epd.EPD | models_epd.ProjectEPD] | None = None,
+) -> models_epd.EPD | models_epd.ProjectEPD:
+    """
+    Get the EPD of a layer, from the already loaded epds if given. Global EPDs are served from the process wide cache.
+    Layers are linked to their EPDs by id, as linking a cached EPD object would add it to the session.
+    """
+
+    if epds is not None:
+        epd = epds.get(epd_id)
+    elif epd_model is models_epd.EPD:
+        epd = await epd_cache.get(session, epd_id)
+    else:
+        epd = await session.get(epd_model, epd_id)
+    if not epd:
+        raise DatabaseItemNotFound(f"Could not find EPD with id: {epd_id}")
+    return epd
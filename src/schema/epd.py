@@ -1,22 +1,37 @@
 import base64
+import json
 import logging
 from datetime import date
 from enum import Enum
-from typing import TYPE_CHECKING, Annotated, Optional
+from operator import attrgetter
+from typing import TYPE_CHECKING, Annotated, Any, Callable, NamedTuple, Optional
 
 import strawberry
 from lcacollect_config.context import get_session
 from lcacollect_config.exceptions import DatabaseItemNotFound
 from lcacollect_config.formatting import string_uuid
-from lcacollect_config.graphql.input_filters import filter_model_query, sort_model_query
+from lcacollect_config.graphql.input_filters import SortOptions, filter_model_query
 from lcacollect_config.graphql.pagination import Connection, Cursor, Edge, PageInfo
-from sqlalchemy import func
-from sqlmodel import select
+from sqlalchemy import JSON as JSON_TYPE
+from sqlalchemy import and_, cast, func, literal_column, or_, text, tuple_
+from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.orm import load_only
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from strawberry import UNSET
 from strawberry.scalars import JSON
 from strawberry.types import Info
 
 import models.epd as models_epd
+from core.bulk import BATCH_SIZE, bulk_delete, bulk_insert
+from core.config import settings
+from core.epd_cache import epd_cache, notify_epds_changed
+from core.impact_totals import get_affected_assemblies, refresh_assembly_impacts
+from core.loaders import load_deferred_column
+from core.query_planner import get_selections, is_selected, query_options
+from core.search import search_clauses
+from graphql_types.assembly import GraphQLImpactIndicator
+from models.assembly import Assembly, ProjectAssembly
 from schema.directives import Keys
 from schema.inputs import EPDFilters, EPDSort, ProjectEPDFilters
 
@@ -32,10 +47,13 @@ async def epds_query(
     sort_by: Optional[EPDSort] = None,
     count: int | None = 50,
     after: Optional[Cursor] = UNSET,
+    impact_filters: Optional[list["GraphQLImpactFilter"]] = None,
+    sort_by_impact: Optional["GraphQLImpactSort"] = None,
 ) -> Connection["GraphQLEPD"]:
     """
     Query the database for EPD entries.
-    This query is paginated.
+    This query is paginated with keyset cursors, which stay valid when the result is sorted.
+    sortByImpact takes precedence over sortBy.
     """
 
     session = get_session(info)
@@ -44,63 +62,293 @@ async def epds_query(
     query = select(models_epd.EPD)
     if filters:
         query = filter_model_query(models_epd.EPD, filters, query=query)
+    if impact_filters:
+        query = filter_impacts_query(models_epd.EPD, impact_filters, query=query)
+
+    # Only count the epds in the query, if the client asks for it
+    total_count = 0
+    if is_selected(info, "numEdges"):
+        total_count = await count_epds(session, query, bool(filters or impact_filters))
+
+    # Sort by the requested keys, with the id as tiebreaker, so that the order is total
+    sort_columns = get_sort_columns(models_epd.EPD, sort_by, sort_by_impact)
+    query = query.order_by(
+        *[column.expression.desc() if column.descending else column.expression for column in sort_columns]
+    )
 
-    # Get the total number of epds in query
-    total_count = (await session.exec(select(func.count()).select_from(query.subquery()))).one()
+    # Only the ids of the page are queried. The EPDs are then served from the process wide cache
+    query = query.options(load_only(models_epd.EPD.id))
 
     # limit the query for pagination
     after = after if after is not UNSET else None
     if after:
-        query = query.where(models_epd.EPD.id > after)
+        query = query.where(await build_keyset_clause(session, models_epd.EPD, sort_columns, after))
     if count:
         query = query.limit(count + 1)
-    if sort_by:
-        query = sort_model_query(models_epd.EPD, sort_by, query=query)
-    else:
-        query = query.order_by(models_epd.EPD.id)
-
-    epds = (await session.exec(query)).all()
-    edges = [Edge(node=epd, cursor=epd.id) for epd in epds]
-    if not edges:
-        return Connection(
-            page_info=PageInfo(has_previous_page=False, has_next_page=False, start_cursor=None, end_cursor=None),
-            edges=[],
-            num_edges=0,
+
+    ids = [epd.id for epd in (await session.exec(query)).all()]
+    has_next_page = bool(count) and len(ids) > count
+    if has_next_page:
+        ids = ids[:count]  # exclude last one as it was fetched to know if there is a next page
+
+    # EPDs missing from the cache are loaded with only the selected columns, which leaves out the impacts unless they
+    # are asked for. They are not cached, as the cache holds complete EPDs
+    epds = epd_cache.get_cached(ids)
+    if missing := [_id for _id in ids if _id not in epds]:
+        missing_query = select(models_epd.EPD).where(col(models_epd.EPD.id).in_(missing))
+        missing_query = missing_query.options(
+            *query_options(
+                models_epd.EPD,
+                get_selections(info, "edges", "node"),
+                columns=get_sort_attributes(sort_by, sort_by_impact),
+            )
         )
+        epds.update({epd.id: epd for epd in (await session.exec(missing_query)).all()})
 
-    # Get the end cursor
-    end_cursor = None
-    if not count or len(edges) > count:
-        end_cursor = edges[-1].cursor
-    elif len(edges) > 1:
-        end_cursor = edges[-2].cursor
+    edges = [Edge(node=epds[_id], cursor=build_epd_cursor(epds[_id], sort_columns)) for _id in ids if _id in epds]
 
     return Connection(
         page_info=PageInfo(
-            has_previous_page=False,
-            has_next_page=False if not count else total_count > count,
+            has_previous_page=bool(after),
+            has_next_page=has_next_page,
             start_cursor=edges[0].cursor if edges else None,
-            end_cursor=end_cursor,
+            end_cursor=edges[-1].cursor if edges else None,
         ),
-        edges=edges[:-1]
-        if count and len(edges) > count
-        else edges,  # exclude last one as it was fetched to know if there is a next page
+        edges=edges,
         num_edges=total_count,
     )
 
 
-def build_epd_cursor(epd: models_epd.EPD):
-    return base64.b64encode(epd.id.encode()).decode()
+async def search_epds_query(
+    info: Info,
+    query: str,
+    filters: Optional[EPDFilters] = None,
+    count: int | None = 50,
+    after: Optional[Cursor] = UNSET,
+) -> Connection["GraphQLEPD"]:
+    """
+    Search EPDs by name, subtype, location and comment. The last word matches as a prefix.
+    The results are ranked by relevance, with matches in the name first.
+    """
+
+    match, rank = search_clauses(models_epd.EPD, query)
+    if match is None:
+        return empty_connection()
+
+    epd_query = select(models_epd.EPD, rank.label("rank")).where(match)
+    if filters:
+        epd_query = filter_model_query(models_epd.EPD, filters, query=epd_query)
+
+    return await paginate_search(info, models_epd.EPD, epd_query, rank, count, after)
+
+
+def empty_connection() -> Connection:
+    return Connection(
+        page_info=PageInfo(has_previous_page=False, has_next_page=False, start_cursor=None, end_cursor=None),
+        edges=[],
+        num_edges=0,
+    )
+
+
+async def paginate_search(info: Info, model, query, rank, count: int | None, after: Cursor | None) -> Connection:
+    """
+    Get a page of search results, which are selected by the query as (row, rank) pairs.
+    The results are ordered by rank with keyset cursors of the rank and the id.
+    """
+
+    session = get_session(info)
+
+    total_count = 0
+    if is_selected(info, "numEdges"):
+        total_count = (await session.exec(select(func.count()).select_from(query.subquery()))).one()
+
+    # Ties in rank are ordered by id, so that the cursors point at a single row
+    sort_columns = [SortColumn(rank, True, None), SortColumn(model.id, True, attrgetter("id"))]
+    query = query.order_by(rank.desc(), model.id.desc())
+    query = query.options(*query_options(model, get_selections(info, "edges", "node")))
+
+    after = after if after is not UNSET else None
+    if after:
+        query = query.where(await build_keyset_clause(session, model, sort_columns, after))
+    if count:
+        query = query.limit(count + 1)
+
+    rows = (await session.execute(query)).all()
+    has_next_page = bool(count) and len(rows) > count
+    if has_next_page:
+        rows = rows[:count]
+
+    edges = [Edge(node=node, cursor=encode_cursor([rank, node.id])) for node, rank in rows]
+
+    return Connection(
+        page_info=PageInfo(
+            has_previous_page=bool(after),
+            has_next_page=has_next_page,
+            start_cursor=edges[0].cursor if edges else None,
+            end_cursor=edges[-1].cursor if edges else None,
+        ),
+        edges=edges,
+        num_edges=total_count,
+    )
+
+
+async def count_epds(session, query, filtered: bool) -> int:
+    """
+    Count the EPDs in the query.
+    The unfiltered catalog is counted from the planner statistics once it is large enough for an exact count to be
+    expensive.
+    """
+
+    if not filtered:
+        estimate = (
+            await session.execute(text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'epd'::regclass"))
+        ).scalar()
+        if estimate and estimate >= settings.EPD_COUNT_ESTIMATE_THRESHOLD:
+            return estimate
+
+    return (await session.exec(select(func.count()).select_from(query.subquery()))).one()
+
+
+def filter_impacts_query(model, impact_filters: list["GraphQLImpactFilter"], query):
+    """Filter the query on single indicator phases. Served by an expression index for A1-A3 GWP."""
+
+    for impact_filter in impact_filters:
+        value = models_epd.impact_value(getattr(model, impact_filter.indicator.value), impact_filter.phase.value)
+        if impact_filter.less_than is not None:
+            query = query.where(value < impact_filter.less_than)
+        if impact_filter.greater_than is not None:
+            query = query.where(value > impact_filter.greater_than)
+
+    return query
+
+
+class SortColumn(NamedTuple):
+    expression: Any
+    descending: bool
+    value: Callable[[models_epd.EPDBase], Any]
+
+
+def get_sort_columns(
+    model, sort_by: Optional[EPDSort], sort_by_impact: Optional["GraphQLImpactSort"] = None
+) -> list[SortColumn]:
+    """Get the columns to sort by. The id is always the last column."""
+
+    sort_columns = []
+    if sort_by_impact:
+        sort_columns.append(get_impact_sort_column(model, sort_by_impact))
+    if sort_by:
+        for sort_key in sort_by.keys():
+            sort_columns.append(
+                SortColumn(
+                    getattr(model, sort_key),
+                    getattr(sort_by, sort_key) == SortOptions.DSC,
+                    attrgetter(sort_key),
+                )
+            )
+    sort_columns.append(SortColumn(model.id, False, attrgetter("id")))
+
+    return sort_columns
+
+
+def get_sort_attributes(sort_by: Optional[EPDSort], sort_by_impact: Optional["GraphQLImpactSort"] = None) -> list[str]:
+    """Get the attributes read by the sort columns"""
+
+    attributes = list(sort_by.keys()) if sort_by else []
+    if sort_by_impact:
+        attributes.append(sort_by_impact.indicator.value)
+    return attributes
+
+
+def get_impact_sort_column(model, sort_by_impact: "GraphQLImpactSort") -> SortColumn:
+    """Sort by a single indicator phase. Missing values are sorted last in both directions."""
+
+    indicator, phase = sort_by_impact.indicator.value, sort_by_impact.phase.value
+    descending = sort_by_impact.direction == SortOptions.DSC
+    missing = float("-inf") if descending else float("inf")
+
+    def value(epd: models_epd.EPDBase) -> float:
+        _value = (getattr(epd, indicator) or {}).get(phase)
+        return missing if _value is None else _value
+
+    # The fallback is inlined, so the expression matches the index of the default sort, ix_epd_gwp_a1a3_sort
+    fallback = literal_column(f"'{'-' if descending else ''}Infinity'::double precision")
+    return SortColumn(
+        func.coalesce(models_epd.impact_value(getattr(model, indicator), phase), fallback), descending, value
+    )
+
+
+def build_epd_cursor(epd: models_epd.EPDBase, sort_columns: list[SortColumn]) -> str:
+    """Encode the sort key values and the id of the EPD as a cursor"""
+
+    return encode_cursor([column.value(epd) for column in sort_columns])
+
+
+def encode_cursor(values: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+async def decode_epd_cursor(session, model, sort_columns: list[SortColumn], cursor: Cursor) -> list:
+    """Decode a cursor into the sort key values it points at"""
+
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, UnicodeDecodeError):
+        # Cursors used to be the plain id of the last EPD. Sort keys like the rank of a search can't be read from a row
+        if any(column.value is None for column in sort_columns):
+            raise ValueError("Invalid cursor")
+        epd = await session.get(model, cursor)
+        if not epd:
+            raise DatabaseItemNotFound(f"Could not find EPD with id: {cursor}")
+        return [column.value(epd) for column in sort_columns]
+
+    if not isinstance(values, list) or len(values) != len(sort_columns):
+        raise ValueError("The cursor does not match the requested sort order")
+    return values
+
+
+async def build_keyset_clause(session, model, sort_columns: list[SortColumn], cursor: Cursor):
+    """Build the WHERE clause selecting the rows after the cursor, in the order given by the sort columns"""
+
+    values = await decode_epd_cursor(session, model, sort_columns, cursor)
+    columns = [column.expression for column in sort_columns]
+
+    directions = {column.descending for column in sort_columns}
+    if len(directions) == 1:
+        # A row value comparison can be served as a single range scan of a matching index
+        if directions.pop():
+            return tuple_(*columns) < tuple_(*values)
+        return tuple_(*columns) > tuple_(*values)
+
+    clauses = []
+    for i, column in enumerate(sort_columns):
+        clauses.append(
+            and_(
+                *[columns[j] == values[j] for j in range(i)],
+                column.expression < values[i] if column.descending else column.expression > values[i],
+            )
+        )
+    return or_(*clauses)
 
 
 async def project_epds_query(
-    info: Info, project_id: str, filters: Optional[ProjectEPDFilters] = None
+    info: Info,
+    project_id: str,
+    filters: Optional[ProjectEPDFilters] = None,
+    impact_filters: Optional[list["GraphQLImpactFilter"]] = None,
 ) -> list["GraphQLProjectEPD"]:
     """Query the database for EPD entries for a specific project."""
 
     session = get_session(info)
 
-    query = select(models_epd.ProjectEPD).where(models_epd.ProjectEPD.project_id == project_id)
+    # The project index returns rows in origin order, so sort explicitly for a stable listing
+    query = (
+        select(models_epd.ProjectEPD)
+        .where(models_epd.ProjectEPD.project_id == project_id)
+        .order_by(models_epd.ProjectEPD.name, models_epd.ProjectEPD.id)
+    )
+    if impact_filters:
+        query = filter_impacts_query(models_epd.ProjectEPD, impact_filters, query=query)
+    query = query.options(*query_options(models_epd.ProjectEPD, get_selections(info)))
 
     if not filters:
         epds = await session.exec(query)
@@ -121,80 +369,205 @@ async def add_project_epds_mutation(info: Info, project_id: str, epd_ids: list[s
 async def _mutation_add_project_epds_from_epds(session, epd_ids, project_id):
     """Abstracted function for adding project epds from epds."""
 
+    epds = await epd_cache.get_many(session, epd_ids)
+
     project_epds = []
     for origin_id in epd_ids:
-        epd = await session.get(models_epd.EPD, origin_id)
+        epd = epds.get(origin_id)
         if not epd:
             raise DatabaseItemNotFound(f"Could not find EPD with id: {origin_id}")
 
-        project_epd = models_epd.ProjectEPD.create_from_epd(epd, project_id=project_id)
+        # The cached EPD is not linked as origin, which would add it to the session
+        project_epd = models_epd.ProjectEPD(
+            **epd.dict(exclude={"id", "origin_id"}), project_id=project_id, origin_id=epd.id
+        )
         project_epds.append(project_epd)
         session.add(project_epd)
 
     await session.commit()
-    [await session.refresh(project_epd) for project_epd in project_epds]
     return project_epds
 
 
+async def get_or_add_project_epds(session, origin_ids: set[str], project_id: str) -> dict[str, str]:
+    """
+    Map global EPD ids to the ids of their project EPDs, copying the EPDs that are not in the project yet.
+    Uses a constant number of queries and does not commit.
+    """
+
+    query = select(models_epd.ProjectEPD.origin_id, models_epd.ProjectEPD.id).where(
+        models_epd.ProjectEPD.project_id == project_id, col(models_epd.ProjectEPD.origin_id).in_(origin_ids)
+    )
+    project_epd_ids = dict((await session.exec(query)).all())
+
+    missing_ids = origin_ids - project_epd_ids.keys()
+    if not missing_ids:
+        return project_epd_ids
+
+    epds = await epd_cache.get_many(session, missing_ids)
+    if len(epds) != len(missing_ids):
+        not_found = missing_ids - epds.keys()
+        raise DatabaseItemNotFound(f"Could not find EPDs with ids: {', '.join(sorted(not_found))}")
+
+    rows = [
+        models_epd.ProjectEPD(**epd.dict(exclude={"id", "origin_id"}), project_id=project_id, origin_id=epd.id).dict()
+        for epd in epds.values()
+    ]
+    inserted = await bulk_insert(
+        session, models_epd.ProjectEPD, rows, returning=(models_epd.ProjectEPD.origin_id, models_epd.ProjectEPD.id)
+    )
+    project_epd_ids.update(dict(inserted))
+    logger.info(f"Added {len(inserted)} project EPDs to project with id: {project_id}")
+
+    return project_epd_ids
+
+
 async def delete_project_epds_mutation(info: Info, ids: list[str]) -> list[str]:
     """Delete a project EPD"""
 
     session = get_session(info)
-    for _id in ids:
-        project_epd = await session.get(models_epd.ProjectEPD, _id)
-        await session.delete(project_epd)
+    assembly_ids = await get_affected_assemblies(session, ProjectAssembly, ids)
+    deleted = await bulk_delete(session, models_epd.ProjectEPD, ids)
 
+    await refresh_assembly_impacts(session, ProjectAssembly, assembly_ids)
     await session.commit()
-    return ids
+    return deleted
 
 
 async def add_epds_mutation(info: Info, epds: list["GraphQLAddEpdInput"]) -> list["GraphQLEPD"]:
     """Add Global EPDs."""
     session = get_session(info)
 
-    _epds = []
-    for epd_input in epds:
-        epd = models_epd.EPD(
-            id=epd_input.id if epd_input.id else string_uuid(),
-            name=epd_input.name,
-            version=epd_input.version,
-            declared_unit=epd_input.declared_unit.value.lower(),
-            valid_until=epd_input.valid_until,
-            published_date=epd_input.published_date,
-            source=epd_input.source.get("name"),
-            location=epd_input.location,
-            subtype=epd_input.subtype,
-            reference_service_life=epd_input.reference_service_life,
-            comment=epd_input.comment,
-            gwp=epd_input.gwp,
-            odp=epd_input.odp,
-            ap=epd_input.ap,
-            ep=epd_input.ep,
-            pocp=epd_input.pocp,
-            penre=epd_input.penre,
-            pere=epd_input.pere,
-            meta_fields=epd_input.meta_data,
-            is_transport=epd_input.meta_data.get("isTransport", False) if epd_input.meta_data else False,
-            conversions=epd_input.conversions,
-        )
-        _epds.append(epd)
-        session.add(epd)
+    _epds = [epd_from_input(epd_input) for epd_input in epds]
+    session.add_all(_epds)
+    await notify_epds_changed(session)
+    await session.commit()
 
+    # Reload all EPDs in one query, instead of refreshing them one by one
+    query = select(models_epd.EPD).where(col(models_epd.EPD.id).in_([epd.id for epd in _epds]))
+    loaded = {epd.id: epd for epd in (await session.exec(query)).all()}
+    return [loaded[epd.id] for epd in _epds]
+
+
+async def upsert_epds_mutation(info: Info, epds: list["GraphQLAddEpdInput"]) -> "GraphQLUpsertEpdsReport":
+    """
+    Add or update Global EPDs in bulk.
+    EPDs are matched on their origin id and version, or on their id if they have no origin id. Existing EPDs are only
+    written, if their data has changed.
+    """
+    session = get_session(info)
+
+    report = await upsert_epd_rows(session, [epd_from_input(epd_input).dict() for epd_input in epds])
     await session.commit()
-    [await session.refresh(epd) for epd in _epds]
-    return _epds
+
+    logger.info(
+        f"Upserted {report.inserted + report.updated + report.unchanged} EPDs: "
+        f"{report.inserted} inserted and {report.updated} updated"
+    )
+    return report
+
+
+async def upsert_epd_rows(session: AsyncSession, rows: list[dict]) -> "GraphQLUpsertEpdsReport":
+    """
+    Add or update EPD rows in batches, matched on their origin id and version, or on their id if they have no origin id.
+    Refreshes the impacts of the assemblies using updated EPDs. The caller commits.
+    """
+
+    # Postgres can't update the same row twice in one statement, so only the last EPD per origin id and version is kept
+    unique_rows = {}
+    for row in rows:
+        unique_rows[(row["origin_id"], row["version"]) if row["origin_id"] is not None else row["id"]] = row
+
+    inserted = 0
+    updated_ids = []
+    rows = list(unique_rows.values())
+    for by_origin in (True, False):
+        matched_rows = [row for row in rows if (row["origin_id"] is not None) == by_origin]
+        for start in range(0, len(matched_rows), BATCH_SIZE):
+            statement = build_upsert_epds_statement(matched_rows[start : start + BATCH_SIZE], by_origin)
+            written = (await session.execute(statement)).all()
+            inserted += sum(1 for _, is_inserted in written if is_inserted)
+            updated_ids.extend(_id for _id, is_inserted in written if not is_inserted)
+
+    if inserted or updated_ids:
+        await notify_epds_changed(session, updated_ids)
+    # Assemblies using the updated EPDs have new impact totals
+    await refresh_assembly_impacts(session, Assembly, await get_affected_assemblies(session, Assembly, updated_ids))
+
+    updated = len(updated_ids)
+    return GraphQLUpsertEpdsReport(inserted=inserted, updated=updated, unchanged=len(rows) - inserted - updated)
+
+
+def build_upsert_epds_statement(rows: list[dict], by_origin: bool = True):
+    """
+    Build an INSERT ... ON CONFLICT DO UPDATE statement for EPD rows.
+    Rows are matched on their origin id and version, or on their id if by_origin is False. Rows without an origin id
+    must be matched on their id, as they never conflict on origin_version, where NULLs are distinct.
+    Rows without changes are skipped by the conflict clause and are not returned.
+    The statement returns the id of every written row and whether it was inserted (xmax is 0 for new rows).
+    """
+
+    table = models_epd.EPD.__table__
+    statement = insert(table).values(rows)
+    keys = ("id", "origin_id", "version") if by_origin else ("id", "origin_id")
+    # Generated columns like the search vector are maintained by Postgres
+    update_columns = [column for column in table.columns if column.name not in keys and column.computed is None]
+    conflict = {"constraint": "origin_version"} if by_origin else {"index_elements": [table.c.id]}
+
+    return statement.on_conflict_do_update(
+        **conflict,
+        set_={column.name: statement.excluded[column.name] for column in update_columns},
+        where=or_(*[_is_distinct_from(column, statement.excluded[column.name]) for column in update_columns]),
+    ).returning(table.c.id, literal_column("xmax = 0"))
+
+
+def _is_distinct_from(column, excluded):
+    # The json type has no equality operator
+    if isinstance(column.type, JSON_TYPE):
+        return cast(column, JSONB).is_distinct_from(cast(excluded, JSONB))
+    return column.is_distinct_from(excluded)
+
+
+def epd_from_input(epd_input: "GraphQLAddEpdInput") -> models_epd.EPD:
+    """Create an EPD model from an add EPD input"""
+
+    return models_epd.EPD(
+        id=epd_input.id if epd_input.id else string_uuid(),
+        origin_id=epd_input.origin_id,
+        name=epd_input.name,
+        version=epd_input.version,
+        declared_unit=epd_input.declared_unit.value.lower(),
+        valid_until=epd_input.valid_until,
+        published_date=epd_input.published_date,
+        source=epd_input.source.get("name"),
+        location=epd_input.location,
+        subtype=epd_input.subtype,
+        reference_service_life=epd_input.reference_service_life,
+        comment=epd_input.comment,
+        gwp=epd_input.gwp,
+        odp=epd_input.odp,
+        ap=epd_input.ap,
+        ep=epd_input.ep,
+        pocp=epd_input.pocp,
+        penre=epd_input.penre,
+        pere=epd_input.pere,
+        meta_fields=epd_input.meta_data,
+        is_transport=epd_input.meta_data.get("isTransport", False) if epd_input.meta_data else False,
+        conversions=epd_input.conversions,
+    )
 
 
 async def delete_epds_mutation(info: Info, ids: list[str]) -> list[str]:
     """Delete a global EPD"""
 
     session = get_session(info)
-    for _id in ids:
-        project_epd = await session.get(models_epd.EPD, _id)
-        await session.delete(project_epd)
+    assembly_ids = await get_affected_assemblies(session, Assembly, ids)
+    deleted = await bulk_delete(session, models_epd.EPD, ids)
+    if deleted:
+        await notify_epds_changed(session, deleted)
 
+    await refresh_assembly_impacts(session, Assembly, assembly_ids)
     await session.commit()
-    return ids
+    return deleted
 
 
 @strawberry.enum
@@ -255,6 +628,21 @@ class GraphQLImpactCategory(Enum):
     d = "d"
 
 
+@strawberry.input
+class GraphQLImpactFilter:
+    indicator: GraphQLImpactIndicator
+    phase: GraphQLImpactCategory = GraphQLImpactCategory.a1a3
+    less_than: float | None = None
+    greater_than: float | None = None
+
+
+@strawberry.input
+class GraphQLImpactSort:
+    indicator: GraphQLImpactIndicator
+    phase: GraphQLImpactCategory = GraphQLImpactCategory.a1a3
+    direction: SortOptions = SortOptions.ASC
+
+
 @strawberry.input
 class GraphQLSource:
     name: str
@@ -264,6 +652,7 @@ class GraphQLSource:
 @strawberry.input
 class GraphQLAddEpdInput:
     id: str | None = None
+    origin_id: str | None = None
     name: str
     version: str
     declared_unit: GraphQLUnit
@@ -285,6 +674,13 @@ class GraphQLAddEpdInput:
     conversions: JSON | None = None
 
 
+@strawberry.type
+class GraphQLUpsertEpdsReport:
+    inserted: int
+    updated: int
+    unchanged: int
+
+
 @strawberry.type
 class GraphQLEPDBase:
     id: str
@@ -299,55 +695,52 @@ class GraphQLEPDBase:
     is_transport: bool = False
     reference_service_life: int | None
     comment: str | None
-    meta_fields: JSON | None
 
+    # The JSON columns are only loaded by the query if they are selected. Otherwise they are loaded on demand.
     @strawberry.field
-    def conversions(self) -> list[GraphQLConversion]:
-        if not self.conversions:
+    async def meta_fields(self, info: Info) -> JSON | None:
+        return await load_deferred_column(info, self, "meta_fields")
+
+    @strawberry.field
+    async def conversions(self, info: Info) -> list[GraphQLConversion]:
+        conversions = await load_deferred_column(info, self, "conversions")
+        if not conversions:
             return []
-        return [GraphQLConversion(**conversion) for conversion in self.conversions]
+        return [GraphQLConversion(**conversion) for conversion in conversions]
 
     @strawberry.field
-    def gwp(self) -> GraphQLImpactCategories | None:
-        if not self.gwp:
-            return None
-        return GraphQLImpactCategories(**self.gwp)
+    async def gwp(self, info: Info) -> GraphQLImpactCategories | None:
+        return to_impact_categories(await load_deferred_column(info, self, "gwp"))
 
     @strawberry.field
-    def odp(self) -> GraphQLImpactCategories | None:
-        if not self.odp:
-            return None
-        return GraphQLImpactCategories(**self.odp)
+    async def odp(self, info: Info) -> GraphQLImpactCategories | None:
+        return to_impact_categories(await load_deferred_column(info, self, "odp"))
 
     @strawberry.field
-    def ap(self) -> GraphQLImpactCategories | None:
-        if not self.ap:
-            return None
-        return GraphQLImpactCategories(**self.ap)
+    async def ap(self, info: Info) -> GraphQLImpactCategories | None:
+        return to_impact_categories(await load_deferred_column(info, self, "ap"))
 
     @strawberry.field
-    def ep(self) -> GraphQLImpactCategories | None:
-        if not self.ep:
-            return None
-        return GraphQLImpactCategories(**self.ep)
+    async def ep(self, info: Info) -> GraphQLImpactCategories | None:
+        return to_impact_categories(await load_deferred_column(info, self, "ep"))
 
     @strawberry.field
-    def pocp(self) -> GraphQLImpactCategories | None:
-        if not self.pocp:
-            return None
-        return GraphQLImpactCategories(**self.pocp)
+    async def pocp(self, info: Info) -> GraphQLImpactCategories | None:
+        return to_impact_categories(await load_deferred_column(info, self, "pocp"))
 
     @strawberry.field
-    def penre(self) -> GraphQLImpactCategories | None:
-        if not self.penre:
-            return None
-        return GraphQLImpactCategories(**self.penre)
+    async def penre(self, info: Info) -> GraphQLImpactCategories | None:
+        return to_impact_categories(await load_deferred_column(info, self, "penre"))
 
     @strawberry.field
-    def pere(self) -> GraphQLImpactCategories | None:
-        if not self.pere:
-            return None
-        return GraphQLImpactCategories(**self.pere)
+    async def pere(self, info: Info) -> GraphQLImpactCategories | None:
+        return to_impact_categories(await load_deferred_column(info, self, "pere"))
+
+
+def to_impact_categories(impacts: dict | None) -> GraphQLImpactCategories | None:
+    if not impacts:
+        return None
+    return GraphQLImpactCategories(**impacts)
 
 
 @strawberry.type
@@ -0,0 +1,22 @@
+import argparse
+import asyncio
+import logging
+
+from initial_data.seeding import DATASETS, run_seeding
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main(datasets: list[str] | None) -> None:
+    logger.info("Seeding reference data")
+    if await run_seeding(datasets):
+        logger.info("Finished seeding reference data")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed the database with reference datasets")
+    parser.add_argument("datasets", nargs="*", help=f"Datasets to load: {', '.join(DATASETS)}. Defaults to all.")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.datasets))
@@ -105,4 +105,23 @@ def project_id() -> str:
 
 @pytest.fixture
 def project_exists_mock(mocker):
-    mocker.patch("lcacollect_config.validate.project_exists", return_value=True)
+    yield mocker.patch("lcacollect_config.validate.project_exists", return_value=True)
+
+
+@pytest.fixture(autouse=True)
+def clear_project_cache():
+    from core.validate import clear_project_cache
+
+    clear_project_cache()
+
+
+@pytest.fixture(autouse=True)
+def clear_epd_cache():
+    from core.epd_cache import epd_cache
+    from core.persisted_queries import persisted_queries
+    from core.response_cache import response_cache
+
+    # The catalog version starts over with every test database
+    epd_cache.invalidate()
+    response_cache.clear()
+    persisted_queries.clear()
@@ -57,6 +57,112 @@ async def test_get_assemblies_with_layers(client: AsyncClient, assembly_with_lay
     }
 
 
+@pytest.mark.asyncio
+async def test_get_assemblies_with_layers_in_fragments(client: AsyncClient, assembly_with_layers):
+    query = """
+        query {
+            assemblies {
+                name
+                ...AssemblyLayers
+            }
+        }
+
+        fragment AssemblyLayers on GraphQLAssembly {
+            layers {
+                ... on GraphQLAssemblyLayer {
+                    material: epd {
+                        name
+                    }
+                }
+                transport: transportEpd {
+                    ...EPDImpacts
+                }
+                transportEpd {
+                    name
+                }
+            }
+        }
+
+        fragment EPDImpacts on GraphQLProjectEPD {
+            gwp {
+                a1a3
+            }
+        }
+    """
+
+    response = await client.post(f"{settings.API_STR}/graphql", json={"query": query, "variables": None})
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert not data.get("errors")
+    assembly = sorted(data["data"]["assemblies"], key=lambda x: x.get("name"))[0]
+    assert sorted(layer["material"]["name"] for layer in assembly["layers"]) == ["EPD 0", "EPD 1"]
+    assert assembly["layers"][0]["transport"] == {"gwp": {"a1a3": 20.0}}
+    assert assembly["layers"][0]["transportEpd"] == {"name": "EPD 2"}
+
+
+@pytest.mark.asyncio
+async def test_search_assemblies(client: AsyncClient, assemblies):
+    query = """
+        query {
+            searchAssemblies(query: "assembly 1", filters: {category: {equal: "My Category"}}) {
+                edges {
+                    node {
+                        name
+                    }
+                }
+            }
+        }
+    """
+
+    response = await client.post(f"{settings.API_STR}/graphql", json={"query": query, "variables": None})
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert not data.get("errors")
+    assert data["data"]["searchAssemblies"]["edges"] == [{"node": {"name": "Assembly 1"}}]
+
+
+@pytest.mark.asyncio
+async def test_search_assemblies_paginated(client: AsyncClient, assemblies):
+    query = """
+        query ($after: String) {
+            searchAssemblies(query: "assembly", count: 2, after: $after) {
+                edges {
+                    node {
+                        id
+                    }
+                }
+                pageInfo {
+                    endCursor
+                    hasNextPage
+                }
+                numEdges
+            }
+        }
+    """
+
+    ids = []
+    after = None
+    for has_next_page in [True, False]:
+        response = await client.post(
+            f"{settings.API_STR}/graphql", json={"query": query, "variables": {"after": after}}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+
+        assert not data.get("errors")
+        assert data["data"]["searchAssemblies"]["numEdges"] == 3
+        assert data["data"]["searchAssemblies"]["pageInfo"]["hasNextPage"] == has_next_page
+        ids.extend(edge["node"]["id"] for edge in data["data"]["searchAssemblies"]["edges"])
+        after = data["data"]["searchAssemblies"]["pageInfo"]["endCursor"]
+
+    assert sorted(ids) == sorted(assembly.id for assembly in assemblies)
+
+
 @pytest.mark.asyncio
 async def test_create_assemblies(client: AsyncClient, project_exists_mock):
     mutation = """
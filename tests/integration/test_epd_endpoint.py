@@ -2,8 +2,12 @@ import json
 
 import pytest
 from httpx import AsyncClient
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from core.config import settings
+from models.epd import EPD
+from schema import schema
 
 
 @pytest.mark.asyncio
@@ -59,6 +63,181 @@ async def test_filter_epds(client: AsyncClient, epds):
     assert "EPD 0" in data["data"]["epds"]["edges"][0]["node"]["name"]
 
 
+@pytest.mark.parametrize(
+    "sort_by, expected",
+    [
+        (None, None),
+        ("{name: DSC}", ["EPD 2", "EPD 1", "EPD 0"]),
+        ("{source: ASC}", None),
+        ("{source: ASC, name: DSC}", ["EPD 2", "EPD 1", "EPD 0"]),
+    ],
+)
+@pytest.mark.asyncio
+async def test_paginate_epds(client: AsyncClient, epds, sort_by, expected):
+    query = """
+        query ($after: String) {
+            epds(count: 1, after: $after%s) {
+                edges {
+                    node {
+                        name
+                    }
+                }
+                pageInfo {
+                    hasNextPage
+                    endCursor
+                }
+            }
+        }
+    """ % (
+        f", sortBy: {sort_by}" if sort_by else ""
+    )
+
+    names = []
+    after = None
+    for _ in range(len(epds)):
+        response = await client.post(
+            f"{settings.API_STR}/graphql", json={"query": query, "variables": {"after": after}}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+
+        assert not data.get("errors")
+        names.extend(edge["node"]["name"] for edge in data["data"]["epds"]["edges"])
+        after = data["data"]["epds"]["pageInfo"]["endCursor"]
+
+    assert data["data"]["epds"]["pageInfo"]["hasNextPage"] is False
+    if expected:
+        assert names == expected
+    else:
+        assert sorted(names) == [epd.name for epd in epds]
+
+
+@pytest.mark.asyncio
+async def test_get_epds_impact_filters(client: AsyncClient, epds):
+    query = """
+        query {
+            epds(impactFilters: [{indicator: gwp, lessThan: 15}]) {
+                edges {
+                    node {
+                        name
+                    }
+                }
+            }
+        }
+    """
+
+    response = await client.post(f"{settings.API_STR}/graphql", json={"query": query})
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert not data.get("errors")
+    assert sorted(edge["node"]["name"] for edge in data["data"]["epds"]["edges"]) == ["EPD 0", "EPD 1"]
+
+
+@pytest.mark.asyncio
+async def test_paginate_epds_sort_by_impact(client: AsyncClient, epds):
+    query = """
+        query ($after: String) {
+            epds(count: 1, after: $after, sortByImpact: {indicator: gwp, direction: DSC}) {
+                edges {
+                    node {
+                        name
+                    }
+                }
+                pageInfo {
+                    endCursor
+                }
+            }
+        }
+    """
+
+    names = []
+    after = None
+    for _ in range(len(epds)):
+        response = await client.post(
+            f"{settings.API_STR}/graphql", json={"query": query, "variables": {"after": after}}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+
+        assert not data.get("errors")
+        names.extend(edge["node"]["name"] for edge in data["data"]["epds"]["edges"])
+        after = data["data"]["epds"]["pageInfo"]["endCursor"]
+
+    assert names == ["EPD 2", "EPD 1", "EPD 0"]
+
+
+@pytest.mark.asyncio
+async def test_search_epds(client: AsyncClient, epds, db):
+    async with AsyncSession(db) as session:
+        for epd, (name, comment) in zip(
+            epds, [("Concrete wall", None), ("Timber", "Replaces concrete"), ("Concrete slab, concrete", None)]
+        ):
+            epd.name, epd.comment = name, comment
+            session.add(epd)
+        await session.commit()
+
+    query = """
+        query ($after: String) {
+            searchEpds(query: "concr", count: 1, after: $after) {
+                edges {
+                    node {
+                        name
+                    }
+                }
+                pageInfo {
+                    endCursor
+                    hasNextPage
+                }
+                numEdges
+            }
+        }
+    """
+
+    names = []
+    after = None
+    for _ in range(len(epds)):
+        response = await client.post(
+            f"{settings.API_STR}/graphql", json={"query": query, "variables": {"after": after}}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+
+        assert not data.get("errors")
+        assert data["data"]["searchEpds"]["numEdges"] == 3
+        names.extend(edge["node"]["name"] for edge in data["data"]["searchEpds"]["edges"])
+        after = data["data"]["searchEpds"]["pageInfo"]["endCursor"]
+
+    assert names == ["Concrete slab, concrete", "Concrete wall", "Timber"]
+    assert not data["data"]["searchEpds"]["pageInfo"]["hasNextPage"]
+
+
+@pytest.mark.asyncio
+async def test_search_epds_rejects_id_cursor(client: AsyncClient, epds):
+    query = """
+        query ($after: String) {
+            searchEpds(query: "epd", after: $after) {
+                edges {
+                    node {
+                        name
+                    }
+                }
+            }
+        }
+    """
+
+    response = await client.post(
+        f"{settings.API_STR}/graphql", json={"query": query, "variables": {"after": epds[0].id}}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["errors"][0]["message"] == "Invalid cursor"
+
+
 @pytest.mark.asyncio
 async def test_add_epds(client: AsyncClient, datafix_dir):
     query = """
@@ -111,6 +290,199 @@ async def test_add_epds(client: AsyncClient, datafix_dir):
     assert data["data"]["addEpds"] != 0
 
 
+@pytest.mark.asyncio
+async def test_upsert_epds(client: AsyncClient, db):
+    query = """
+        mutation ($epds: [GraphQLAddEpdInput!]!) {
+            upsertEpds(epds: $epds) {
+                inserted
+                updated
+                unchanged
+            }
+        }
+    """
+    epds = [
+        {
+            "originId": f"origin {i}",
+            "name": f"EPD {i}",
+            "version": "1",
+            "declaredUnit": "M2",
+            "validUntil": "2030-01-01",
+            "publishedDate": "2020-01-01",
+            "source": {"name": "Source"},
+            "location": "DK",
+            "subtype": "Generic",
+            "gwp": {"a1a3": i * 10},
+            "conversions": [],
+        }
+        for i in range(2)
+    ]
+
+    response = await client.post(f"{settings.API_STR}/graphql", json={"query": query, "variables": {"epds": epds}})
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert not data.get("errors")
+    assert data["data"]["upsertEpds"] == {"inserted": 2, "updated": 0, "unchanged": 0}
+
+    epds[1]["gwp"] = {"a1a3": 15}
+    response = await client.post(f"{settings.API_STR}/graphql", json={"query": query, "variables": {"epds": epds}})
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert not data.get("errors")
+    assert data["data"]["upsertEpds"] == {"inserted": 0, "updated": 1, "unchanged": 1}
+
+    async with AsyncSession(db) as session:
+        _epds = (await session.exec(select(EPD).order_by(EPD.name))).all()
+
+    assert [epd.gwp["a1a3"] for epd in _epds] == [0, 15]
+
+
+@pytest.mark.asyncio
+async def test_upsert_epds_without_origin_id(client: AsyncClient, db):
+    query = """
+        mutation ($epds: [GraphQLAddEpdInput!]!) {
+            upsertEpds(epds: $epds) {
+                inserted
+                updated
+                unchanged
+            }
+        }
+    """
+    epd = {
+        "id": "custom-epd",
+        "name": "Custom EPD",
+        "version": "1",
+        "declaredUnit": "M2",
+        "validUntil": "2030-01-01",
+        "publishedDate": "2020-01-01",
+        "source": {"name": "Source"},
+        "location": "DK",
+        "subtype": "Generic",
+        "gwp": {"a1a3": 10},
+        "conversions": [],
+    }
+
+    reports = []
+    for version, gwp in [("1", 10), ("1", 10), ("2", 20)]:
+        variables = {"epds": [{**epd, "version": version, "gwp": {"a1a3": gwp}}]}
+        response = await client.post(f"{settings.API_STR}/graphql", json={"query": query, "variables": variables})
+        assert not response.json().get("errors")
+        reports.append(response.json()["data"]["upsertEpds"])
+
+    assert reports == [
+        {"inserted": 1, "updated": 0, "unchanged": 0},
+        {"inserted": 0, "updated": 0, "unchanged": 1},
+        {"inserted": 0, "updated": 1, "unchanged": 0},
+    ]
+
+    async with AsyncSession(db) as session:
+        _epd = (await session.exec(select(EPD))).one()
+
+    assert (_epd.id, _epd.version, _epd.gwp["a1a3"]) == ("custom-epd", "2", 20)
+
+
+@pytest.mark.asyncio
+async def test_upsert_epds_invalidates_cached_epds(client: AsyncClient):
+    query = """
+        query {
+            epds(sortBy: {name: ASC}) {
+                edges {
+                    node {
+                        gwp {
+                            a1a3
+                        }
+                    }
+                }
+            }
+        }
+    """
+    mutation = """
+        mutation ($epds: [GraphQLAddEpdInput!]!) {
+            upsertEpds(epds: $epds) {
+                updated
+            }
+        }
+    """
+    epds = [
+        {
+            "originId": f"origin {i}",
+            "name": f"EPD {i}",
+            "version": "1",
+            "declaredUnit": "M2",
+            "validUntil": "2030-01-01",
+            "publishedDate": "2020-01-01",
+            "source": {"name": "Source"},
+            "location": "DK",
+            "subtype": "Generic",
+            "gwp": {"a1a3": i * 10},
+            "conversions": [],
+        }
+        for i in range(2)
+    ]
+
+    await client.post(f"{settings.API_STR}/graphql", json={"query": mutation, "variables": {"epds": epds}})
+    response = await client.post(f"{settings.API_STR}/graphql", json={"query": query})
+    assert [edge["node"]["gwp"]["a1a3"] for edge in response.json()["data"]["epds"]["edges"]] == [0, 10]
+
+    epds[1]["gwp"] = {"a1a3": 15}
+    response = await client.post(f"{settings.API_STR}/graphql", json={"query": mutation, "variables": {"epds": epds}})
+    assert response.json()["data"]["upsertEpds"] == {"updated": 1}
+
+    response = await client.post(f"{settings.API_STR}/graphql", json={"query": query})
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert not data.get("errors")
+    assert [edge["node"]["gwp"]["a1a3"] for edge in data["data"]["epds"]["edges"]] == [0, 15]
+
+
+@pytest.mark.asyncio
+async def test_get_epds_revalidates_with_etag(client: AsyncClient, epds, mocker):
+    params = {"query": "query { epds(sortBy: {name: ASC}) { edges { node { name } } } }"}
+    mutation = """
+        mutation ($ids: [String!]!) {
+            deleteEpds(ids: $ids)
+        }
+    """
+
+    response = await client.get(f"{settings.API_STR}/graphql", params=params)
+
+    assert response.status_code == 200
+    assert [edge["node"]["name"] for edge in response.json()["data"]["epds"]["edges"]] == ["EPD 0", "EPD 1", "EPD 2"]
+    etag = response.headers["etag"]
+
+    # Repeated requests are served from the cache, or not at all if the client has the response already
+    execute = mocker.spy(schema, "execute")
+    cached = await client.get(f"{settings.API_STR}/graphql", params=params)
+    not_modified = await client.get(f"{settings.API_STR}/graphql", params=params, headers={"if-none-match": etag})
+
+    assert (cached.status_code, cached.content, cached.headers["etag"]) == (200, response.content, etag)
+    assert not_modified.status_code == 304
+    assert execute.call_count == 0
+
+    await client.post(f"{settings.API_STR}/graphql", json={"query": mutation, "variables": {"ids": [epds[0].id]}})
+    response = await client.get(f"{settings.API_STR}/graphql", params=params, headers={"if-none-match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert [edge["node"]["name"] for edge in response.json()["data"]["epds"]["edges"]] == ["EPD 1", "EPD 2"]
+
+
+@pytest.mark.asyncio
+async def test_get_project_epds_is_not_cached(client: AsyncClient, project_exists_mock):
+    params = {"query": 'query { projectEpds(projectId: "1") { name } }'}
+
+    response = await client.get(f"{settings.API_STR}/graphql", params=params)
+
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+
+
 @pytest.mark.asyncio
 async def test_delete_epds(client: AsyncClient, epds):
     query = """
@@ -0,0 +1,70 @@
+import csv
+import io
+import json
+
+import pytest
+from httpx import AsyncClient
+from pyarrow import parquet
+
+from core.config import settings
+
+
+@pytest.mark.asyncio
+async def test_export_epds_ndjson(client: AsyncClient, epds):
+    response = await client.get(f"{settings.API_STR}/export/epds")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(row["name"] for row in rows) == [epd.name for epd in epds]
+    assert rows[0]["gwp"] == next(epd.gwp for epd in epds if epd.id == rows[0]["id"])
+
+
+@pytest.mark.asyncio
+async def test_export_epds_csv_in_batches(client: AsyncClient, epds, mocker):
+    mocker.patch.object(settings, "EXPORT_BATCH_SIZE", 2)
+
+    response = await client.get(f"{settings.API_STR}/export/epds", params={"format": "csv"})
+
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert sorted(row["name"] for row in rows) == [epd.name for epd in epds]
+    assert {float(row["gwp_c1"]) for row in rows} == {epd.gwp["c1"] for epd in epds}
+
+
+@pytest.mark.asyncio
+async def test_export_epds_with_filters(client: AsyncClient, epds):
+    response = await client.get(
+        f"{settings.API_STR}/export/epds",
+        params={"format": "csv", "filters": json.dumps({"name": {"isAnyOf": ["EPD 0", "EPD 2"]}})},
+    )
+
+    assert response.status_code == 200
+    assert sorted(row["name"] for row in csv.DictReader(io.StringIO(response.text))) == ["EPD 0", "EPD 2"]
+
+
+@pytest.mark.asyncio
+async def test_export_epds_with_invalid_filters(client: AsyncClient, epds):
+    response = await client.get(f"{settings.API_STR}/export/epds", params={"filters": json.dumps({"colour": {}})})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_export_project_assemblies(client: AsyncClient, project_assemblies, assemblies, project_id):
+    response = await client.get(f"{settings.API_STR}/export/projects/{project_id}/assemblies")
+
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(row["id"] for row in rows) == sorted(assembly.id for assembly in project_assemblies)
+
+
+@pytest.mark.asyncio
+async def test_export_epds_parquet(client: AsyncClient, epds, mocker):
+    mocker.patch.object(settings, "EXPORT_BATCH_SIZE", 2)
+
+    response = await client.get(f"{settings.API_STR}/export/epds", params={"format": "parquet"})
+
+    assert response.status_code == 200
+    table = parquet.read_table(io.BytesIO(response.content))
+    assert sorted(table.column("name").to_pylist()) == [epd.name for epd in epds]
@@ -1,7 +1,10 @@
+import json
+
 import pytest
 from httpx import AsyncClient
 
 from core.config import settings
+from core.persisted_queries import get_query_hash
 
 
 @pytest.mark.asyncio
@@ -9,3 +12,38 @@ async def test_get_graphql(client: AsyncClient):
     response = await client.get(f"{settings.API_STR}/graphql")
 
     assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_persisted_query(client: AsyncClient):
+    query = "query { epds { numEdges } }"
+    extensions = {"persistedQuery": {"version": 1, "sha256Hash": get_query_hash(query)}}
+
+    response = await client.post(f"{settings.API_STR}/graphql", json={"extensions": extensions})
+
+    assert response.status_code == 200
+    assert response.json()["errors"][0]["extensions"]["code"] == "PERSISTED_QUERY_NOT_FOUND"
+
+    response = await client.post(f"{settings.API_STR}/graphql", json={"query": query, "extensions": extensions})
+
+    assert response.status_code == 200
+    assert response.json() == {"data": {"epds": {"numEdges": 0}}}
+
+    # Registered queries are sent by their hash only, also as cacheable GET requests
+    posted = await client.post(f"{settings.API_STR}/graphql", json={"extensions": extensions})
+    got = await client.get(f"{settings.API_STR}/graphql", params={"extensions": json.dumps(extensions)})
+
+    assert posted.json() == got.json() == {"data": {"epds": {"numEdges": 0}}}
+    assert "etag" in got.headers
+
+
+@pytest.mark.asyncio
+async def test_persisted_query_hash_mismatch(client: AsyncClient):
+    extensions = {"persistedQuery": {"version": 1, "sha256Hash": get_query_hash("query { __typename }")}}
+
+    response = await client.post(
+        f"{settings.API_STR}/graphql", json={"query": "query { epds { numEdges } }", "extensions": extensions}
+    )
+
+    assert response.status_code == 400
+    assert response.text == "Provided sha256Hash does not match the query"
@@ -0,0 +1,39 @@
+import pytest
+from httpx import AsyncClient
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.config import settings
+from models.epd import EPD
+
+CSV = """origin_id,name,version,declared_unit,valid_until,published_date,location,subtype,gwp_a1a3
+csv-1,Timber,1.0,m3,2025-01-01,2020-01-01,DK,Generic,-700.5
+csv-2,Steel,1.0,kg,2025-01-01,2020-01-01,,Generic,2
+"""
+
+
+@pytest.mark.asyncio
+async def test_import_epds_csv(client: AsyncClient, db):
+    response = await client.post(
+        f"{settings.API_STR}/import/epds", files={"file": ("Supplier EPDs.csv", CSV.encode(), "text/csv")}
+    )
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["read"], report["inserted"], report["updated"], report["unchanged"]) == (2, 1, 0, 0)
+    assert report["errors"] == [{"record": "line 3", "message": "Missing location"}]
+
+    async with AsyncSession(db) as session:
+        epd = (await session.exec(select(EPD).where(EPD.origin_id == "csv-1"))).one()
+
+    assert epd.source == "Supplier EPDs"
+    assert epd.gwp["a1a3"] == -700.5
+
+
+@pytest.mark.asyncio
+async def test_import_epds_unsupported_file(client: AsyncClient):
+    response = await client.post(
+        f"{settings.API_STR}/import/epds", files={"file": ("epds.xlsx", b"", "application/octet-stream")}
+    )
+
+    assert response.status_code == 400
@@ -4,7 +4,9 @@ from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from core.config import settings
+from graphql_types.assembly import calculate_impact_category
 from models.assembly import ProjectAssembly
+from models.epd import ProjectEPD
 
 
 @pytest.mark.asyncio
@@ -58,6 +60,99 @@ async def test_get_project_assemblies_with_layers(client: AsyncClient, project_a
     }
 
 
+@pytest.mark.asyncio
+async def test_get_project_assemblies_impacts(client: AsyncClient, project_assembly_with_layers, project_id):
+    query = f"""
+        query {{
+            projectAssemblies(projectId: "{project_id}") {{
+                name
+                gwp(phases: ["a1a3", "c1"])
+                impacts(indicators: [gwp, odp], phases: ["a1a3", "c1"]) {{
+                    indicator
+                    value
+                }}
+            }}
+        }}
+    """
+
+    response = await client.post(f"{settings.API_STR}/graphql", json={"query": query, "variables": None})
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert not data.get("errors")
+    assert sorted(data["data"]["projectAssemblies"], key=lambda x: x.get("name"))[0] == {
+        "name": f"Assembly {0}",
+        "gwp": 66,
+        "impacts": [{"indicator": "gwp", "value": 66}, {"indicator": "odp", "value": 66}],
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("group_by", ["CATEGORY", "ASSEMBLY", "EPD"])
+async def test_get_project_impact_summary(
+    client: AsyncClient, project_assemblies, project_assembly_with_layers, project_id, group_by
+):
+    phases = ["a1a3", "c1", "unknown"]
+    query = """
+        query summary($projectId: String!, $phases: [String!], $groupBy: GraphQLImpactGroupBy!) {
+            projectImpactSummary(projectId: $projectId, indicators: [gwp, odp], phases: $phases, groupBy: $groupBy) {
+                groupBy
+                total {
+                    indicator
+                    value
+                }
+                groups {
+                    id
+                    name
+                    impacts {
+                        indicator
+                        value
+                    }
+                }
+            }
+        }
+    """
+
+    response = await client.post(
+        f"{settings.API_STR}/graphql",
+        json={"query": query, "variables": {"projectId": project_id, "phases": phases, "groupBy": group_by}},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert not data.get("errors")
+
+    def impacts(layers):
+        return [
+            {"indicator": indicator, "value": pytest.approx(calculate_impact_category(indicator, layers, phases))}
+            for indicator in ["gwp", "odp"]
+        ]
+
+    layers = project_assembly_with_layers.layers
+    if group_by == "CATEGORY":
+        expected = [{"id": "My Category", "name": "My Category", "impacts": impacts(layers)}]
+    elif group_by == "ASSEMBLY":
+        expected = [
+            {
+                "id": assembly.id,
+                "name": assembly.name,
+                "impacts": impacts(layers if assembly.id == project_assembly_with_layers.id else []),
+            }
+            for assembly in sorted(project_assemblies, key=lambda assembly: assembly.name)
+        ]
+    else:
+        expected = [
+            {"id": layer.epd.id, "name": layer.epd.name, "impacts": impacts([layer])}
+            for layer in sorted(layers, key=lambda layer: layer.epd.name)
+        ]
+
+    summary = data["data"]["projectImpactSummary"]
+    assert summary["groupBy"] == group_by
+    assert summary["total"] == impacts(layers)
+    assert summary["groups"] == expected
+
+
 @pytest.mark.asyncio
 async def test_create_project_assemblies(client: AsyncClient, project_exists_mock):
     mutation = """
@@ -100,6 +195,42 @@ async def test_create_project_assemblies(client: AsyncClient, project_exists_moc
     }
 
 
+@pytest.mark.asyncio
+async def test_create_project_assemblies_authenticates_each_project_once(client: AsyncClient, project_exists_mock):
+    mutation = """
+        mutation ($assemblies: [ProjectAssemblyAddInput!]!) {
+            addProjectAssemblies(assemblies: $assemblies) {
+                name
+            }
+        }
+    """
+
+    response = await client.post(
+        f"{settings.API_STR}/graphql",
+        json={
+            "query": mutation,
+            "variables": {
+                "assemblies": [
+                    {
+                        "name": f"My Assembly {i}",
+                        "category": "New Category",
+                        "projectId": f"TESTID {i % 2}",
+                        "unit": "m2",
+                    }
+                    for i in range(10)
+                ]
+            },
+        },
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert not data.get("errors")
+    assert len(data["data"]["addProjectAssemblies"]) == 10
+    assert project_exists_mock.call_count == 2
+
+
 @pytest.mark.asyncio
 async def test_create_project_assemblies_from_assembly(
     client: AsyncClient, project_exists_mock, assembly_with_layers, project_id
@@ -148,6 +279,67 @@ async def test_create_project_assemblies_from_assembly(
     }
 
 
+@pytest.mark.asyncio
+async def test_create_project_assemblies_from_assemblies_reuses_project_epds(
+    client: AsyncClient, project_exists_mock, assembly_with_layers, assemblies, project_id, db
+):
+    mutation = """
+        mutation ($assemblies: [ID!]!, $projectId: ID!) {
+            addProjectAssembliesFromAssemblies(assemblies: $assemblies, projectId: $projectId) {
+                name
+                layers {
+                    epd {
+                        name
+                    }
+                }
+            }
+        }
+    """
+
+    for _ in range(2):
+        response = await client.post(
+            f"{settings.API_STR}/graphql",
+            json={
+                "query": mutation,
+                "variables": {"assemblies": [assembly.id for assembly in assemblies], "projectId": project_id},
+            },
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+
+        assert not data.get("errors")
+        assert sorted(assembly["name"] for assembly in data["data"]["addProjectAssembliesFromAssemblies"]) == [
+            assembly.name for assembly in assemblies
+        ]
+
+    async with AsyncSession(db) as session:
+        project_epds = (await session.exec(select(ProjectEPD))).all()
+
+    assert sorted(epd.name for epd in project_epds) == ["EPD 0", "EPD 1", "EPD 2"]
+
+
+@pytest.mark.asyncio
+async def test_create_project_assemblies_from_missing_assembly(client: AsyncClient, project_exists_mock, project_id):
+    mutation = """
+        mutation ($assemblies: [ID!]!, $projectId: ID!) {
+            addProjectAssembliesFromAssemblies(assemblies: $assemblies, projectId: $projectId) {
+                name
+            }
+        }
+    """
+
+    response = await client.post(
+        f"{settings.API_STR}/graphql",
+        json={"query": mutation, "variables": {"assemblies": ["missing"], "projectId": project_id}},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["errors"][0]["message"] == "Could not find Assembly with id: missing"
+
+
 @pytest.mark.asyncio
 async def test_update_project_assemblies(client: AsyncClient, project_assemblies, project_exists_mock):
     assembly = project_assemblies[0]
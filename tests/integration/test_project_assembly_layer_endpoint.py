@@ -6,6 +6,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from core.config import settings
 from models.assembly import ProjectAssembly
+from models.impact import ProjectAssemblyImpact
 
 
 @pytest.mark.asyncio
@@ -65,6 +66,34 @@ async def test_update_project_assembly_layers(client: AsyncClient, project_assem
     ]
 
 
+@pytest.mark.asyncio
+async def test_update_project_assembly_layers_refreshes_impacts(
+    client: AsyncClient, project_assembly_with_layers, project_epds, db
+):
+    assembly = project_assembly_with_layers
+    mutation = f"""
+        mutation {{
+            updateProjectAssemblyLayers(
+                id: "{assembly.id}"
+                layers: [{', '.join([f'{{id: "{layer.id}", epdId: "{layer.epd_id}", conversionFactor: 5}}' for layer in assembly.layers])}]
+            ) {{
+                id
+            }}
+        }}
+    """
+
+    response = await client.post(f"{settings.API_STR}/graphql", json={"query": mutation, "variables": None})
+
+    assert response.status_code == 200
+    assert not response.json().get("errors")
+
+    async with AsyncSession(db) as session:
+        impact = await session.get(ProjectAssemblyImpact, assembly.id)
+
+    assert impact.gwp["a1a3"] == pytest.approx(sum(5 * epd.gwp["a1a3"] for epd in project_epds))
+    assert impact.gwp["c1"] == pytest.approx(sum(5 * epd.gwp["c1"] for epd in project_epds))
+
+
 @pytest.mark.asyncio
 async def test_delete_project_assembly_layers(client: AsyncClient, project_assembly_with_layers, project_epds, db):
     assembly = project_assembly_with_layers
@@ -152,3 +181,26 @@ async def test_add_project_assembly_layers_with_transport(client: AsyncClient, p
         "transportDistance": 30.0,
         "transportEpd": {"name": "EPD 2"},
     }
+
+
+@pytest.mark.asyncio
+async def test_add_project_assembly_layers_unknown_epd(client: AsyncClient, project_assemblies, project_epds):
+    mutation = """
+        mutation($id: ID!, $layers: [AssemblyLayerInput!]!) {
+            addProjectAssemblyLayers(id: $id, layers: $layers) {
+                name
+            }
+        }
+    """
+    layers = [
+        {"epdId": project_epds[0].id, "conversionFactor": 1, "name": "Known"},
+        {"epdId": "unknown", "conversionFactor": 1, "name": "Unknown"},
+    ]
+
+    response = await client.post(
+        f"{settings.API_STR}/graphql",
+        json={"query": mutation, "variables": {"id": project_assemblies[0].id, "layers": layers}},
+    )
+
+    data = response.json()
+    assert data["errors"][0]["message"] == "Could not find EPD with id: unknown"
@@ -5,6 +5,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from core.config import settings
 from models.epd import ProjectEPD
+from models.links import ProjectAssemblyEPDLink
 
 
 @pytest.mark.asyncio
@@ -105,3 +106,26 @@ async def test_delete_project_epd(client: AsyncClient, project_epds, db):
         epds = epds.all()
 
     assert len(epds) == len(project_epds) - 1
+
+
+@pytest.mark.asyncio
+async def test_delete_project_epds_in_use(client: AsyncClient, project_assembly_with_layers, project_epds, db):
+    mutation = """
+        mutation($ids: [String!]!) {
+            deleteProjectEpds(ids: $ids)
+        }
+    """
+
+    response = await client.post(
+        f"{settings.API_STR}/graphql",
+        json={"query": mutation, "variables": {"ids": [project_epds[0].id, "missing"]}},
+    )
+
+    assert response.status_code == 200
+    # EPDs used by layers are not deleted, along with the layers of the users
+    assert "IntegrityError" in response.json()["errors"][0]["message"]
+
+    async with AsyncSession(db) as session:
+        layers = (await session.exec(select(ProjectAssemblyEPDLink))).all()
+
+    assert any(layer.epd_id == project_epds[0].id for layer in layers)
@@ -23,6 +23,7 @@ async def project_assemblies(db, project_id):
             session.add(assembly)
             assemblies.append(assembly)
         await session.commit()
+        [await session.refresh(assembly) for assembly in assemblies]
 
     yield assemblies
 
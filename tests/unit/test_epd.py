@@ -7,7 +7,7 @@ from lcacollect_config.connection import create_postgres_engine
 from sqlalchemy.exc import IntegrityError
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from models.epd import EPD, ProjectEPD
+from models.epd import EPD, ImpactCategories, ProjectEPD
 
 
 def test_create_epd():
@@ -86,3 +86,11 @@ async def test_create_epds_with_versions(db, versions):
 
     if versions[0] != versions[1]:
         assert epds
+
+
+def test_impact_categories_rejects_unknown_phases():
+    impact_categories = ImpactCategories()
+
+    assert impact_categories.process_bind_param({"a1a3": 10, "d": None}, None)[:2] == [10.0, None]
+    with pytest.raises(ValueError, match="Unknown phases: A1, a6"):
+        impact_categories.process_bind_param({"a1a3": 10, "A1": 5, "a6": 1}, None)
@@ -0,0 +1,133 @@
+import asyncio
+import contextlib
+
+import asyncpg
+import pytest
+from sqlalchemy import event, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import models.links  # noqa: F401, configures the mappers of the EPD relationships
+from core.epd_cache import (
+    CHANNEL,
+    epd_cache,
+    listen_for_epd_changes,
+    notify_epds_changed,
+)
+from schema import schema
+
+
+@pytest.mark.asyncio
+async def test_epd_cache(db, epds):
+    statements = []
+    event.listen(db.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    ids = [epd.id for epd in epds]
+    hits = epd_cache.hits
+
+    async with AsyncSession(db) as session:
+        first = await epd_cache.get_many(session, ids[:2])
+        second = await epd_cache.get_many(session, [*ids, "unknown"])
+
+        assert not session.identity_map
+
+    assert [epd.name for epd in first.values()] == ["EPD 0", "EPD 1"]
+    assert second[ids[0]] is first[ids[0]]
+    assert second[ids[2]].gwp["a1a3"] == 20
+    assert "unknown" not in second
+    assert (epd_cache.hits - hits, len(statements)) == (2, 2)
+
+
+@pytest.mark.asyncio
+async def test_epds_query_loads_uncached_epds_with_selected_columns(db, epds):
+    statements = []
+    event.listen(db.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    query = "query { epds(sortBy: {name: ASC}) { edges { node { name } } } }"
+
+    async with AsyncSession(db) as session:
+        await epd_cache.get_many(session, [epds[0].id])
+        statements.clear()
+
+        response = await schema.execute(query, context_value={"session": session, "user": True})
+
+    assert response.errors is None
+    assert [edge["node"]["name"] for edge in response.data["epds"]["edges"]] == ["EPD 0", "EPD 1", "EPD 2"]
+    # The ids of the page and the uncached EPDs, without their impacts
+    assert len(statements) == 2
+    assert "epd.name" in statements[1] and "epd.gwp" not in statements[1]
+    # Partially loaded EPDs are not cached
+    assert len(epd_cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_notify_epds_changed(db, epds):
+    async with AsyncSession(db) as session:
+        await epd_cache.get_many(session, [epd.id for epd in epds])
+        assert await epd_cache.version(session) == 0
+
+        await notify_epds_changed(session, [epds[0].id])
+        await session.rollback()
+
+        assert len(epd_cache) == 2
+        assert await epd_cache.version(session) == 0
+
+        # Adding EPDs changes the catalog, but not the cached EPDs
+        await notify_epds_changed(session)
+        await session.commit()
+
+        assert len(epd_cache) == 2
+        assert await epd_cache.version(session) == 1
+
+
+async def wait_until(predicate, timeout: float = 2.0):
+    async def _wait():
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(_wait(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_listen_for_epd_changes(db, epds):
+    generation = epd_cache._generation
+    listener = asyncio.create_task(listen_for_epd_changes())
+    try:
+        # The listener clears the cache once it is connected
+        await wait_until(lambda: epd_cache._generation > generation)
+
+        async with AsyncSession(db) as session:
+            await epd_cache.get_many(session, [epd.id for epd in epds])
+
+            # A change made by another replica
+            await session.execute(select(func.pg_notify(CHANNEL, f"{epds[0].id},{epds[1].id}")))
+            await session.commit()
+
+        await wait_until(lambda: len(epd_cache) == 1)
+    finally:
+        listener.cancel()
+
+
+async def hang(*args):
+    await asyncio.sleep(1)
+
+
+@pytest.mark.asyncio
+async def test_listen_for_epd_changes_reconnects(mocker):
+    # The first connection fails to listen and the second stops responding, the third one stays up
+    connections = [mocker.MagicMock(is_closed=lambda: False) for _ in range(3)]
+    connections[0].add_listener = mocker.AsyncMock(side_effect=asyncpg.InterfaceError("connection is closed"))
+    connections[1].add_listener = mocker.AsyncMock()
+    connections[1].execute = mocker.AsyncMock(side_effect=hang)
+    connections[2].add_listener = mocker.AsyncMock()
+    connections[2].execute = mocker.AsyncMock()
+    connect = mocker.patch("asyncpg.connect", side_effect=connections)
+
+    listener = asyncio.create_task(listen_for_epd_changes(retry_delay=0, check_interval=0.05))
+    try:
+        await wait_until(lambda: connections[2].execute.await_count > 1)
+    finally:
+        listener.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await listener
+
+    assert connect.call_count == 3
+    connections[0].terminate.assert_called_once()
+    connections[1].terminate.assert_called_once()
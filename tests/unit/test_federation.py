@@ -0,0 +1,72 @@
+import json
+
+import httpx
+import pytest
+from sqlalchemy import event
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.config import settings
+from schema import schema
+
+
+class MockUser:
+    access_token = f"Bearer eydlhjaflkjadh"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("batch_size, requests", [(100, 1), (2, 2)])
+async def test_resolve_schema_element_assemblies(db, project_assemblies, httpx_mock, mocker, batch_size, requests):
+    mocker.patch.object(settings, "ROUTER_BATCH_SIZE", batch_size)
+    elements = {f"element{i}": assembly.id for i, assembly in enumerate(project_assemblies)}
+
+    def router_response(request: httpx.Request):
+        variables = json.loads(request.content)["variables"]
+        ids = [variables[f"id{i}"] for i in range(len(variables) - 1)]
+        return httpx.Response(
+            200,
+            json={
+                "data": {
+                    f"element{i}": [{"id": element_id, "assemblyId": elements[element_id]}]
+                    for i, element_id in enumerate(ids)
+                }
+            },
+        )
+
+    httpx_mock.add_callback(router_response)
+
+    query = """
+        query ($representations: [_Any!]!) {
+            _entities(representations: $representations) {
+                ... on GraphQLSchemaElement {
+                    id
+                    assembly {
+                        name
+                        gwp
+                    }
+                }
+            }
+        }
+    """
+
+    statements = []
+
+    def count_statements(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.sync_engine, "before_cursor_execute", count_statements)
+    async with AsyncSession(db) as session:
+        response = await schema.execute(
+            query,
+            variable_values={
+                "representations": [{"__typename": "GraphQLSchemaElement", "id": _id} for _id in elements]
+            },
+            context_value={"session": session, "user": MockUser()},
+        )
+    event.remove(db.sync_engine, "before_cursor_execute", count_statements)
+
+    assert response.errors is None
+    assert response.data["_entities"] == [
+        {"id": element_id, "assembly": {"name": f"Assembly {i}", "gwp": 0.0}} for i, element_id in enumerate(elements)
+    ]
+    assert len([statement for statement in statements if "\nFROM projectassembly \n" in statement]) == 1
+    assert len(httpx_mock.get_requests()) == requests
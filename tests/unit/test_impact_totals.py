@@ -0,0 +1,78 @@
+import pytest
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.impact_totals import (
+    get_affected_assemblies,
+    load_stored_impacts,
+    rebuild_assembly_impacts,
+    refresh_assembly_impacts,
+)
+from core.impacts import INDICATORS, PHASES
+from models.assembly import ProjectAssembly
+from models.epd import ProjectEPD
+from models.impact import ProjectAssemblyImpact
+from models.links import ProjectAssemblyEPDLink
+
+
+@pytest.fixture
+async def project_layers(db, project_assemblies, epds, project_id):
+    async with AsyncSession(db) as session:
+        project_epds = [ProjectEPD.create_from_epd(epd, project_id=project_id) for epd in epds]
+        session.add_all(project_epds)
+        await session.flush()
+        for i, assembly in enumerate(project_assemblies):
+            session.add_all(
+                [
+                    ProjectAssemblyEPDLink(assembly_id=assembly.id, epd_id=epd.id, conversion_factor=i + 1, name="")
+                    for epd in project_epds
+                ]
+            )
+        await session.commit()
+
+    yield project_assemblies
+
+
+@pytest.mark.asyncio
+async def test_load_stored_impacts_falls_back_to_layers(db, project_layers):
+    async with AsyncSession(db) as session:
+        impacts = await load_stored_impacts(session, ProjectAssembly, [assembly.id for assembly in project_layers])
+
+    # The a1a3 phase of the three EPDs is 0, 10 and 20
+    a1a3 = 30
+    for i, matrix in enumerate(impacts):
+        assert matrix[INDICATORS.index("gwp"), PHASES.index("a1a3")] == pytest.approx((i + 1) * a1a3)
+
+
+@pytest.mark.asyncio
+async def test_rebuild_assembly_impacts(db, project_layers):
+    async with AsyncSession(db) as session:
+        rebuilt = await rebuild_assembly_impacts(session, ProjectAssembly, batch_size=2)
+
+    async with AsyncSession(db) as session:
+        stored = {impact.assembly_id: impact for impact in (await session.exec(select(ProjectAssemblyImpact))).all()}
+
+    assert rebuilt == len(project_layers)
+    assert stored.keys() == {assembly.id for assembly in project_layers}
+    # The c1 phase of the three EPDs is 2, 12 and 22
+    c1 = 36
+    for i, assembly in enumerate(project_layers):
+        assert stored[assembly.id].gwp["c1"] == pytest.approx((i + 1) * c1)
+
+
+@pytest.mark.asyncio
+async def test_refresh_assembly_impacts_in_batches(db, project_layers, mocker):
+    mocker.patch("core.impact_totals.BATCH_SIZE", 2)
+    epd_ids = [f"unknown-{i}" for i in range(40_000)]
+
+    async with AsyncSession(db) as session:
+        # More ids than Postgres allows bind parameters in a statement
+        epd_ids.extend((await session.exec(select(ProjectEPD.id))).all())
+        affected = await get_affected_assemblies(session, ProjectAssembly, epd_ids)
+        await refresh_assembly_impacts(session, ProjectAssembly, affected)
+        await session.commit()
+
+    async with AsyncSession(db) as session:
+        stored = (await session.exec(select(ProjectAssemblyImpact.assembly_id))).all()
+
+    assert sorted(affected) == sorted(stored) == sorted(assembly.id for assembly in project_layers)
@@ -0,0 +1,39 @@
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from core.impacts import INDICATORS, PHASES, calculate_impacts, sum_phases
+from graphql_types.assembly import calculate_impact_category
+
+
+def make_layer(seed: int):
+    _random = random.Random(seed)
+    epd = SimpleNamespace(
+        **{
+            indicator: {phase: _random.choice([None, _random.uniform(-100, 100)]) for phase in PHASES}
+            for indicator in INDICATORS
+        }
+    )
+    return SimpleNamespace(epd=epd, conversion_factor=_random.uniform(0, 5))
+
+
+@pytest.mark.parametrize("phases", [None, ["a1a3"], ["a1a3", "c3", "c4", "d"], list(PHASES)])
+def test_calculate_impacts_matches_scalar_path(phases):
+    assemblies = [[make_layer(seed * 10 + i) for i in range(seed % 4)] for seed in range(20)]
+
+    impacts = calculate_impacts(assemblies)
+
+    assert impacts.shape == (len(assemblies), len(INDICATORS), len(PHASES))
+    for layers, assembly_impacts in zip(assemblies, impacts):
+        totals = sum_phases(assembly_impacts, None, phases)
+        for indicator in INDICATORS:
+            expected = calculate_impact_category(indicator, layers, phases) if layers else 0
+            assert totals[indicator] == pytest.approx(expected)
+
+
+def test_calculate_impacts_without_layers():
+    impacts = calculate_impacts([[], None])
+
+    assert not np.any(impacts)
@@ -0,0 +1,209 @@
+import io
+import zipfile
+from datetime import date
+
+import pytest
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from import_data import get_reader
+from import_data.epd_csv import read_epd_csv
+from import_data.ilcd import read_ilcd_archive
+from import_data.importer import RecordError, import_epds
+from models.epd import EPD
+
+PROCESS = """<?xml version="1.0" encoding="UTF-8"?>
+<processDataSet xmlns="http://lca.jrc.it/ILCD/Process" xmlns:common="http://lca.jrc.it/ILCD/Common"
+    xmlns:epd="http://www.iai.kit.edu/EPD/2013">
+  <processInformation>
+    <dataSetInformation>
+      <common:UUID>{uuid}</common:UUID>
+      <name>
+        <baseName xml:lang="de">Beton</baseName>
+        <baseName xml:lang="en">Concrete</baseName>
+      </name>
+    </dataSetInformation>
+    <quantitativeReference type="Reference flow(s)">
+      <referenceToReferenceFlow>0</referenceToReferenceFlow>
+    </quantitativeReference>
+    <time>
+      <common:referenceYear>2020</common:referenceYear>
+      <common:dataSetValidUntil>2025</common:dataSetValidUntil>
+    </time>
+    <geography>
+      <locationOfOperationSupplyOrProduction location="DE"/>
+    </geography>
+  </processInformation>
+  <modellingAndValidation>
+    <LCIMethodAndAllocation>
+      <common:other>
+        <epd:subType>generic dataset</epd:subType>
+      </common:other>
+    </LCIMethodAndAllocation>
+  </modellingAndValidation>
+  <administrativeInformation>
+    <publicationAndOwnership>
+      <common:dataSetVersion>00.01.000</common:dataSetVersion>
+    </publicationAndOwnership>
+  </administrativeInformation>
+  <exchanges>
+    <exchange dataSetInternalID="0">
+      <referenceToFlowDataSet refObjectId="flow-1" type="flow data set">
+        <common:shortDescription>Concrete</common:shortDescription>
+      </referenceToFlowDataSet>
+      <meanAmount>2.0</meanAmount>
+    </exchange>
+    <exchange dataSetInternalID="1">
+      <referenceToFlowDataSet refObjectId="20f32be5-0398-4288-9b6d-accddd195317" type="flow data set">
+        <common:shortDescription>Use of renewable primary energy (PERE)</common:shortDescription>
+      </referenceToFlowDataSet>
+      <common:other>
+        <epd:amount epd:module="A1">10</epd:amount>
+        <epd:amount epd:module="A2">4</epd:amount>
+        <epd:amount epd:module="A3">6</epd:amount>
+        <epd:amount epd:module="C4">ND</epd:amount>
+      </common:other>
+    </exchange>
+  </exchanges>
+  <LCIAResults>
+    <LCIAResult>
+      <referenceToLCIAMethodDataSet refObjectId="unknown-method" type="LCIA method data set">
+        <common:shortDescription>Global warming potential (GWP)</common:shortDescription>
+      </referenceToLCIAMethodDataSet>
+      <common:other>
+        <epd:amount epd:module="A1-A3">200</epd:amount>
+        <epd:amount epd:module="C3" epd:scenario="landfill">8</epd:amount>
+        <epd:amount epd:module="C3" epd:scenario="incineration">80</epd:amount>
+        <epd:amount epd:module="D">-20</epd:amount>
+      </common:other>
+    </LCIAResult>
+  </LCIAResults>
+</processDataSet>
+"""
+
+FLOW = """<?xml version="1.0" encoding="UTF-8"?>
+<flowDataSet xmlns="http://lca.jrc.it/ILCD/Flow" xmlns:common="http://lca.jrc.it/ILCD/Common">
+  <flowInformation>
+    <quantitativeReference>
+      <referenceToReferenceFlowProperty>1</referenceToReferenceFlowProperty>
+    </quantitativeReference>
+  </flowInformation>
+  <flowProperties>
+    <flowProperty dataSetInternalID="0">
+      <referenceToFlowPropertyDataSet refObjectId="mass">
+        <common:shortDescription>Mass</common:shortDescription>
+      </referenceToFlowPropertyDataSet>
+    </flowProperty>
+    <flowProperty dataSetInternalID="1">
+      <referenceToFlowPropertyDataSet refObjectId="volume">
+        <common:shortDescription>Volume</common:shortDescription>
+      </referenceToFlowPropertyDataSet>
+    </flowProperty>
+  </flowProperties>
+</flowDataSet>
+"""
+
+CSV = """origin_id,name,version,declared_unit,valid_until,published_date,source,location,subtype,gwp_a1a3,gwp_c4
+csv-1,Timber,1.0,m3,2025-01-01,2020-01-01,,DK,Generic,-700.5,800
+csv-2,Steel,1.0,kg,not a date,2020-01-01,,DK,Generic,2,
+csv-3,Glass,1.0,m2,2025-01-01,2020-01-01,Supplier,DK,Specific,,
+"""
+
+
+def ilcd_archive(processes: dict[str, str]) -> io.BytesIO:
+    file = io.BytesIO()
+    with zipfile.ZipFile(file, "w") as archive:
+        for uuid, process in processes.items():
+            archive.writestr(f"ILCD/processes/{uuid}.xml", process)
+        archive.writestr("ILCD/flows/flow-1.xml", FLOW)
+    file.seek(0)
+    return file
+
+
+def test_read_ilcd_archive():
+    file = ilcd_archive({"epd-1": PROCESS.format(uuid="epd-1"), "broken": "<processDataSet>"})
+
+    epd, error = list(read_ilcd_archive(file, "Ökobau"))
+
+    assert epd["origin_id"] == "epd-1"
+    assert epd["name"] == "Concrete"
+    assert epd["version"] == "00.01.000"
+    assert epd["declared_unit"] == "m3"
+    assert epd["published_date"] == date(2020, 1, 1)
+    assert epd["valid_until"] == date(2025, 12, 31)
+    assert epd["location"] == "DE"
+    assert epd["subtype"] == "Generic"
+    assert epd["source"] == "Ökobau"
+    # The amounts are declared for 2 m3, and only the first C3 scenario is kept
+    assert epd["gwp"] == {"a1a3": 100, "c3": 4, "d": -10}
+    assert epd["pere"] == {"a1a3": 10}
+    assert isinstance(error, RecordError)
+    assert error.record == "ILCD/processes/broken.xml"
+
+
+def test_read_epd_csv():
+    epd, error, epd_with_source = list(read_epd_csv(io.BytesIO(CSV.encode()), "Upload"))
+
+    assert epd["origin_id"] == "csv-1"
+    assert epd["source"] == "Upload"
+    assert epd["valid_until"] == date(2025, 1, 1)
+    assert epd["gwp"]["a1a3"] == -700.5
+    assert epd["gwp"]["c4"] == 800
+    assert epd["gwp"]["c3"] is None
+    assert error.record == "line 3"
+    assert epd_with_source["source"] == "Supplier"
+
+
+def test_read_epd_csv_without_required_columns():
+    (error,) = list(read_epd_csv(io.BytesIO(b"name,version\nTimber,1\n"), "Upload"))
+
+    assert error.record == "header"
+
+
+def test_get_reader():
+    assert get_reader("EPDs.ZIP") is read_ilcd_archive
+    assert get_reader("epds.csv") is read_epd_csv
+    with pytest.raises(ValueError):
+        get_reader("epds.xlsx")
+
+
+@pytest.mark.asyncio
+async def test_import_epds(db):
+    processes = {f"epd-{i}": PROCESS.format(uuid=f"epd-{i}") for i in range(5)}
+    progress = []
+
+    async with AsyncSession(db) as session:
+        report = await import_epds(
+            session, read_ilcd_archive(ilcd_archive(processes), "Ökobau"), chunk_size=2, progress=progress.append
+        )
+
+    assert (report.read, report.inserted, report.updated, report.unchanged) == (5, 5, 0, 0)
+    assert len(progress) == 3
+
+    processes["epd-0"] = processes["epd-0"].replace("Concrete", "Concrete C30/37")
+    async with AsyncSession(db) as session:
+        report = await import_epds(session, read_ilcd_archive(ilcd_archive(processes), "Ökobau"), chunk_size=2)
+
+    assert (report.read, report.inserted, report.updated, report.unchanged) == (5, 0, 1, 4)
+
+    async with AsyncSession(db) as session:
+        epds = (await session.exec(select(EPD).order_by(EPD.origin_id))).all()
+
+    assert [epd.name for epd in epds] == ["Concrete C30/37"] + ["Concrete"] * 4
+
+
+@pytest.mark.asyncio
+async def test_import_epd_csv_without_origin_ids(db):
+    csv = "\n".join(line.split(",", 1)[1] for line in CSV.splitlines()) + "\n"
+
+    for _ in range(2):
+        async with AsyncSession(db) as session:
+            report = await import_epds(session, read_epd_csv(io.BytesIO(csv.encode()), "Upload"))
+
+    assert (report.inserted, report.unchanged) == (0, 2)
+
+    async with AsyncSession(db) as session:
+        epds = (await session.exec(select(EPD).order_by(EPD.name))).all()
+
+    assert [epd.name for epd in epds] == ["Glass", "Timber"]
+    assert epds[0].origin_id != epds[1].origin_id
@@ -1,11 +1,38 @@
 from pathlib import Path
 
 import pytest
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from initial_data.load_tabel7 import load
+from initial_data.load_tabel7 import DATASET_NAME, load
+from models.epd import EPD
+from models.seed import SeedDataset
 
 
 @pytest.mark.asyncio
 async def test_load_table7(db):
     file = Path(__file__).parent.parent.parent / "src" / "initial_data" / "BR18_bilag_2_tabel_7_version_2_201222.csv"
     await load(file)
+
+
+@pytest.mark.asyncio
+async def test_load_table7_is_idempotent(db):
+    file = Path(__file__).parent.parent.parent / "src" / "initial_data" / "BR18_bilag_2_tabel_7_version_2_201222.csv"
+    await load(file)
+
+    async with AsyncSession(db) as session:
+        count = (await session.exec(select(func.count(EPD.id)))).one()
+        assert count > 0
+
+        # A changed fingerprint diffs against the existing EPDs instead of inserting them again
+        dataset = await session.get(SeedDataset, DATASET_NAME)
+        dataset.fingerprint = "outdated"
+        session.add(dataset)
+        await session.commit()
+
+    await load(file)
+    await load(file)
+
+    async with AsyncSession(db) as session:
+        assert (await session.exec(select(func.count(EPD.id)))).one() == count
+        assert (await session.get(SeedDataset, DATASET_NAME)).fingerprint != "outdated"
@@ -0,0 +1,86 @@
+import httpx
+import prometheus_client
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core import metrics
+from schema import schema
+
+
+class MockUser:
+    claims = {"oid": "someid"}
+    access_token = "Bearer eydlhjaflkjadh"
+
+
+@pytest.mark.asyncio
+async def test_metrics_extension(db, project_assemblies, project_id, mocker):
+    observe = mocker.patch("core.metrics.observe")
+    query = """
+        query ProjectAssemblies($projectId: String!) {
+            projectAssemblies(projectId: $projectId) {
+                name
+                gwp
+            }
+        }
+    """
+
+    async with AsyncSession(db) as session:
+        response = await schema.execute(
+            query, variable_values={"projectId": project_id}, context_value={"session": session, "user": MockUser()}
+        )
+
+    assert response.errors is None
+    (operation,), _ = observe.call_args
+    assert operation.operation == "projectAssemblies"
+    assert operation.seconds > 0
+
+    assemblies = operation.resolvers["Query.projectAssemblies"]
+    assert (assemblies.calls, assemblies.statements, assemblies.rows) == (1, 1, 3)
+    # The impacts of all assemblies are loaded with a single batch, attributed to the resolvers of the batch
+    gwp = operation.resolvers["GraphQLProjectAssembly.gwp"]
+    assert (gwp.calls, gwp.statements) == (3, 2)
+    # Fields without a resolver of their own are not measured
+    assert "GraphQLProjectAssembly.name" not in operation.resolvers
+    assert operation.statements == 3
+
+
+@pytest.mark.asyncio
+async def test_metrics_count_http_calls(db, mocker, httpx_mock):
+    mocker.patch("core.metrics.observe")
+    httpx_mock.add_response(json={"data": {}})
+    operation = metrics.OperationMetrics()
+    token = metrics._operation.set(operation)
+
+    async with httpx.AsyncClient(event_hooks={"request": [metrics.on_http_request]}) as client:
+        await client.get("http://router.url")
+    metrics._operation.reset(token)
+
+    assert operation.resolvers[""].http_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_label_operations_by_root_fields(db, mocker):
+    observe = mocker.patch("core.metrics.observe")
+    query = """
+        query SomeName { first: epds { numEdges } ...Fields }
+        fragment Fields on Query { __typename epds { numEdges } }
+    """
+
+    async with AsyncSession(db) as session:
+        await schema.execute(query, context_value={"session": session, "user": MockUser()})
+        await schema.execute("query Unknown { unknownField }", context_value={"session": session, "user": MockUser()})
+
+    (first,), _ = observe.call_args_list[0]
+    assert first.operation == "__typename,epds"
+    (unknown,), _ = observe.call_args_list[1]
+    assert unknown.operation == "invalid"
+
+
+@pytest.mark.asyncio
+async def test_get_metrics(client):
+    await client.post("/api/graphql", json={"query": "query Epds { epds { numEdges } }"})
+
+    assert 'graphql_operation_sql_statements_count{operation="epds"}' in prometheus_client.generate_latest().decode()
+    # The metrics are served on a port of their own, not by the app
+    response = await client.get("/metrics")
+    assert response.status_code == 404
@@ -0,0 +1,110 @@
+import pytest
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.config import settings
+from core.document_cache import parse_cached, validate_cached
+from core.persisted_queries import (
+    PersistedQueryError,
+    PersistedQueryNotFound,
+    get_query_hash,
+    persisted_queries,
+    resolve_persisted_query,
+)
+from models.persisted_query import PersistedQuery
+from schema import schema
+
+QUERY = "query { epds { numEdges } }"
+
+
+def persisted(query_hash: str) -> dict:
+    return {"persistedQuery": {"version": 1, "sha256Hash": query_hash}}
+
+
+@pytest.mark.asyncio
+async def test_resolve_persisted_query(db):
+    query_hash = get_query_hash(QUERY)
+
+    async with AsyncSession(db) as session:
+        assert await resolve_persisted_query(session, schema, QUERY, None) == QUERY
+        with pytest.raises(PersistedQueryNotFound):
+            await resolve_persisted_query(session, schema, None, persisted(query_hash))
+
+        assert await resolve_persisted_query(session, schema, QUERY, persisted(query_hash)) == QUERY
+        assert await resolve_persisted_query(session, schema, None, persisted(query_hash)) == QUERY
+        assert not (await session.exec(select(PersistedQuery))).all()
+
+
+@pytest.mark.asyncio
+async def test_resolve_persisted_query_invalid(db):
+    async with AsyncSession(db) as session:
+        with pytest.raises(PersistedQueryError, match="does not match"):
+            await resolve_persisted_query(session, schema, QUERY, persisted(get_query_hash("query { __typename }")))
+        with pytest.raises(PersistedQueryError, match="version"):
+            await resolve_persisted_query(session, schema, QUERY, {"persistedQuery": {"version": 2, "sha256Hash": "a"}})
+
+    assert len(persisted_queries) == 0
+
+
+@pytest.mark.asyncio
+async def test_resolve_persisted_query_from_database(db, mocker):
+    mocker.patch.object(settings, "PERSISTED_QUERY_DATABASE", True)
+    query_hash = get_query_hash(QUERY)
+
+    async with AsyncSession(db) as session:
+        await resolve_persisted_query(session, schema, QUERY, persisted(query_hash))
+
+    # Another replica only finds the query in the database
+    persisted_queries.clear()
+    async with AsyncSession(db) as session:
+        assert await resolve_persisted_query(session, schema, None, persisted(query_hash)) == QUERY
+        assert (await session.exec(select(PersistedQuery.hash))).all() == [query_hash]
+
+    assert persisted_queries.get(query_hash) == QUERY
+
+
+@pytest.mark.asyncio
+async def test_resolve_persisted_query_only_registers_valid_queries(db, mocker):
+    mocker.patch.object(settings, "PERSISTED_QUERY_DATABASE", True)
+    mocker.patch.object(settings, "PERSISTED_QUERY_MAX_LENGTH", len(QUERY))
+    invalid = ["query { unknownField }", "query {", f"query {{ epds {{ numEdges }} }}{' ' * len(QUERY)}"]
+
+    async with AsyncSession(db) as session:
+        for query in invalid:
+            # Executed as usual, but not registered
+            assert await resolve_persisted_query(session, schema, query, persisted(get_query_hash(query))) == query
+            with pytest.raises(PersistedQueryNotFound):
+                await resolve_persisted_query(session, schema, None, persisted(get_query_hash(query)))
+
+        assert not (await session.exec(select(PersistedQuery))).all()
+
+
+@pytest.mark.asyncio
+async def test_resolve_persisted_query_evicts_from_database(db, mocker):
+    mocker.patch.object(settings, "PERSISTED_QUERY_DATABASE", True)
+    mocker.patch.object(settings, "PERSISTED_QUERY_DATABASE_SIZE", 2)
+    queries = ["query { epds { numEdges } }", "query { __typename }", "query { epds { pageInfo { hasNextPage } } }"]
+
+    async with AsyncSession(db) as session:
+        for query in queries:
+            await resolve_persisted_query(session, schema, query, persisted(get_query_hash(query)))
+
+        stored = (await session.exec(select(PersistedQuery.query))).all()
+
+    assert sorted(stored) == sorted(queries[1:])
+
+
+@pytest.mark.asyncio
+async def test_document_cache():
+    parse_cached.cache_clear()
+    validate_cached.cache_clear()
+    query = "query DocumentCache { __typename }"
+
+    results = [await schema.execute(query) for _ in range(2)]
+    invalid = await schema.execute("query { unknownField }")
+    syntax_error = await schema.execute("query {")
+
+    assert [result.data for result in results] == [{"__typename": "Query"}] * 2
+    assert (parse_cached.cache_info().hits, validate_cached.cache_info().hits) == (1, 1)
+    assert invalid.errors[0].message == "Cannot query field 'unknownField' on type 'Query'."
+    assert syntax_error.errors[0].message.startswith("Syntax Error")
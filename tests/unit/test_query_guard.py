@@ -0,0 +1,57 @@
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.config import settings
+from core.query_guard import RepeatedStatementsError, normalize_statement
+from schema import schema
+
+
+class MockUser:
+    claims = {"oid": "someid"}
+    access_token = "Bearer eydlhjaflkjadh"
+
+
+QUERY = """
+    query ProjectAssemblies($projectId: String!) {
+        projectAssemblies(projectId: $projectId) {
+            name
+        }
+    }
+"""
+
+
+def test_normalize_statement():
+    first = normalize_statement("SELECT epd.name FROM epd\n WHERE epd.id = $1::VARCHAR AND epd.source = 'Ökobau'")
+    second = normalize_statement("SELECT epd.name FROM epd WHERE epd.id = $2::VARCHAR AND epd.source = 'it''s'")
+
+    assert first == second == "SELECT epd.name FROM epd WHERE epd.id = ? AND epd.source = ?"
+    assert normalize_statement("SELECT 1 FROM epd WHERE epd.id IN ($1, $2, $3) LIMIT 10") == (
+        "SELECT ? FROM epd WHERE epd.id IN (?) LIMIT ?"
+    )
+
+
+@pytest.mark.asyncio
+async def test_query_guard_fails_repeated_statements(db, project_assemblies, project_id, mocker):
+    mocker.patch.object(settings, "QUERY_GUARD_MAX_REPEATS", 0)
+
+    async with AsyncSession(db) as session:
+        with pytest.raises(RepeatedStatementsError, match="GraphQL operation ProjectAssemblies repeated"):
+            await schema.execute(
+                QUERY, variable_values={"projectId": project_id}, context_value={"session": session, "user": MockUser()}
+            )
+
+
+@pytest.mark.asyncio
+async def test_query_guard_warns_in_development(db, project_assemblies, project_id, mocker):
+    mocker.patch.object(settings, "QUERY_GUARD_MAX_REPEATS", 0)
+    mocker.patch.object(settings, "SERVER_NAME", "LCA Dev")
+    logger = mocker.patch("core.query_guard.logger")
+
+    async with AsyncSession(db) as session:
+        response = await schema.execute(
+            QUERY, variable_values={"projectId": project_id}, context_value={"session": session, "user": MockUser()}
+        )
+
+    assert response.errors is None
+    (message,), _ = logger.warning.call_args
+    assert "FROM projectassembly WHERE projectassembly.project_id = ?" in message
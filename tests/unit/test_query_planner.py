@@ -0,0 +1,103 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import load_only
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from strawberry.types.nodes import FragmentSpread, InlineFragment, SelectedField
+
+from core.loaders import load_deferred_column
+from core.query_planner import collect_fields, query_options
+from models.assembly import ProjectAssembly
+from models.epd import EPD, ProjectEPD
+from models.links import ProjectAssemblyEPDLink
+
+
+def field(name: str, *selections, alias: str | None = None) -> SelectedField:
+    return SelectedField(name=name, directives={}, arguments={}, selections=list(selections), alias=alias)
+
+
+LAYER_SELECTIONS = [
+    field("name"),
+    field(
+        "layers",
+        InlineFragment(type_condition="GraphQLAssemblyLayer", directives={}, selections=[field("epd", field("name"))]),
+    ),
+    FragmentSpread(
+        name="Transport",
+        type_condition="GraphQLAssembly",
+        directives={},
+        selections=[field("layers", field("transportEpd", field("gwp", field("a1a3"))), alias="transport")],
+    ),
+]
+
+
+@pytest.fixture
+async def project_assembly_layers(db, project_assemblies, epds, project_id):
+    async with AsyncSession(db) as session:
+        project_epds = [ProjectEPD.create_from_epd(epd, project_id=project_id) for epd in epds]
+        session.add_all(project_epds)
+        await session.flush()
+        session.add_all(
+            [
+                ProjectAssemblyEPDLink(
+                    assembly_id=project_assemblies[0].id, epd_id=epd.id, transport_epd_id=project_epds[2].id, name=""
+                )
+                for epd in project_epds[:2]
+            ]
+        )
+        await session.commit()
+
+    yield project_assemblies
+
+
+def test_collect_fields():
+    fields = collect_fields(LAYER_SELECTIONS)
+
+    assert list(fields) == ["name", "layers"]
+    assert list(collect_fields(fields["layers"])) == ["epd", "transportEpd"]
+
+
+@pytest.mark.asyncio
+async def test_query_options(db, project_assembly_layers):
+    statements = []
+    event.listen(db.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    async with AsyncSession(db) as session:
+        query = select(ProjectAssembly).options(*query_options(ProjectAssembly, LAYER_SELECTIONS))
+        assemblies = {assembly.name: assembly for assembly in (await session.exec(query)).all()}
+
+    layers = assemblies["Assembly 0"].layers
+    assert sorted(layer.epd.name for layer in layers) == ["EPD 0", "EPD 1"]
+    assert layers[0].transport_epd.gwp["a1a3"] == 20
+
+    # The assemblies, the layers and the two EPD relationships are loaded, without unselected columns
+    assembly_statement, layer_statement, *epd_statements = statements
+    assert len(epd_statements) == 2
+    assert "projectassembly.description" not in assembly_statement
+    assert "projectassemblyepdlink.epd_id" in layer_statement
+    assert "projectassemblyepdlink.description" not in layer_statement
+    assert all("projectepd.odp" not in statement for statement in epd_statements)
+    assert sum("projectepd.gwp" in statement for statement in epd_statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_load_deferred_column(db, epds):
+    statements = []
+    event.listen(db.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    async with AsyncSession(db) as session:
+        info = SimpleNamespace(context={"session": session})
+        loaded = (await session.exec(select(EPD).options(load_only(EPD.name)).order_by(EPD.name))).all()
+        impacts = await asyncio.gather(*[load_deferred_column(info, epd, "gwp") for epd in loaded])
+        names = [await load_deferred_column(info, epd, "name") for epd in loaded]
+
+        assert [impact["a1a3"] for impact in impacts] == [0, 10, 20]
+        assert names == ["EPD 0", "EPD 1", "EPD 2"]
+        assert [epd.gwp for epd in loaded] == impacts
+        assert not session.dirty
+
+    # The impacts of all EPDs are loaded with a single query
+    assert len(statements) == 2
@@ -0,0 +1,101 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlmodel import col, select
+
+from core.search import search_clauses
+from models.assembly import ProjectAssembly
+from models.epd import EPD, ProjectEPD
+from models.links import ProjectAssemblyEPDLink
+
+PROJECTS = 100
+EPDS = 1_000
+
+
+@pytest.fixture
+async def data(db):
+    """Fill the project tables with enough rows for the planner to prefer indexes over sequential scans"""
+
+    epds = f"""
+        INSERT INTO epd (id, name, version, valid_until, published_date, source, location, subtype, is_transport)
+        SELECT 'epd' || i, 'EPD ' || i, '1', now(), now(), 'source', 'DK', 'Generic', false
+        FROM generate_series(1, {EPDS}) AS i
+    """
+    project_epds = f"""
+        INSERT INTO projectepd (
+            id, project_id, origin_id, name, version, valid_until, published_date, source, location, subtype,
+            is_transport
+        )
+        SELECT 'project' || p || 'epd' || i, 'project' || p, 'epd' || i, 'EPD ' || i, '1', now(), now(), 'source',
+            'DK', 'Generic', false
+        FROM generate_series(1, {PROJECTS}) AS p, generate_series(1, {EPDS} / 10) AS i
+    """
+    assemblies = f"""
+        INSERT INTO projectassembly (id, project_id, name, category, life_time, unit, conversion_factor)
+        SELECT 'project' || p || 'assembly' || i, 'project' || p, 'Assembly ' || i, 'Category', 50, 'M2', 1
+        FROM generate_series(1, {PROJECTS}) AS p, generate_series(1, 50) AS i
+    """
+    layers = f"""
+        INSERT INTO projectassemblyepdlink (
+            id, assembly_id, epd_id, conversion_factor, description, name, transport_distance,
+            transport_conversion_factor
+        )
+        SELECT 'project' || p || 'assembly' || i || 'layer' || l, 'project' || p || 'assembly' || i,
+            'project' || p || 'epd' || l, 1, '', '', 0, 1
+        FROM generate_series(1, {PROJECTS}) AS p, generate_series(1, 50) AS i, generate_series(1, 5) AS l
+    """
+
+    async with db.begin() as conn:
+        for statement in [epds, project_epds, assemblies, layers]:
+            await conn.execute(text(statement))
+        await conn.execute(text("ANALYZE"))
+
+    yield db
+
+
+async def explain(db, query, enable_seqscan: bool = True) -> str:
+    statement = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    async with db.connect() as conn:
+        if not enable_seqscan:
+            await conn.execute(text("SET LOCAL enable_seqscan = off"))
+        return "\n".join((await conn.execute(text(f"EXPLAIN {statement}"))).scalars().all())
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "query",
+    [
+        pytest.param(select(ProjectEPD).where(ProjectEPD.project_id == "project1"), id="project_epds"),
+        pytest.param(
+            select(ProjectEPD.origin_id, ProjectEPD.id).where(
+                ProjectEPD.project_id == "project1", col(ProjectEPD.origin_id).in_(["epd1", "epd2"])
+            ),
+            id="project_epds_by_origin",
+        ),
+        pytest.param(select(ProjectEPD).where(ProjectEPD.origin_id == "epd1"), id="project_epds_of_epd"),
+        pytest.param(select(ProjectAssembly).where(ProjectAssembly.project_id == "project1"), id="project_assemblies"),
+        pytest.param(
+            select(ProjectAssemblyEPDLink).where(
+                col(ProjectAssemblyEPDLink.assembly_id).in_(["project1assembly1", "project1assembly2"])
+            ),
+            id="project_assembly_layers",
+        ),
+        pytest.param(
+            select(ProjectAssemblyEPDLink).where(ProjectAssemblyEPDLink.epd_id == "project1epd1"),
+            id="project_epd_layers",
+        ),
+    ],
+)
+async def test_queries_use_indexes(data, query):
+    plan = await explain(data, query)
+
+    assert "Seq Scan" not in plan, plan
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("model", [EPD, ProjectAssembly])
+async def test_search_uses_index(data, model):
+    # The test tables are too small for the planner to prefer the GIN index, so only check that it can use it
+    plan = await explain(data, select(model).where(search_clauses(model, "epd assembly 49")[0]), enable_seqscan=False)
+
+    assert f"Bitmap Index Scan on ix_{model.__tablename__}_search" in plan, plan
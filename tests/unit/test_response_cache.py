@@ -0,0 +1,43 @@
+from core.response_cache import build_etag, etag_matches, get_cache_key
+
+
+def test_get_cache_key():
+    key = get_cache_key("query { epds(count: 10) { edges { node { name } } } }", {}, None)
+
+    assert key == get_cache_key(
+        """
+        # Catalog page
+        query {
+            epds(count: 10) {
+                edges { node { name } }
+            }
+        }
+        """,
+        None,
+        None,
+    )
+    assert key != get_cache_key("query { epds(count: 20) { edges { node { name } } } }", {}, None)
+    assert get_cache_key("query ($n: Int) { epds(count: $n) { numEdges } }", {"n": 1}, None) != get_cache_key(
+        "query ($n: Int) { epds(count: $n) { numEdges } }", {"n": 2}, None
+    )
+
+
+def test_get_cache_key_not_cacheable():
+    assert get_cache_key("query { assemblies { name } }", None, None) is None
+    assert get_cache_key("query { epds { numEdges } assemblies { name } }", None, None) is None
+    assert get_cache_key("query { ...Catalog } fragment Catalog on Query { epds { numEdges } }", None, None) is None
+    assert get_cache_key('mutation { deleteEpds(ids: ["1"]) }', None, None) is None
+    assert get_cache_key("query { epds {", None, None) is None
+    assert get_cache_key("query A { epds { numEdges } } query B { assemblies { name } }", None, "B") is None
+    assert get_cache_key("query A { epds { numEdges } } query B { assemblies { name } }", None, "A")
+
+
+def test_etag_matches():
+    etag = build_etag(3, "a" * 64)
+
+    assert etag == f'"3-{"a" * 32}"'
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(build_etag(4, "a" * 64), etag)
+    assert not etag_matches(None, etag)
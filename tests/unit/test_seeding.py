@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import text
+
+import initial_data.seeding as seeding
+
+
+@pytest.fixture
+def datasets(mocker):
+    loaded = []
+
+    async def loader():
+        loaded.append("dataset")
+
+    mocker.patch.dict(seeding.DATASETS, {"dataset": loader}, clear=True)
+    yield loaded
+
+
+@pytest.mark.asyncio
+async def test_run_seeding(db, datasets):
+    assert await seeding.run_seeding(engine=db) is True
+    assert datasets == ["dataset"]
+
+
+@pytest.mark.asyncio
+async def test_run_seeding_skips_without_lock(db, datasets):
+    async with db.connect() as connection:
+        await connection.execute(text("SELECT pg_advisory_lock(:id)"), {"id": seeding.SEED_LOCK_ID})
+        try:
+            assert await seeding.run_seeding(engine=db) is False
+        finally:
+            await connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": seeding.SEED_LOCK_ID})
+
+    assert datasets == []
+
+
+@pytest.mark.asyncio
+async def test_run_seeding_unknown_dataset(db, datasets):
+    with pytest.raises(ValueError):
+        await seeding.run_seeding(["unknown"], engine=db)
@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+import pytest
+from lcacollect_config.exceptions import DatabaseItemNotFound
+
+from core.cache import TTLCache
+from core.validate import authenticate_project, invalidate_project
+
+
+def get_info(oid: str = "someid"):
+    user = SimpleNamespace(claims={"oid": oid}, access_token="token")
+    return SimpleNamespace(context={"user": user})
+
+
+@pytest.mark.asyncio
+async def test_authenticate_project_is_cached(project_exists_mock, project_id):
+    info = get_info()
+    await authenticate_project(info, project_id)
+    await authenticate_project(info, project_id)
+    assert project_exists_mock.call_count == 1
+
+    # A new request reuses the result, until the project is invalidated
+    await authenticate_project(get_info(), project_id)
+    assert project_exists_mock.call_count == 1
+
+    invalidate_project(project_id)
+    await authenticate_project(get_info(), project_id)
+    assert project_exists_mock.call_count == 2
+
+    # Other users are checked separately
+    await authenticate_project(get_info("otherid"), project_id)
+    assert project_exists_mock.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_authenticate_project_does_not_cache_failures(mocker, project_id):
+    project_exists = mocker.patch("lcacollect_config.validate.project_exists", return_value=False)
+
+    for _ in range(2):
+        with pytest.raises(DatabaseItemNotFound):
+            await authenticate_project(get_info(), project_id)
+
+    assert project_exists.call_count == 2
+
+
+def test_ttl_cache(mocker):
+    monotonic = mocker.patch("core.cache.time.monotonic", return_value=0)
+    cache = TTLCache(maxsize=2, ttl=10)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    # "b" is the least recently used entry
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+    monotonic.return_value = 11
+    assert cache.get("a") is None